@@ -1,40 +1,202 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
+from uuid import UUID
+import json
+import logging
 from langchain.agents import AgentExecutor
+from langchain.callbacks.base import AsyncCallbackHandler
 from langchain.chat_models import ChatOpenAI
-from langchain.memory import ConversationBufferMemory
+from langchain.output_parsers.openai_functions import PydanticOutputFunctionsParser
+from langchain.schema import BaseMessage, LLMResult, OutputParserException
+from langchain.utils.openai_functions import convert_pydantic_to_openai_function
 from ..core.config import settings
+from ..core.telemetry import metrics, span
+from ..services.context_builder import ContextBuilder, build_context_builder
+from .memory import AgentMemory, build_agent_memory
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_MODES = ("structured", "tools")
+
+AGENT_RUNS = metrics.counter("agent_runs", "Agent runs by execution path", ("agent", "path"))
+AGENT_LLM_CALLS = metrics.counter("agent_llm_calls", "LLM calls made by agents", ("agent",))
+AGENT_TOKENS = metrics.counter(
+    "agent_llm_tokens", "LLM tokens per agent, counted locally when a streamed response has no usage", ("agent", "type")
+)
+
+def _message_text(message: BaseMessage) -> str:
+    function_call = message.additional_kwargs.get("function_call") or {}
+    return (message.content or "") + function_call.get("arguments", "")
+
+class TokenMetricsHandler(AsyncCallbackHandler):
+    """Counts an agent's LLM calls and prompt/completion tokens"""
+    
+    def __init__(self, agent: str, counter):
+        self.agent = agent
+        self.counter = counter
+        self._prompt_tokens: Dict[UUID, int] = {}
+    
+    async def on_chat_model_start(
+        self, serialized: Dict[str, Any], messages: List[List[BaseMessage]], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._prompt_tokens[run_id] = sum(
+            self.counter.count(_message_text(message)) for batch in messages for message in batch
+        )
+    
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens = self._prompt_tokens.pop(run_id, 0)
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        completion_tokens = usage.get("completion_tokens")
+        if completion_tokens is None:
+            completion_tokens = sum(
+                self.counter.count(
+                    _message_text(generation.message) if hasattr(generation, "message") else generation.text
+                )
+                for generations in response.generations for generation in generations
+            )
+        AGENT_LLM_CALLS.inc(agent=self.agent)
+        AGENT_TOKENS.inc(usage.get("prompt_tokens") or prompt_tokens, agent=self.agent, type="prompt")
+        AGENT_TOKENS.inc(completion_tokens, agent=self.agent, type="completion")
+    
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._prompt_tokens.pop(run_id, None)
 
 class BaseAgent:
-    def __init__(self, name: str, tools: List[Any] = None):
+    # Pydantic model of the single-call structured response; None runs the tool loop only
+    output_schema = None
+    
+    def __init__(
+        self,
+        name: str,
+        tools: List[Any] = None,
+        memory: Optional[AgentMemory] = None,
+        llm=None,
+        context_builder: Optional[ContextBuilder] = None
+    ):
         self.name = name
         self.tools = tools or []
-        self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+        self.memory = memory or build_agent_memory(name)
         
-        self.llm = ChatOpenAI(
+        self.llm = llm or ChatOpenAI(
             model_name=settings.OPENAI_MODEL,
             temperature=0.7,
+            streaming=True,
             openai_api_key=settings.OPENAI_API_KEY,
             openai_api_base=settings.OPENAI_API_BASE
         )
         
+        # Bounds the rendered input to the agent's token budget (unbounded by default)
+        self.context_builder = context_builder or build_context_builder(
+            getattr(self.llm, "model_name", settings.OPENAI_MODEL)
+        )
+        self.token_metrics = TokenMetricsHandler(name, self.context_builder.counter)
         self.agent_executor = None
+        self.structured_chain = None
+        if settings.AGENT_EXECUTION_MODE not in EXECUTION_MODES:
+            raise ValueError(f"Unknown agent execution mode '{settings.AGENT_EXECUTION_MODE}'")
     
     def initialize_agent(self):
         """Initialize the agent with its specific configuration"""
         raise NotImplementedError
     
-    async def process_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process input data and return agent's response"""
+    def build_executor(self, agent) -> AgentExecutor:
+        """Tool loop with the configured iteration and wall-clock budgets"""
+        return AgentExecutor(
+            agent=agent,
+            tools=self.tools,
+            verbose=settings.AGENT_VERBOSE,
+            max_iterations=settings.AGENT_MAX_ITERATIONS,
+            max_execution_time=settings.AGENT_MAX_EXECUTION_TIME or None,
+            early_stopping_method="force"
+        )
+    
+    def build_structured_chain(self, prompt):
+        """One LLM call forced to answer through ``output_schema`` as a function call"""
+        if self.output_schema is None:
+            return None
+        function = convert_pydantic_to_openai_function(self.output_schema)
+        return {
+            "input": lambda x: x["input"],
+            "chat_history": lambda x: x["chat_history"],
+            "agent_scratchpad": lambda x: []
+        } | prompt | self.llm.bind(
+            functions=[function],
+            function_call={"name": function["name"]}
+        ) | PydanticOutputFunctionsParser(pydantic_schema=self.output_schema)
+    
+    def needs_tools(self, input_data: Dict[str, Any]) -> bool:
+        """Whether the input lacks what a single structured call needs"""
+        return False
+    
+    def warm(self):
+        """Build the executor ahead of the first request"""
+        if not self.agent_executor:
+            self.initialize_agent()
+    
+    @staticmethod
+    def parse_tool_input(tool_input: Union[Dict[str, Any], str]) -> Dict[str, Any]:
+        """Tool arguments as a dict; the LLM passes them as a JSON string"""
+        if isinstance(tool_input, dict):
+            return tool_input
+        try:
+            data = json.loads(tool_input)
+        except (TypeError, ValueError):
+            return {"text": tool_input or ""}
+        return data if isinstance(data, dict) else {"text": str(data)}
+    
+    def format_input(self, input_data: Dict[str, Any]) -> str:
+        """Render structured input data as the agent's human message, within the token budget"""
+        return json.dumps(self.context_builder.fit(input_data), default=str, ensure_ascii=False)
+    
+    async def process_input(
+        self,
+        input_data: Dict[str, Any],
+        callbacks: Optional[List[Any]] = None,
+        session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Process input data and return agent's response
+        
+        Callback handlers passed in ``callbacks`` receive token and tool events while
+        the run is in progress. Turns are remembered per ``session_id`` (usually the
+        interview ID); without one the call is stateless.
+        
+        In structured mode the agent answers in one function call into its
+        ``output_schema``, returned as ``data``; the tool loop runs only when the
+        input needs tools or the structured answer does not parse.
+        """
         if not self.agent_executor:
             self.initialize_agent()
         
-        response = await self.agent_executor.arun(input_data)
-        return {"response": response}
+        with span("agent." + self.name.lower().replace(" ", "_"), agent=self.name) as attributes:
+            message = self.format_input(input_data)
+            attributes["input_tokens"] = self.context_builder.counter.count(message)
+            chat_history = await self.memory.load_messages(session_id) if session_id else []
+            inputs = {"input": message, "chat_history": chat_history}
+            config = {"callbacks": list(callbacks or []) + [self.token_metrics]}
+            output, data, path = None, {}, "tools"
+            if (
+                self.structured_chain is not None
+                and settings.AGENT_EXECUTION_MODE == "structured"
+                and not self.needs_tools(input_data)
+            ):
+                try:
+                    data = (await self.structured_chain.ainvoke(inputs, config=config)).dict()
+                    output = data.pop("summary")
+                    path = "structured"
+                except (OutputParserException, ValueError) as e:
+                    logger.warning("%s structured output failed, falling back to the tool loop: %s", self.name, e)
+                    path = "fallback"
+            if output is None:
+                output = (await self.agent_executor.ainvoke(inputs, config=config))["output"]
+            attributes["path"] = path
+            AGENT_RUNS.inc(agent=self.name, path=path)
+            if session_id:
+                await self.memory.save_turn(session_id, message, output)
+        return {"response": output, "data": data}
     
-    def get_memory(self) -> Dict[str, Any]:
-        """Get the current state of the agent's memory"""
-        return self.memory.load_memory_variables({})
+    def get_memory(self, session_id: str) -> Dict[str, Any]:
+        """Get the current state of the agent's memory for a session"""
+        return self.memory.get(session_id)
     
-    def clear_memory(self):
-        """Clear the agent's memory"""
-        self.memory.clear() 
\ No newline at end of file
+    def clear_memory(self, session_id: Optional[str] = None):
+        """Clear the agent's memory for a session, or for all sessions"""
+        self.memory.clear(session_id) 
\ No newline at end of file
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+import httpx
+import openai
+from langchain.chat_models import ChatOpenAI
+from langchain.globals import get_llm_cache
+from langchain.schema import ChatResult
+from langchain_core.load import dumps
+from ..core.config import settings
+from ..services.context_builder import ContextBuilder, build_context_builder, parse_token_budgets
+from ..services.llm_cache import LLMCache
+from ..services.llm_gateway import LLMGateway, build_llm_gateway, parse_model_routes
+from .base_agent import BaseAgent
+from .hr_agent import HRAgent
+from .interviewer_agent import InterviewerAgent
+from .memory import build_agent_memory
+from .supervisor_agent import SupervisorAgent
+
+logger = logging.getLogger(__name__)
+
+
+class CachedChatOpenAI(ChatOpenAI):
+    """``ChatOpenAI`` that reads and writes the ``LLMCache`` off the event loop.
+
+    Async generation in this langchain version calls the cache's synchronous
+    ``lookup``/``update``, which would block the loop on SQLite and, in semantic
+    mode, on embedding the prompt and the k-NN search.
+    """
+
+    async def _agenerate_with_cache(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        llm_cache = get_llm_cache()
+        if self.cache is False or not isinstance(llm_cache, LLMCache):
+            return await super()._agenerate_with_cache(messages, stop=stop, run_manager=run_manager, **kwargs)
+        llm_string = self._get_llm_string(stop=stop, **kwargs)
+        prompt = dumps(messages)
+        cached = await llm_cache.alookup(prompt, llm_string)
+        if isinstance(cached, list):
+            return ChatResult(generations=cached)
+        result = await self._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        await llm_cache.aupdate(prompt, llm_string, result.generations)
+        return result
+
+
+class LLMClientPool:
+    """OpenAI clients sharing one pooled HTTP connection pool per sync/async side.
+
+    Every chat model built here reuses the same clients, instead of each
+    ``ChatOpenAI`` opening its own connections, so keep-alive connections (and their
+    TLS handshakes) are shared across agents and concurrent interviews. With
+    ``gateway`` their calls also go through the shared ``LLMGateway``.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str],
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+        gateway: bool = False
+    ):
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        # The gateway retries itself; retrying underneath it as well would multiply attempts
+        options = {"api_key": api_key, "base_url": base_url, "timeout": timeout, "max_retries": 0 if gateway else max_retries}
+        self.client = openai.OpenAI(http_client=httpx.Client(limits=limits, timeout=timeout), **options)
+        self.async_client = openai.AsyncOpenAI(http_client=httpx.AsyncClient(limits=limits, timeout=timeout), **options)
+        self.gateway: Optional[LLMGateway] = build_llm_gateway(self.client, self.async_client) if gateway else None
+
+    def chat_model(self, route: Optional[str] = None, **options) -> ChatOpenAI:
+        """A chat model bound to the pooled clients; ``route`` names the caller to the gateway"""
+        if self.gateway is not None:
+            clients = {"client": self.gateway.completions(route), "async_client": self.gateway.async_completions(route)}
+        else:
+            clients = {"client": self.client.chat.completions, "async_client": self.async_client.chat.completions}
+        return CachedChatOpenAI(
+            openai_api_key=settings.OPENAI_API_KEY,
+            openai_api_base=settings.OPENAI_API_BASE,
+            **clients,
+            **options
+        )
+
+    PREWARM_TIMEOUT = 5.0
+
+    async def warm(self):
+        """Open a connection to the API ahead of the first request"""
+        try:
+            # One short attempt: a slow or unreachable API must not hold anything up
+            await self.async_client.with_options(timeout=self.PREWARM_TIMEOUT, max_retries=0).models.list()
+        except openai.APIStatusError:
+            pass  # the connection is open either way
+        except Exception as e:
+            logger.warning("LLM connection pre-warm failed: %s", e)
+
+    async def aclose(self):
+        await self.async_client.close()
+        self.client.close()
+
+
+class AgentSession:
+    """A request's view of a shared agent: its compiled executor plus the session ID.
+
+    Holds no state of its own, so any number of concurrent interviews can use the
+    same agent.
+    """
+
+    def __init__(self, agent: BaseAgent, session_id: Optional[str]):
+        self.agent = agent
+        self.session_id = session_id
+
+    @property
+    def name(self) -> str:
+        return self.agent.name
+
+    async def process_input(self, input_data: Dict[str, Any], callbacks: Optional[List[Any]] = None) -> Dict[str, Any]:
+        return await self.agent.process_input(input_data, callbacks=callbacks, session_id=self.session_id)
+
+
+class AgentFactory:
+    """Builds the agents once, on pooled LLM clients, and hands out per-session views.
+
+    ``warm`` compiles every agent's prompt/runnable graph and executor up front, so
+    the first request does not pay for it and concurrent first requests cannot race
+    to build it. Each agent's model comes from its route in ``routes``, so
+    extraction-style work can run on a cheaper model than the supervisor's verdict,
+    and its input is bounded by its token budget in ``context_budgets``.
+    """
+
+    def __init__(
+        self,
+        clients: LLMClientPool,
+        match_matrix=None,
+        question_bank=None,
+        routes: Optional[Dict[str, str]] = None,
+        context_budgets: Optional[Dict[str, int]] = None
+    ):
+        self.clients = clients
+        self.question_bank = question_bank
+        self.routes = routes or {}
+        self.context_budgets = context_budgets or {}
+        self._prewarm: Optional[asyncio.Task] = None
+        summary_llm = clients.chat_model(
+            "summary",
+            model_name=settings.AGENT_MEMORY_SUMMARY_MODEL or self.model_for("summary"),
+            temperature=0
+        )
+        self.agents: Dict[str, BaseAgent] = {
+            "hr": HRAgent(
+                llm=self.agent_model("hr"),
+                memory=build_agent_memory("HR Agent", llm=summary_llm),
+                context_builder=self.context_builder("hr")
+            ),
+            "interviewer": InterviewerAgent(
+                llm=self.agent_model("interviewer"),
+                memory=build_agent_memory("Interviewer Agent", llm=summary_llm),
+                question_bank=question_bank,
+                question_llm=clients.chat_model(
+                    "question_generation", model_name=self.model_for("question_generation"), temperature=0.7
+                ),
+                context_builder=self.context_builder("interviewer")
+            ),
+            "supervisor": SupervisorAgent(
+                match_matrix=match_matrix,
+                llm=self.agent_model("supervisor"),
+                memory=build_agent_memory("Supervisor Agent", llm=summary_llm),
+                context_builder=self.context_builder("supervisor")
+            ),
+        }
+
+    def model_for(self, route: str) -> str:
+        return self.routes.get(route, settings.OPENAI_MODEL)
+
+    def agent_model(self, route: str) -> ChatOpenAI:
+        return self.clients.chat_model(route, model_name=self.model_for(route), temperature=0.7, streaming=True)
+
+    def context_builder(self, route: str) -> ContextBuilder:
+        return build_context_builder(self.model_for(route), self.context_budgets.get(route))
+
+    def get(self, name: str) -> Optional[BaseAgent]:
+        return self.agents.get(name)
+
+    def session(self, name: str, session_id: Optional[str]) -> AgentSession:
+        return AgentSession(self.agents[name], session_id)
+
+    async def warm(self):
+        for agent in self.agents.values():
+            agent.warm()
+        if self.question_bank is not None:
+            await self.question_bank.warm()
+        if settings.LLM_PREWARM_CONNECTIONS:
+            # In the background, so startup does not wait on the API
+            self._prewarm = asyncio.create_task(self.clients.warm())
+
+    async def close(self):
+        if self._prewarm is not None:
+            self._prewarm.cancel()
+        await self.clients.aclose()
+
+
+def build_agent_factory(match_matrix=None, question_bank=None) -> AgentFactory:
+    """Create the agent factory configured in settings"""
+    clients = LLMClientPool(
+        settings.OPENAI_API_KEY,
+        settings.OPENAI_API_BASE,
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        timeout=settings.LLM_REQUEST_TIMEOUT,
+        max_retries=settings.LLM_MAX_RETRIES,
+        gateway=settings.LLM_GATEWAY_ENABLED
+    )
+    return AgentFactory(
+        clients,
+        match_matrix=match_matrix,
+        question_bank=question_bank,
+        routes=parse_model_routes(settings.LLM_MODEL_ROUTES),
+        context_budgets=parse_token_budgets(settings.AGENT_CONTEXT_TOKENS)
+    )
@@ -1,28 +1,36 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Union
+import json
 from langchain.agents import Tool
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.agents.format_scratchpad import format_to_openai_function_messages
 from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
+from ..services.interview_agenda import build_agenda, candidate_skills, job_skills, plan_interview
+from ..services.pdf_parser import PDFParser
+from ..services.skill_taxonomy import match_requirements
+from ..services.web_scraper import WebScraper
 from .base_agent import BaseAgent
+from .schemas import HRAssessment
 
 class HRAgent(BaseAgent):
-    def __init__(self):
-        super().__init__(name="HR Agent")
+    output_schema = HRAssessment
+    
+    def __init__(self, llm=None, memory=None, context_builder=None):
+        super().__init__(name="HR Agent", memory=memory, llm=llm, context_builder=context_builder)
         self.tools = [
             Tool(
                 name="parse_cv",
                 func=self._parse_cv,
-                description="Parse a CV document and extract relevant information"
+                description="Extract skills, experience, education and projects from a CV; input is JSON with cv_text"
             ),
             Tool(
                 name="parse_job_description",
                 func=self._parse_job_description,
-                description="Parse a job description and extract requirements"
+                description="Extract required and preferred skills from a job description; input is JSON with job_description text"
             ),
             Tool(
                 name="create_interview_agenda",
                 func=self._create_interview_agenda,
-                description="Create an interview agenda based on CV and job description"
+                description="Match CV skills against job requirements and template an interview agenda; input is JSON with cv_info and jd_info as returned by the parse tools"
             )
         ]
     
@@ -32,7 +40,10 @@ class HRAgent(BaseAgent):
             1. Analyze candidate CVs and job descriptions
             2. Create comprehensive interview agendas
             3. Identify key technical areas to assess
-            4. Consider both technical and soft skills requirements"""),
+            4. Consider both technical and soft skills requirements
+            
+            When the input includes an "analysis" (skills, skill match and agenda), it is
+            already computed: do not call tools to redo it, only explain it."""),
             MessagesPlaceholder(variable_name="chat_history"),
             ("human", "{input}"),
             MessagesPlaceholder(variable_name="agent_scratchpad"),
@@ -44,42 +55,87 @@ class HRAgent(BaseAgent):
             "agent_scratchpad": lambda x: format_to_openai_function_messages(x["intermediate_steps"])
         } | prompt | self.llm | OpenAIFunctionsAgentOutputParser()
         
-        self.agent_executor = AgentExecutor(agent=agent, tools=self.tools, verbose=True)
+        self.agent_executor = self.build_executor(agent)
+        self.structured_chain = self.build_structured_chain(prompt)
+    
+    def needs_tools(self, input_data: Dict[str, Any]) -> bool:
+        # Without a precomputed analysis the agent has to parse the documents itself
+        return "analysis" not in input_data
     
-    def _parse_cv(self, cv_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze(
+        self,
+        cv_text: str,
+        cv_parsed: Dict[str, Any],
+        job_text: str,
+        job_parsed: Dict[str, Any],
+        requirements: Optional[Tuple[List[str], List[str]]] = None
+    ) -> Dict[str, Any]:
+        """Candidate info, job requirements, skill match and agenda without the LLM
+        
+        Skills come from the taxonomy matcher, the match is a set comparison and the
+        agenda is templated, so the agent's LLM run only has to write the narrative.
+        ``requirements`` are the job's (required, preferred) skills when already known.
+        """
+        plan = plan_interview(cv_text, job_parsed, job_text, requirements=requirements)
+        return {
+            "candidate_info": {**cv_parsed, "skills": plan["skills"]},
+            "job_requirements": {
+                **job_parsed,
+                "required_skills": plan["required_skills"],
+                "preferred_skills": plan["preferred_skills"]
+            },
+            "skill_match": plan["skill_match"],
+            "agenda": plan["agenda"]
+        }
+    
+    @staticmethod
+    def summarize(assessment: Dict[str, Any]) -> str:
+        """A short fit summary of an assessment, for runs that reuse a stored one instead of the LLM"""
+        skill_match = assessment["skill_match"]
+        name = assessment["candidate_info"].get("name") or "The candidate"
+        summary = f"{name} has {skill_match['match_percentage']}% of the required skills"
+        if skill_match["matched_skills"]:
+            summary += f" ({', '.join(skill_match['matched_skills'])})"
+        if skill_match["missing_skills"]:
+            summary += f"; gaps to probe: {', '.join(skill_match['missing_skills'])}"
+        sections = ", ".join(section.replace("_", " ") for section in assessment["agenda"])
+        return f"{summary}. The agenda covers {sections}."
+    
+    def _parse_cv(self, cv_data: Union[Dict[str, Any], str]) -> Dict[str, Any]:
         """Parse CV data and extract relevant information"""
-        # Implementation for CV parsing
+        cv_data = self.parse_tool_input(cv_data)
+        text = cv_data.get("cv_text") or cv_data.get("text") or ""
+        sections = PDFParser.parse_cv_content(text)["sections"]
         return {
-            "skills": [],
-            "experience": [],
-            "education": [],
-            "projects": []
+            "skills": candidate_skills(text),
+            "experience": sections.get("experience", ""),
+            "education": sections.get("education", ""),
+            "projects": sections.get("projects", "")
         }
     
-    def _parse_job_description(self, jd_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_job_description(self, jd_data: Union[Dict[str, Any], str]) -> Dict[str, Any]:
         """Parse job description and extract requirements"""
-        # Implementation for job description parsing
+        jd_data = self.parse_tool_input(jd_data)
+        text = jd_data.get("job_description") or jd_data.get("text") or ""
+        if isinstance(text, dict):
+            text = text.get("content", "")
+        sections = WebScraper.extract_job_description(text)
+        required, preferred = job_skills(sections, text)
         return {
-            "required_skills": [],
-            "preferred_skills": [],
-            "responsibilities": [],
-            "qualifications": []
+            "required_skills": required,
+            "preferred_skills": preferred,
+            "responsibilities": sections.get("responsibilities", ""),
+            "qualifications": sections.get("requirements", "")
         }
     
-    def _create_interview_agenda(self, cv_info: Dict[str, Any], jd_info: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_interview_agenda(self, agenda_input: Union[Dict[str, Any], str]) -> Dict[str, Any]:
         """Create interview agenda based on CV and job description"""
-        # Implementation for agenda creation
-        return {
-            "technical_interview": {
-                "topics": [],
-                "duration": "60 minutes"
-            },
-            "system_design": {
-                "topics": [],
-                "duration": "45 minutes"
-            },
-            "behavioral": {
-                "topics": [],
-                "duration": "30 minutes"
-            }
-        } 
\ No newline at end of file
+        agenda_input = self.parse_tool_input(agenda_input)
+        cv_info = agenda_input.get("cv_info") or {}
+        jd_info = agenda_input.get("jd_info") or {}
+        skill_match = match_requirements(
+            cv_info.get("skills", []),
+            jd_info.get("required_skills", []),
+            jd_info.get("preferred_skills", [])
+        )
+        return {"skill_match": skill_match, **build_agenda(skill_match, json.dumps(jd_info))}
@@ -1,13 +1,30 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional, Union
+import asyncio
 from langchain.agents import Tool
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.agents.format_scratchpad import format_to_openai_function_messages
 from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
+from ..core.config import settings
+from ..services.question_bank import QuestionBank, generate_with_llm, normalize_difficulty
 from .base_agent import BaseAgent
+from .schemas import InterviewPlan
 
 class InterviewerAgent(BaseAgent):
-    def __init__(self):
-        super().__init__(name="Interviewer Agent")
+    output_schema = InterviewPlan
+    # Claimed skills are probed in depth, gaps at the basics
+    FOCUS_DIFFICULTY = {"verify": "hard", "gap": "easy", "preferred": "medium"}
+    
+    def __init__(
+        self,
+        llm=None,
+        memory=None,
+        question_bank: Optional[QuestionBank] = None,
+        question_llm=None,
+        context_builder=None
+    ):
+        super().__init__(name="Interviewer Agent", memory=memory, llm=llm, context_builder=context_builder)
+        self.question_bank = question_bank
+        self.question_llm = question_llm or self.llm
         self.tools = [
             Tool(
                 name="search_technical_concepts",
@@ -17,7 +34,8 @@ class InterviewerAgent(BaseAgent):
             Tool(
                 name="generate_questions",
                 func=self._generate_questions,
-                description="Generate interview questions based on topic and difficulty"
+                coroutine=self._agenerate_questions,
+                description="Get interview questions from the question bank; input is JSON with topic, difficulty (easy, medium or hard) and optionally count"
             ),
             Tool(
                 name="evaluate_response",
@@ -32,7 +50,11 @@ class InterviewerAgent(BaseAgent):
             1. Generate appropriate technical questions based on the interview agenda
             2. Ask follow-up questions based on candidate responses
             3. Evaluate technical knowledge and problem-solving skills
-            4. Maintain a professional and supportive interview environment"""),
+            4. Maintain a professional and supportive interview environment
+            
+            When the input includes "questions" drawn from the question bank, build the
+            interview from them rather than writing new ones: keep their wording, order
+            them for the interview and add expected answers and follow-ups."""),
             MessagesPlaceholder(variable_name="chat_history"),
             ("human", "{input}"),
             MessagesPlaceholder(variable_name="agent_scratchpad"),
@@ -44,7 +66,12 @@ class InterviewerAgent(BaseAgent):
             "agent_scratchpad": lambda x: format_to_openai_function_messages(x["intermediate_steps"])
         } | prompt | self.llm | OpenAIFunctionsAgentOutputParser()
         
-        self.agent_executor = AgentExecutor(agent=agent, tools=self.tools, verbose=True)
+        self.agent_executor = self.build_executor(agent)
+        self.structured_chain = self.build_structured_chain(prompt)
+    
+    def needs_tools(self, input_data: Dict[str, Any]) -> bool:
+        # Banked questions cover the agenda; otherwise the agent fetches them itself
+        return not input_data.get("questions")
     
     def _search_technical_concepts(self, topic: str) -> Dict[str, Any]:
         """Search for technical concepts and explanations"""
@@ -56,19 +83,59 @@ class InterviewerAgent(BaseAgent):
             "related_topics": []
         }
     
-    def _generate_questions(self, topic: str, difficulty: str) -> List[Dict[str, Any]]:
-        """Generate interview questions based on topic and difficulty"""
-        # Implementation for question generation
+    async def questions_for(
+        self,
+        topic: str,
+        difficulty: str,
+        count: Optional[int] = None,
+        exclude: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """Questions for a topic: banked ones first, the LLM only for the shortfall"""
+        count = count or settings.QUESTION_BANK_QUESTIONS_PER_TOPIC
+        difficulty = normalize_difficulty(difficulty)
+        if self.question_bank is not None:
+            questions = await self.question_bank.generate_questions(
+                topic, difficulty, count, llm=self.question_llm, exclude=exclude
+            )
+        else:
+            questions = await generate_with_llm(self.question_llm, topic, difficulty, count)
+        return [{**question, "type": question.get("type") or "technical"} for question in questions]
+    
+    async def plan_questions(self, agenda: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Questions for every skill topic on an agenda, fetched concurrently, in agenda order
+        
+        Each question carries the agenda section, skill and focus it was asked for.
+        """
+        topics = [
+            (section, topic)
+            for section in ("technical_interview", "system_design")
+            for topic in (agenda.get(section) or {}).get("topics", [])
+            if isinstance(topic, dict) and topic.get("skill")
+        ]
+        batches = await asyncio.gather(*(
+            self.questions_for(topic["skill"], self.FOCUS_DIFFICULTY.get(topic.get("focus"), "medium"))
+            for _, topic in topics
+        ))
         return [
-            {
-                "question": "",
-                "type": "technical",
-                "difficulty": difficulty,
-                "expected_answer": "",
-                "follow_up_questions": []
-            }
+            {**question, "section": section, "skill": topic["skill"], "focus": topic.get("focus")}
+            for (section, topic), questions in zip(topics, batches)
+            for question in questions
         ]
     
+    async def _agenerate_questions(self, tool_input: Union[Dict[str, Any], str]) -> List[Dict[str, Any]]:
+        """Generate interview questions based on topic and difficulty"""
+        tool_input = self.parse_tool_input(tool_input)
+        return await self.questions_for(
+            tool_input.get("topic") or tool_input.get("text", ""),
+            tool_input.get("difficulty", "medium"),
+            int(tool_input.get("count") or 0) or None
+        )
+    
+    def _generate_questions(self, tool_input: Union[Dict[str, Any], str]) -> List[Dict[str, Any]]:
+        """Generate interview questions based on topic and difficulty"""
+        # Only used when the executor runs synchronously, so no event loop is running here
+        return asyncio.run(self._agenerate_questions(tool_input))
+    
     def _evaluate_response(self, question: Dict[str, Any], response: str) -> Dict[str, Any]:
         """Evaluate candidate's response to a question"""
         # Implementation for response evaluation
@@ -0,0 +1,220 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+from langchain.chat_models import ChatOpenAI
+from langchain.memory.prompt import SUMMARY_PROMPT
+from langchain.schema import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain.schema import messages_from_dict, messages_to_dict
+from ..core.config import settings
+from ..services.llm_cache import SQLiteCacheBackend
+
+# Rough tokens per character for English/JSON prompts, plus per-message framing
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def count_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def format_turns(messages: List[BaseMessage]) -> str:
+    return "\n".join(
+        f"{'Human' if isinstance(message, HumanMessage) else 'AI'}: {message.content}"
+        for message in messages
+    )
+
+
+class LLMSummarizer:
+    """Folds old turns into a running summary with an LLM call"""
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    async def summarize(self, summary: str, messages: List[BaseMessage]) -> str:
+        prompt = SUMMARY_PROMPT.format(summary=summary, new_lines=format_turns(messages))
+        return (await self.llm.apredict(prompt)).strip()
+
+
+class TruncatingSummarizer:
+    """Keeps a clipped transcript of old turns; no LLM calls"""
+
+    def __init__(self, max_tokens: int, max_chars_per_turn: int = 300):
+        self.max_tokens = max_tokens
+        self.max_chars_per_turn = max_chars_per_turn
+
+    async def summarize(self, summary: str, messages: List[BaseMessage]) -> str:
+        clipped = [
+            type(message)(content=message.content[:self.max_chars_per_turn])
+            for message in messages
+        ]
+        summary = "\n".join(part for part in (summary, format_turns(clipped)) if part)
+        return summary[-self.max_tokens * CHARS_PER_TOKEN:]
+
+
+class SessionMemory:
+    """History of one session: a summary of older turns plus the recent messages"""
+
+    def __init__(self, summary: str = "", messages: Optional[List[BaseMessage]] = None):
+        self.summary = summary
+        self.messages = messages or []
+        self.last_used = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    @property
+    def tokens(self) -> int:
+        tokens = count_tokens(self.summary) if self.summary else 0
+        return tokens + sum(count_tokens(message.content) for message in self.messages)
+
+    def as_messages(self) -> List[BaseMessage]:
+        prefix = [SystemMessage(content=f"Summary of the conversation so far:\n{self.summary}")] if self.summary else []
+        return prefix + self.messages
+
+    def dumps(self) -> str:
+        return json.dumps({"summary": self.summary, "messages": messages_to_dict(self.messages)})
+
+    @classmethod
+    def loads(cls, value: str) -> "SessionMemory":
+        data = json.loads(value)
+        return cls(data["summary"], messages_from_dict(data["messages"]))
+
+
+class AgentMemory:
+    """Per-session conversation memory with a token budget.
+
+    When a session's history exceeds ``max_tokens`` the oldest turns are folded into
+    a rolling summary until it is back under half the budget. Sessions live in an
+    in-process LRU bounded by ``max_sessions`` and are dropped after ``idle_ttl``
+    seconds without use; with a ``store`` every update is written through, so
+    evicted sessions are reloaded on their next turn and survive restarts.
+    """
+
+    def __init__(
+        self,
+        summarizer,
+        max_tokens: int = 2000,
+        max_sessions: int = 1000,
+        idle_ttl: float = 3600,
+        store: Optional[SQLiteCacheBackend] = None,
+        namespace: str = ""
+    ):
+        self.summarizer = summarizer
+        self.max_tokens = max_tokens
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.store = store
+        self.namespace = namespace
+        self._sessions: "OrderedDict[str, SessionMemory]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.namespace}:{session_id}"
+
+    def _evict(self):
+        now = time.monotonic()
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - session.last_used <= self.idle_ttl:
+                break
+            del self._sessions[session_id]
+
+    def _session(self, session_id: str) -> SessionMemory:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                value = self.store.get(self._key(session_id), 0) if self.store is not None else None
+                session = SessionMemory.loads(value) if value else SessionMemory()
+                self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            session.last_used = time.monotonic()
+            self._evict()
+            return session
+
+    async def load_messages(self, session_id: str) -> List[BaseMessage]:
+        """Chat history to send with the next turn of a session"""
+        session = await asyncio.to_thread(self._session, session_id)
+        return session.as_messages()
+
+    async def save_turn(self, session_id: str, input_text: str, output_text: str):
+        """Append a turn, summarizing the oldest turns once the session is over budget"""
+        session = await asyncio.to_thread(self._session, session_id)
+        async with session.lock:
+            session.messages.extend([HumanMessage(content=input_text), AIMessage(content=output_text)])
+            if session.tokens > self.max_tokens:
+                folded = []
+                # Always keep the latest turn verbatim
+                while len(session.messages) > 2 and session.tokens > self.max_tokens // 2:
+                    folded.extend(session.messages[:2])
+                    del session.messages[:2]
+                if folded:
+                    session.summary = await self.summarizer.summarize(session.summary, folded)
+            if self.store is not None:
+                await asyncio.to_thread(self.store.set, self._key(session_id), session.dumps())
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        session = self._session(session_id)
+        return {"summary": session.summary, "chat_history": session.messages, "tokens": session.tokens}
+
+    def clear(self, session_id: Optional[str] = None):
+        """Forget one session, or every session held in process"""
+        with self._lock:
+            session_ids = [session_id] if session_id is not None else list(self._sessions)
+            for key in session_ids:
+                self._sessions.pop(key, None)
+                if self.store is not None:
+                    self.store.delete(self._key(key))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+_stores: Dict[str, SQLiteCacheBackend] = {}
+
+
+def build_agent_memory(namespace: str, llm=None) -> AgentMemory:
+    """Create the agent memory configured in settings
+
+    ``llm`` is the summarization model; by default a dedicated client is created.
+    """
+    if settings.AGENT_MEMORY_SUMMARIZER == "llm":
+        summarizer = LLMSummarizer(llm or ChatOpenAI(
+            model_name=settings.AGENT_MEMORY_SUMMARY_MODEL or settings.OPENAI_MODEL,
+            temperature=0,
+            openai_api_key=settings.OPENAI_API_KEY,
+            openai_api_base=settings.OPENAI_API_BASE
+        ))
+    elif settings.AGENT_MEMORY_SUMMARIZER == "truncate":
+        summarizer = TruncatingSummarizer(settings.AGENT_MEMORY_MAX_TOKENS // 2)
+    else:
+        raise ValueError(f"Unknown agent memory summarizer '{settings.AGENT_MEMORY_SUMMARIZER}'")
+
+    if settings.AGENT_MEMORY_BACKEND == "memory":
+        store = None
+    elif settings.AGENT_MEMORY_BACKEND == "sqlite":
+        # One connection shared by every agent's memory
+        store = _stores.get(settings.AGENT_MEMORY_SQLITE_PATH)
+        if store is None:
+            store = _stores[settings.AGENT_MEMORY_SQLITE_PATH] = SQLiteCacheBackend(
+                settings.AGENT_MEMORY_SQLITE_PATH,
+                settings.AGENT_MEMORY_MAX_STORED_SESSIONS,
+                table="agent_memory"
+            )
+    else:
+        raise ValueError(f"Unknown agent memory backend '{settings.AGENT_MEMORY_BACKEND}'")
+
+    return AgentMemory(
+        summarizer,
+        max_tokens=settings.AGENT_MEMORY_MAX_TOKENS,
+        max_sessions=settings.AGENT_MEMORY_MAX_SESSIONS,
+        idle_ttl=settings.AGENT_MEMORY_IDLE_TTL,
+        store=store,
+        namespace=namespace
+    )
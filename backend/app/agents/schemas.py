@@ -0,0 +1,73 @@
+from typing import List, Optional
+from langchain.pydantic_v1 import BaseModel, Field
+
+# Structured outputs the agents return in one function call. Field names follow
+# the candidate_info / job_requirements / agenda dicts the workflow and API use.
+
+
+class CandidateInfo(BaseModel):
+    """What the CV says about the candidate"""
+    name: Optional[str] = Field(None, description="Candidate's name, if stated")
+    skills: List[str] = Field(default_factory=list, description="Technical and soft skills")
+    years_of_experience: Optional[float] = Field(None, description="Total years of professional experience")
+    highlights: List[str] = Field(default_factory=list, description="Notable roles, projects or achievements")
+
+
+class JobRequirements(BaseModel):
+    """What the job asks for"""
+    required_skills: List[str] = Field(default_factory=list)
+    preferred_skills: List[str] = Field(default_factory=list)
+    responsibilities: List[str] = Field(default_factory=list)
+    seniority: Optional[str] = Field(None, description="e.g. junior, mid, senior, lead")
+
+
+class AgendaTopic(BaseModel):
+    skill: str
+    focus: str = Field("verify", description="verify a claimed skill, probe a gap, or check a preferred skill")
+    category: Optional[str] = None
+
+
+class AgendaSection(BaseModel):
+    topics: List[AgendaTopic] = Field(default_factory=list)
+    duration: str = Field(..., description="e.g. 45 minutes")
+
+
+class Agenda(BaseModel):
+    technical_interview: AgendaSection
+    system_design: Optional[AgendaSection] = None
+    behavioral: AgendaSection
+
+
+class HRAssessment(BaseModel):
+    """Report the HR assessment of the candidate against the job, with the interview agenda"""
+    summary: str = Field(..., description="A short narrative of the candidate's fit for the interviewer")
+    candidate_info: CandidateInfo
+    job_requirements: JobRequirements
+    agenda: Agenda
+
+
+class PlannedQuestion(BaseModel):
+    skill: str
+    question: str
+    difficulty: str = Field("medium", description="easy, medium or hard")
+    expected_answer: Optional[str] = None
+    follow_up_questions: List[str] = Field(default_factory=list)
+
+
+class InterviewPlan(BaseModel):
+    """Report the questions to ask, in interview order"""
+    summary: str = Field(..., description="How the interview will run, for the supervisor")
+    questions: List[PlannedQuestion]
+
+
+class SupervisorVerdict(BaseModel):
+    """Report the final evaluation and hiring recommendation"""
+    summary: str = Field(..., description="The evaluation in a few sentences")
+    recommendation: str = Field(..., description="strong_hire, hire, no_hire or strong_no_hire")
+    technical_score: int = Field(..., ge=0, le=10)
+    problem_solving_score: int = Field(..., ge=0, le=10)
+    communication_score: int = Field(..., ge=0, le=10)
+    strengths: List[str] = Field(default_factory=list)
+    weaknesses: List[str] = Field(default_factory=list)
+    missing_skills: List[str] = Field(default_factory=list)
+    confidence: float = Field(..., ge=0, le=1)
@@ -0,0 +1,63 @@
+import asyncio
+from typing import Dict, Any, Optional
+from langchain.callbacks.base import AsyncCallbackHandler
+
+_RUN_FINISHED = object()
+
+
+class AgentStreamHandler(AsyncCallbackHandler):
+    """Callback handler that forwards tokens and tool calls of an agent run to a queue
+
+    A structured run answers through a forced function call, whose streamed deltas
+    have no content; their argument fragments are forwarded as
+    ``function_call_delta`` events instead.
+    """
+
+    def __init__(self, queue: asyncio.Queue, agent: str):
+        self.queue = queue
+        self.agent = agent
+
+    async def _emit(self, event_type: str, **data):
+        await self.queue.put({"type": event_type, "agent": self.agent, **data})
+
+    async def on_llm_new_token(self, token: str, *, chunk: Any = None, **kwargs: Any) -> None:
+        if token:
+            await self._emit("token", token=token)
+            return
+        message = getattr(chunk, "message", None)
+        function_call = getattr(message, "additional_kwargs", {}).get("function_call") or {}
+        if function_call.get("arguments"):
+            await self._emit("function_call_delta", arguments=function_call["arguments"])
+
+    async def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any) -> None:
+        await self._emit("tool_start", tool=serialized.get("name"), input=input_str)
+
+    async def on_tool_end(self, output: Any, **kwargs: Any) -> None:
+        await self._emit("tool_end", output=str(output))
+
+    async def on_tool_error(self, error: BaseException, **kwargs: Any) -> None:
+        await self._emit("tool_error", error=str(error))
+
+
+async def stream_agent_run(agent, input_data: Dict[str, Any], session_id: Optional[str] = None):
+    """Run an agent and yield its stream events, ending with an ``agent_response`` event.
+
+    Closing the generator early (e.g. on client disconnect) cancels the agent run so
+    no further tokens are requested from the LLM.
+    """
+    queue = asyncio.Queue()
+    handler = AgentStreamHandler(queue, agent.name)
+    task = asyncio.create_task(agent.process_input(input_data, callbacks=[handler], session_id=session_id))
+    task.add_done_callback(lambda _: queue.put_nowait(_RUN_FINISHED))
+    try:
+        while True:
+            event = await queue.get()
+            if event is _RUN_FINISHED:
+                break
+            yield event
+        response = task.result()
+        yield {"type": "agent_response", "agent": agent.name, **response}
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
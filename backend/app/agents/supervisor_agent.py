@@ -1,13 +1,22 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 from langchain.agents import Tool
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.agents.format_scratchpad import format_to_openai_function_messages
 from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
+from ..services.match_matrix import MatchMatrix
+from ..services.skill_taxonomy import match_requirements
 from .base_agent import BaseAgent
+from .schemas import SupervisorVerdict
 
 class SupervisorAgent(BaseAgent):
-    def __init__(self):
-        super().__init__(name="Supervisor Agent")
+    # Thresholds on the match score (cosine similarity, or share of required skills)
+    STRONG_MATCH = 0.8
+    PARTIAL_MATCH = 0.6
+    output_schema = SupervisorVerdict
+    
+    def __init__(self, match_matrix: Optional[MatchMatrix] = None, llm=None, memory=None, context_builder=None):
+        super().__init__(name="Supervisor Agent", memory=memory, llm=llm, context_builder=context_builder)
+        self.match_matrix = match_matrix
         self.tools = [
             Tool(
                 name="analyze_interview_data",
@@ -22,7 +31,7 @@ class SupervisorAgent(BaseAgent):
             Tool(
                 name="compare_with_job_requirements",
                 func=self._compare_with_job_requirements,
-                description="Compare candidate performance with job requirements"
+                description="Compare the candidate with the job requirements using precomputed match scores; input is JSON with candidate_id and job_description_id, and optionally skills and required_skills"
             )
         ]
     
@@ -32,7 +41,10 @@ class SupervisorAgent(BaseAgent):
             1. Analyze the complete interview process and candidate performance
             2. Compare candidate skills with job requirements
             3. Generate comprehensive feedback for all stakeholders
-            4. Make final hiring recommendations"""),
+            4. Make final hiring recommendations
+            
+            When the input includes a "comparison" with the job requirements, it is
+            already computed from the match scores: base the evaluation on it."""),
             MessagesPlaceholder(variable_name="chat_history"),
             ("human", "{input}"),
             MessagesPlaceholder(variable_name="agent_scratchpad"),
@@ -44,7 +56,24 @@ class SupervisorAgent(BaseAgent):
             "agent_scratchpad": lambda x: format_to_openai_function_messages(x["intermediate_steps"])
         } | prompt | self.llm | OpenAIFunctionsAgentOutputParser()
         
-        self.agent_executor = AgentExecutor(agent=agent, tools=self.tools, verbose=True)
+        self.agent_executor = self.build_executor(agent)
+        self.structured_chain = self.build_structured_chain(prompt)
+    
+    def needs_tools(self, input_data: Dict[str, Any]) -> bool:
+        # The comparison is attached up front when match results are in the input
+        return not (input_data.get("job_match") or input_data.get("skill_match"))
+    
+    def format_input(self, input_data: Dict[str, Any]) -> str:
+        if not self.needs_tools(input_data):
+            # Runs on the event loop: an empty job_match means not scored yet, not a lookup
+            input_data = {
+                **input_data,
+                "comparison": self._compare_with_job_requirements(
+                    {key: input_data.get(key) for key in ("candidate_id", "job_description_id", "job_match", "skill_match")},
+                    lookup_match=False
+                )
+            }
+        return super().format_input(input_data)
     
     def _analyze_interview_data(self, interview_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze interview data and candidate performance"""
@@ -78,13 +107,71 @@ class SupervisorAgent(BaseAgent):
             }
         }
     
-    def _compare_with_job_requirements(self, candidate_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, Any]:
-        """Compare candidate performance with job requirements"""
-        # Implementation for requirement comparison
-        return {
-            "match_percentage": 0,
-            "missing_skills": [],
-            "exceeding_expectations": [],
-            "recommendation": "",
-            "confidence_score": 0
-        } 
\ No newline at end of file
+    def _compare_with_job_requirements(
+        self,
+        candidate_data: Union[Dict[str, Any], str],
+        job_requirements: Optional[Dict[str, Any]] = None,
+        lookup_match: bool = True
+    ) -> Dict[str, Any]:
+        """Compare the candidate with job requirements from precomputed results
+        
+        Missing and matched skills come from a set comparison of taxonomy skills (a
+        ``skill_match`` attached to the input, or ``skills`` against
+        ``required_skills``); the similarity score and rank come from the stored
+        candidate-job match (or a ``job_match`` attached to the input). Neither needs
+        the LLM. ``lookup_match`` reads the stored match from the database, which only
+        the synchronous tool path does.
+        """
+        candidate_data = self.parse_tool_input(candidate_data)
+        ids = {**(job_requirements or {}), **candidate_data}
+        skill_match = candidate_data.get("skill_match")
+        if not skill_match and candidate_data.get("skills") is not None and ids.get("required_skills") is not None:
+            skill_match = match_requirements(
+                candidate_data["skills"], ids["required_skills"], ids.get("preferred_skills", [])
+            )
+        match = candidate_data.get("job_match")
+        if not match and lookup_match and self.match_matrix is not None and ids.get("candidate_id") and ids.get("job_description_id"):
+            match = self.match_matrix.get_match(int(ids["candidate_id"]), int(ids["job_description_id"]))
+        if not match and not skill_match:
+            return {
+                "match_percentage": 0,
+                "missing_skills": [],
+                "exceeding_expectations": [],
+                "recommendation": "No precomputed match available",
+                "confidence_score": 0
+            }
+        
+        result = {"match_percentage": 0, "missing_skills": [], "exceeding_expectations": [], "confidence_score": 0}
+        if match:
+            score = match["score"]
+            section_scores = match.get("section_scores") or {}
+            weights = {pair[0]: pair[3] for pair in MatchMatrix.PAIRS}
+            scored = [name for name, value in section_scores.items() if value]
+            result.update({
+                "match_percentage": round(max(score, 0) * 100, 1),
+                "exceeding_expectations": [name for name in scored if section_scores[name] >= self.STRONG_MATCH],
+                "weak_sections": [name for name in scored if section_scores[name] < self.PARTIAL_MATCH],
+                # Share of the score weight backed by sections present on both sides
+                "confidence_score": round(sum(weights.get(name, 0) for name in scored), 2),
+                "section_scores": section_scores,
+                "rank": match.get("rank"),
+                "total_candidates": match.get("total")
+            })
+        if skill_match:
+            # Listed requirements are the firmer signal, so they set the percentage
+            result.update({
+                "match_percentage": skill_match["match_percentage"],
+                "missing_skills": skill_match["missing_skills"],
+                "matched_skills": skill_match["matched_skills"],
+                "missing_preferred": skill_match["missing_preferred"],
+                "exceeding_expectations": skill_match["matched_preferred"] + result["exceeding_expectations"],
+                "confidence_score": 1.0 if skill_match["matched_skills"] or skill_match["missing_skills"] else result["confidence_score"]
+            })
+        percentage = result["match_percentage"] / 100
+        if percentage >= self.STRONG_MATCH:
+            result["recommendation"] = "Strong match"
+        elif percentage >= self.PARTIAL_MATCH:
+            result["recommendation"] = "Partial match"
+        else:
+            result["recommendation"] = "Weak match"
+        return result
@@ -0,0 +1,90 @@
+from typing import AsyncIterator, List, Optional
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+
+class MultipartError(ValueError):
+    """Raised for malformed multipart bodies or a missing file field"""
+
+
+class MultipartFileStream:
+    """Incrementally parses a multipart/form-data body and yields one file field's bytes.
+
+    Unlike FastAPI's ``UploadFile``, nothing is spooled to memory or a temporary file:
+    chunks are handed to the caller as they arrive from the client.
+    """
+
+    def __init__(self, content_type: str, field_name: str):
+        _, params = parse_options_header(content_type)
+        if b"boundary" not in params:
+            raise MultipartError("Missing boundary in multipart body")
+        self.field_name = field_name
+        self.filename: Optional[str] = None
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._in_target = False
+        self._seen_target = False
+        self._complete = False
+        self._chunks: List[bytes] = []
+        self._parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_end": self._on_end,
+        })
+
+    def _on_part_begin(self):
+        self._disposition = b""
+        self._in_target = False
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._in_target:
+            self._chunks.append(data[start:end])
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        if name == self.field_name and b"filename" in options and not self._seen_target:
+            self.filename = options[b"filename"].decode("utf-8", errors="replace")
+            self._in_target = True
+            self._seen_target = True
+
+    def _on_end(self):
+        self._complete = True
+
+    async def iter_chunks(self, body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Feed the raw request body and yield the target file's bytes"""
+        async for chunk in body:
+            try:
+                self._parser.write(chunk)
+            except MultipartParseError as e:
+                raise MultipartError(f"Malformed multipart body: {e}") from e
+            chunks, self._chunks = self._chunks, []
+            for data in chunks:
+                if data:
+                    yield data
+        try:
+            self._parser.finalize()
+        except MultipartParseError as e:
+            raise MultipartError(f"Malformed multipart body: {e}") from e
+        if not self._complete:
+            raise MultipartError("Truncated multipart body: closing boundary not found")
+        if not self._seen_target:
+            raise MultipartError(f"Missing file field '{self.field_name}'")
+
@@ -0,0 +1,125 @@
+import asyncio
+import inspect
+import time
+from typing import Dict, Any, List, Callable, Awaitable, Optional
+from .telemetry import span
+
+StageListener = Callable[[str, str, Dict[str, Any]], Awaitable[None]]
+
+
+class Stage:
+    """A named unit of work that runs once all of its dependencies are done"""
+
+    def __init__(self, name: str, func: Callable[..., Any], depends_on: Optional[List[str]] = None):
+        self.name = name
+        self.func = func
+        self.depends_on = depends_on or []
+
+
+class PipelineResult:
+    """Outputs and timings of a pipeline run"""
+
+    def __init__(self):
+        self.outputs: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.total_ms: float = 0.0
+
+    def server_timing(self) -> str:
+        """Format stage durations as a Server-Timing header value"""
+        entries = [f"{name};dur={timing['duration_ms']:.1f}" for name, timing in self.timings.items()]
+        entries.append(f"total;dur={self.total_ms:.1f}")
+        return ", ".join(entries)
+
+
+class Pipeline:
+    """Runs stages as a dependency graph, starting each one as soon as its inputs are ready.
+
+    A stage function receives the shared run context followed by the outputs of its
+    dependencies as keyword arguments. Blocking functions are run in a worker thread.
+    Each stage runs in a ``stage.<name>`` telemetry span.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a dependency cycle through '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def run(
+        self,
+        context: Dict[str, Any],
+        on_event: Optional[StageListener] = None,
+        outputs: Optional[Dict[str, Any]] = None
+    ) -> PipelineResult:
+        """Run every stage and return their outputs and timings.
+
+        If given, ``on_event`` is awaited with ``(event, stage_name, details)`` when a
+        stage starts (``stage_started``) and finishes (``stage_completed``). Stages
+        named in ``outputs`` are not run; their dependents receive the given output.
+        """
+        result = PipelineResult()
+        started = time.perf_counter()
+        tasks: Dict[str, asyncio.Future] = {}
+
+        async def run_stage(stage: Stage):
+            inputs = {}
+            for dependency in stage.depends_on:
+                inputs[dependency] = await tasks[dependency]
+
+            stage_started = time.perf_counter()
+            if on_event:
+                await on_event("stage_started", stage.name, {"start_ms": (stage_started - started) * 1000})
+            with span(f"stage.{stage.name}"):
+                if inspect.iscoroutinefunction(stage.func):
+                    output = await stage.func(context, **inputs)
+                else:
+                    output = await asyncio.to_thread(stage.func, context, **inputs)
+            finished = time.perf_counter()
+
+            result.timings[stage.name] = {
+                "start_ms": (stage_started - started) * 1000,
+                "duration_ms": (finished - stage_started) * 1000
+            }
+            result.outputs[stage.name] = output
+            if on_event:
+                await on_event("stage_completed", stage.name, result.timings[stage.name])
+            return output
+
+        for stage in self.stages.values():
+            if outputs and stage.name in outputs:
+                tasks[stage.name] = asyncio.get_running_loop().create_future()
+                tasks[stage.name].set_result(outputs[stage.name])
+                result.outputs[stage.name] = outputs[stage.name]
+            else:
+                tasks[stage.name] = asyncio.create_task(run_stage(stage), name=f"stage:{stage.name}")
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        result.total_ms = (time.perf_counter() - started) * 1000
+        return result
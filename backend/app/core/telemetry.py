@@ -0,0 +1,285 @@
+import bisect
+import functools
+import logging
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+TRACING_EXPORTERS = ("none", "console", "otlp")
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """A monotonically increasing count per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: Any):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = dict(self._values)
+        for key, value in values.items():
+            yield f"{self.name}_total{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram:
+    """Observations counted into cumulative buckets per label combination"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._values: Dict[LabelValues, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        for key, (counts, total) in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}"
+
+
+class MetricsRegistry:
+    """Process-wide metrics rendered in the Prometheus text format.
+
+    Counters and histograms are updated in place on the hot path (a lock and a
+    dict update each). Components that already keep their own counters register
+    a ``stats`` callable instead, which is only read when ``/metrics`` is scraped;
+    each numeric entry is exported as ``<namespace>_<key>``.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._stats: Dict[str, Tuple[Callable[[], Dict[str, Any]], str]] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def register_stats(self, namespace: str, stats: Callable[[], Dict[str, Any]], documentation: str):
+        with self._lock:
+            self._stats[namespace] = (stats, documentation)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            stats = list(self._stats.items())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for namespace, (collect, documentation) in stats:
+            try:
+                values = collect()
+            except Exception as e:
+                logger.warning("Collecting %s metrics failed: %s", namespace, e)
+                continue
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{namespace}_{key}"
+                lines.append(f"# HELP {name} {documentation}: {key.replace('_', ' ')}")
+                lines.append(f"# TYPE {name} untyped")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+SPAN_DURATION = metrics.histogram(
+    "span_duration_seconds", "Duration of instrumented operations", ("span", "status")
+)
+HTTP_REQUESTS = metrics.counter(
+    "http_requests", "HTTP requests by route and status", ("method", "route", "status")
+)
+HTTP_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request duration until the response completed", ("method", "route")
+)
+
+_tracer = None
+
+
+def configure_tracing(exporter: Optional[str] = None):
+    """Send spans to OpenTelemetry with the configured exporter
+
+    Needs the opentelemetry-sdk package (and opentelemetry-exporter-otlp-proto-http
+    for ``otlp``, which reads the standard OTEL_EXPORTER_OTLP_* variables).
+    """
+    global _tracer
+    exporter = exporter or settings.TRACING_EXPORTER
+    if exporter not in TRACING_EXPORTERS:
+        raise ValueError(f"Unknown tracing exporter '{exporter}'")
+    if exporter == "none":
+        _tracer = None
+        return
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        span_exporter = OTLPSpanExporter()
+    else:
+        span_exporter = ConsoleSpanExporter()
+    provider = TracerProvider(resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer(__name__)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """Time a block into ``span_duration_seconds`` and, with tracing on, an OpenTelemetry span
+
+    The yielded dict collects attributes set while the block runs (token counts,
+    result sizes); they are attached to the trace span when it ends.
+    """
+    started = time.perf_counter()
+    recorded: Dict[str, Any] = dict(attributes)
+    status = "error"
+    # The OpenTelemetry span records the exception and error status itself
+    with _tracer.start_as_current_span(name) if _tracer is not None else nullcontext() as current:
+        try:
+            yield recorded
+            status = "ok"
+        finally:
+            SPAN_DURATION.observe(time.perf_counter() - started, span=name, status=status)
+            if current is not None:
+                _set_attributes(current, recorded)
+
+
+def traced(name: str):
+    """Decorator running a synchronous function in a ``span``"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _set_attributes(otel_span, attributes: Dict[str, Any]):
+    for key, value in attributes.items():
+        if value is not None:
+            otel_span.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by route template.
+
+    Each request gets an X-Request-ID (the client's, or a new one) echoed in the
+    response and, with tracing on, a root span that the workflow, agent, scraper,
+    PDF and vector store spans nest under.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = next(
+            (value.decode("latin-1") for name, value in scope.get("headers", []) if name == b"x-request-id"),
+            None
+        ) or uuid.uuid4().hex
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            with span("http.request", method=scope["method"], request_id=request_id) as attributes:
+                await self.app(scope, receive, send_with_request_id)
+                attributes["status_code"] = status["code"]
+        finally:
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners cannot blow up the series count
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUESTS.inc(method=scope["method"], route=template, status=status["code"])
+            HTTP_DURATION.observe(time.perf_counter() - started, method=scope["method"], route=template)
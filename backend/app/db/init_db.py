@@ -1,10 +1,85 @@
-from sqlalchemy import create_engine
+import json
+from sqlalchemy import inspect, insert, text
+from sqlalchemy.schema import CreateColumn
 from ..models.base import Base
-from ..core.config import settings
+from ..models import interview  # noqa: F401 - registers the interview tables
+from ..models.interview import CandidatePayload, InterviewPayload
+from ..models.types import CompressedJSON
+from .session import engine
+
+# Columns that used to live on the main rows before moving to compressed payload tables
+LEGACY_PAYLOAD_COLUMNS = {
+    "candidates": (CandidatePayload, "candidate_id", ["raw_cv_text", "parsed_cv_data"]),
+    "interviews": (InterviewPayload, "interview_id", ["agenda", "questions", "responses", "feedback"]),
+}
+MIGRATION_BATCH_SIZE = 1000
+# Tables whose content_hash became unique after databases were created with duplicates
+UNIQUE_CONTENT_HASH_TABLES = ("candidates", "job_descriptions")
+
+def migrate_inline_payloads(connection):
+    """Copy payload columns of databases created before the payload tables, then clear them"""
+    inspector = inspect(connection)
+    for table, (payload, key, fields) in LEGACY_PAYLOAD_COLUMNS.items():
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        legacy = [field for field in fields if field in existing]
+        if not legacy:
+            continue
+        query = text(
+            f"SELECT id, {', '.join(legacy)} FROM {table} "
+            f"WHERE id > :after AND ({' OR '.join(f'{field} IS NOT NULL' for field in legacy)}) "
+            f"AND id NOT IN (SELECT {key} FROM {payload.__tablename__}) ORDER BY id LIMIT {MIGRATION_BATCH_SIZE}"
+        )
+        after, migrated = 0, False
+        while True:
+            rows = connection.execute(query, {"after": after}).fetchall()
+            if not rows:
+                break
+            batch = []
+            for row in rows:
+                values = {key: row[0]}
+                for field, value in zip(legacy, row[1:]):
+                    if isinstance(value, str) and isinstance(payload.__table__.c[field].type, CompressedJSON):
+                        value = json.loads(value)
+                    values[field] = value
+                batch.append(values)
+            connection.execute(insert(payload.__table__), batch)
+            after, migrated = rows[-1][0], True
+        if migrated:
+            connection.execute(text(f"UPDATE {table} SET {', '.join(f'{field} = NULL' for field in legacy)}"))
+
+def add_missing_columns(connection):
+    """Add model columns introduced since an existing table was created"""
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                definition = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {definition}"))
+
+def release_duplicate_hashes(connection):
+    """Keep the content hash on the oldest row per hash only, so the unique index can be built"""
+    inspector = inspect(connection)
+    for table in UNIQUE_CONTENT_HASH_TABLES:
+        if f"uq_{table}_content_hash" in {index["name"] for index in inspector.get_indexes(table)}:
+            continue
+        connection.execute(text(
+            f"UPDATE {table} SET content_hash = NULL WHERE content_hash IS NOT NULL AND id NOT IN "
+            f"(SELECT MIN(id) FROM {table} WHERE content_hash IS NOT NULL GROUP BY content_hash)"
+        ))
 
 def init_db():
-    engine = create_engine(settings.SQLITE_DATABASE_URL)
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add columns and indexes introduced since
+    with engine.begin() as connection:
+        add_missing_columns(connection)
+        release_duplicate_hashes(connection)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+        migrate_inline_payloads(connection)
 
 if __name__ == "__main__":
-    init_db() 
\ No newline at end of file
+    init_db()
@@ -0,0 +1,68 @@
+from typing import AsyncIterator
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from ..core.config import settings
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+SYNC_DRIVERS = {"sqlite": "sqlite", "postgresql": "postgresql+psycopg2"}
+
+
+def database_url(async_driver: bool = False) -> str:
+    """Configured database URL with the sync or async driver for its backend"""
+    url = make_url(settings.DATABASE_URL or settings.SQLITE_DATABASE_URL)
+    drivers = ASYNC_DRIVERS if async_driver else SYNC_DRIVERS
+    backend = url.get_backend_name()
+    if backend not in drivers:
+        raise ValueError(f"Unsupported database backend '{backend}'")
+    return url.set(drivername=drivers[backend]).render_as_string(hide_password=False)
+
+
+def engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True
+    }
+
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    # WAL lets readers proceed while a writer commits; NORMAL sync is durable in WAL mode
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+sync_url = database_url()
+engine = create_engine(sync_url, **engine_options(sync_url))
+SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+async_url = database_url(async_driver=True)
+async_engine = create_async_engine(async_url, **engine_options(async_url))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+if sync_url.startswith("sqlite"):
+    event.listen(engine, "connect", _configure_sqlite)
+    event.listen(async_engine.sync_engine, "connect", _configure_sqlite)
+
+
+def get_db():
+    """FastAPI dependency that yields a database session"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency that yields an async database session from the pool"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,13 +1,35 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, Body, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+import asyncio
+import json
+import logging
 import uvicorn
-from .agents.hr_agent import HRAgent
-from .agents.interviewer_agent import InterviewerAgent
-from .agents.supervisor_agent import SupervisorAgent
+from sqlalchemy.ext.asyncio import AsyncSession
+from .agents.factory import build_agent_factory
+from .agents.streaming import stream_agent_run
+from langchain.globals import set_llm_cache
 from .core.config import settings
+from .core.multipart_stream import MultipartFileStream, MultipartError
+from .core.telemetry import CONTENT_TYPE, MetricsMiddleware, configure_tracing, metrics
+from .db.init_db import init_db
+from .db.session import async_engine, get_async_db
+from .services.batch_screening import BatchScreening
+from .services.blob_store import BlobStore, BlobTooLarge
+from .services.cv_ingest import CVIngestService, UnsupportedDocument
+from .services.embedding_service import build_embedding_pipeline
+from .services.interview_repository import InterviewRepository
+from .services.interview_workflow import InterviewWorkflow
+from .services.llm_cache import build_llm_cache
+from .services.job_queue import InterviewJobQueue, QueueFullError
+from .services.match_matrix import MatchMatrix
+from .services.pdf_parser import PDFParser, PDFLimitExceeded
+from .services.question_bank import build_question_bank
+from .services.web_scraper import WebScraper
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -26,10 +48,66 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+logger = logging.getLogger(__name__)
+
+configure_tracing()
+if settings.METRICS_ENABLED or settings.TRACING_EXPORTER != "none":
+    app.add_middleware(MetricsMiddleware)
+
 # Initialize agents
-hr_agent = HRAgent()
-interviewer_agent = InterviewerAgent()
-supervisor_agent = SupervisorAgent()
+match_matrix = MatchMatrix(build_embedding_pipeline()) if settings.MATCH_MATRIX_ENABLED else None
+question_bank = build_question_bank()
+agent_factory = build_agent_factory(match_matrix=match_matrix, question_bank=question_bank)
+interview_workflow = InterviewWorkflow(
+    agent_factory.get("hr"),
+    agent_factory.get("interviewer"),
+    agent_factory.get("supervisor"),
+    match_matrix=match_matrix
+)
+cv_ingest = CVIngestService(BlobStore(settings.BLOB_STORE_DIR), match_matrix=match_matrix)
+llm_cache = build_llm_cache()
+set_llm_cache(llm_cache)
+batch_screening = BatchScreening(interview_workflow, max_concurrency=settings.SCREENING_MAX_CONCURRENCY)
+job_queue = InterviewJobQueue(
+    interview_workflow,
+    max_workers=settings.JOB_MAX_WORKERS,
+    max_pending=settings.JOB_MAX_PENDING
+)
+
+# Components that keep their own counters are read when /metrics is scraped
+metrics.register_stats(
+    "job_queue", lambda: {"depth": job_queue.depth, "in_flight": job_queue.in_flight}, "Interview job queue"
+)
+if llm_cache is not None:
+    metrics.register_stats("llm_cache", llm_cache.stats, "LLM response cache")
+if agent_factory.clients.gateway is not None:
+    metrics.register_stats("llm_gateway", agent_factory.clients.gateway.stats, "LLM gateway")
+if match_matrix is not None:
+    metrics.register_stats("embedding", match_matrix.embeddings.stats, "Embedding pipeline")
+if question_bank is not None:
+    metrics.register_stats("question_bank", question_bank.stats, "Question bank")
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+@app.on_event("startup")
+async def startup():
+    await asyncio.to_thread(init_db)
+    await agent_factory.warm()
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await job_queue.stop()
+    await WebScraper.close()
+    PDFParser.shutdown_pool()
+    if match_matrix is not None:
+        await match_matrix.close()
+    await agent_factory.close()
+    await async_engine.dispose()
 
 class InterviewRequest(BaseModel):
     """Request model for starting an interview"""
@@ -48,11 +126,35 @@ class InterviewRequest(BaseModel):
             }
         }
 
+class ScreeningCandidate(BaseModel):
+    """A CV to screen, by URL or as text"""
+    cv_url: Optional[str] = Field(None, description="URL to the candidate's CV")
+    cv_text: Optional[str] = Field(None, description="Raw CV text content")
+
+class ScreeningRequest(BaseModel):
+    """Request model for screening many candidates against one job"""
+    job_description_url: str = Field(..., description="URL to the job description")
+    company_website_url: str = Field(..., description="URL to the company website")
+    candidates: List[ScreeningCandidate] = Field(..., description="CVs to screen against the job")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "job_description_url": "https://example.com/job",
+                "company_website_url": "https://example.com",
+                "candidates": [
+                    {"cv_url": "https://example.com/cv-1.pdf"},
+                    {"cv_text": "Raw CV text"}
+                ]
+            }
+        }
+
 class AgentResponse(BaseModel):
     """Response model for agent interactions"""
     agent: str = Field(..., description="Name of the agent")
     response: str = Field(..., description="Agent's response text")
     data: Optional[dict] = Field(None, description="Additional data from the agent")
+    duration_ms: Optional[float] = Field(None, description="Wall-clock time spent in the agent's stage")
 
     class Config:
         schema_extra = {
@@ -66,10 +168,42 @@ class AgentResponse(BaseModel):
                             "duration": "60 minutes"
                         }
                     }
-                }
+                },
+                "duration_ms": 8421.5
             }
         }
 
+class InterviewRunSubmitted(BaseModel):
+    """Response model for a queued interview run"""
+    run_id: int = Field(..., description="ID of the interview run")
+    status: str = Field(..., description="Current status of the run")
+    queue_depth: int = Field(..., description="Number of runs waiting ahead of workers")
+
+class InterviewSummary(BaseModel):
+    """Listing entry for an interview run"""
+    run_id: int = Field(..., description="ID of the interview run")
+    status: Optional[str] = Field(None, description="One of planned, in_progress, completed, failed")
+    error: Optional[str] = Field(None, description="Error message if the run failed")
+    candidate: Optional[dict] = Field(None, description="ID, name and email of the candidate")
+    job_description: Optional[dict] = Field(None, description="ID, title and company of the job description")
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class InterviewPage(BaseModel):
+    """A page of interview runs, newest first"""
+    interviews: List[InterviewSummary]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page; null on the last page")
+
+class InterviewRunStatus(BaseModel):
+    """Response model for polling an interview run"""
+    run_id: int = Field(..., description="ID of the interview run")
+    status: str = Field(..., description="One of planned, in_progress, completed, failed")
+    error: Optional[str] = Field(None, description="Error message if the run failed")
+    agenda: Optional[dict] = Field(None, description="Interview agenda once the HR stage completed")
+    responses: Optional[List[AgentResponse]] = Field(None, description="Responses from all agents once completed")
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
 @app.post(
     "/api/v1/start-interview",
     response_model=List[AgentResponse],
@@ -77,12 +211,16 @@ class AgentResponse(BaseModel):
     description="Initiates the interview process with all three agents (HR, Interviewer, and Supervisor).",
     response_description="List of responses from all agents in the workflow."
 )
-async def start_interview(request: InterviewRequest):
+async def start_interview(request: InterviewRequest, response: Response):
     """
     Start a new interview process with the following steps:
-    1. HR Agent analyzes CV and job description
-    2. Interviewer Agent conducts the interview
-    3. Supervisor Agent evaluates the interview
+    1. CV, job description and company website are loaded concurrently
+    2. HR Agent analyzes CV and job description
+    3. Interviewer Agent conducts the interview
+    4. Supervisor Agent evaluates the interview
+    
+    Per-stage timings are returned in the Server-Timing response header; stage,
+    agent, scraper, PDF and vector store spans are exported at /metrics.
     
     Args:
         request (InterviewRequest): Contains CV and job information
@@ -91,56 +229,438 @@ async def start_interview(request: InterviewRequest):
         List[AgentResponse]: Responses from all agents in the workflow
     """
     try:
-        # HR Agent processes CV and job description
-        hr_response = await hr_agent.process_input({
-            "cv_url": request.cv_url,
-            "job_description_url": request.job_description_url,
-            "company_website_url": request.company_website_url,
-            "cv_text": request.cv_text
-        })
+        result = await interview_workflow.run(request.dict())
+        response.headers["Server-Timing"] = result.server_timing()
+        return [AgentResponse(**agent_response) for agent_response in InterviewWorkflow.agent_responses(result)]
+    except PDFLimitExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        logger.exception("Interview run failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post(
+    "/api/v1/screenings",
+    summary="Screen many candidates against one job",
+    description="Loads the job description and company website once, then runs the interview workflow for every CV with bounded concurrency. Results stream back as Server-Sent Events as each candidate finishes. Disconnecting cancels the remaining runs.",
+    response_description="text/event-stream of job_prepared, candidate_completed, candidate_failed and screening_completed events"
+)
+async def screen_candidates(request: ScreeningRequest):
+    """
+    Screen a batch of candidates against one job description.
+    
+    Candidate events carry the candidate's index in the request, since they arrive
+    in completion order.
+    
+    Args:
+        request (ScreeningRequest): The job and the CVs to screen
         
-        # Interviewer Agent conducts the interview
-        interviewer_response = await interviewer_agent.process_input({
-            "agenda": hr_response["data"]["agenda"],
-            "candidate_info": hr_response["data"]["candidate_info"]
-        })
+    Returns:
+        StreamingResponse: Server-Sent Events stream
+    """
+    if not request.candidates:
+        raise HTTPException(status_code=400, detail="No candidates to screen")
+    if len(request.candidates) > settings.SCREENING_MAX_CANDIDATES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.SCREENING_MAX_CANDIDATES} candidates can be screened per request"
+        )
+    job = {"job_description_url": request.job_description_url, "company_website_url": request.company_website_url}
+    
+    async def stream():
+        events = batch_screening.run(job, [candidate.dict() for candidate in request.candidates])
+        try:
+            async for event in events:
+                yield sse_event(event["event"], event)
+        finally:
+            await events.aclose()
+    
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.post(
+    "/api/v1/interviews",
+    response_model=InterviewRunSubmitted,
+    status_code=202,
+    summary="Queue a new interview run",
+    description="Queues the interview workflow and returns immediately with a run ID that can be polled.",
+    response_description="ID and status of the queued run."
+)
+async def submit_interview(request: InterviewRequest):
+    """
+    Queue an interview run for the background worker pool.
+    
+    Returns 429 when too many runs are already waiting.
+    
+    Args:
+        request (InterviewRequest): Contains CV and job information
         
-        # Supervisor Agent evaluates the interview
-        supervisor_response = await supervisor_agent.process_input({
-            "interview_data": interviewer_response["data"],
-            "job_requirements": hr_response["data"]["job_requirements"]
-        })
+    Returns:
+        InterviewRunSubmitted: The run ID to poll or subscribe to
+    """
+    try:
+        run_id = await job_queue.submit(request.dict())
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    return InterviewRunSubmitted(run_id=run_id, status="planned", queue_depth=job_queue.depth)
+
+@app.get(
+    "/api/v1/interviews",
+    response_model=InterviewPage,
+    summary="List interview runs",
+    description="Newest interview runs first, optionally filtered by status, candidate or job description. Pages are addressed by an opaque cursor.",
+    response_description="A page of interview runs and the cursor of the next page."
+)
+async def list_interviews(
+    status: Optional[str] = None,
+    candidate_id: Optional[int] = None,
+    job_description_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    List interview runs with their candidate and job description.
+    
+    Args:
+        status (str): Only runs in this status
+        candidate_id (int): Only runs for this candidate
+        job_description_id (int): Only runs for this job description
+        cursor (str): next_cursor from the previous page
+        limit (int): Page size (1-200)
         
-        return [
-            AgentResponse(agent="HR Agent", response=hr_response["response"], data=hr_response["data"]),
-            AgentResponse(agent="Interviewer Agent", response=interviewer_response["response"], data=interviewer_response["data"]),
-            AgentResponse(agent="Supervisor Agent", response=supervisor_response["response"], data=supervisor_response["data"])
-        ]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    Returns:
+        InterviewPage: The runs and the cursor of the next page
+    """
+    if not 1 <= limit <= 200:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 200")
+    try:
+        before = InterviewRepository.decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    interviews, next_cursor = await job_queue.repository.list_interviews(
+        db,
+        status=status,
+        candidate_id=candidate_id,
+        job_description_id=job_description_id,
+        before=before,
+        limit=limit
+    )
+    return InterviewPage(
+        interviews=[InterviewSummary(**InterviewRepository.summary(interview)) for interview in interviews],
+        next_cursor=InterviewRepository.encode_cursor(next_cursor)
+    )
+
+@app.get(
+    "/api/v1/interviews/{run_id}",
+    response_model=InterviewRunStatus,
+    summary="Get the status of an interview run",
+    response_description="Current status and, once completed, the agent responses."
+)
+async def get_interview_run(run_id: int, status_only: bool = False):
+    """
+    Poll the state of a queued interview run.
+    
+    Args:
+        run_id (int): ID returned when the run was queued
+        status_only (bool): Skip loading the agenda and agent responses
+        
+    Returns:
+        InterviewRunStatus: Persisted state of the run
+    """
+    run = await job_queue.get_run(run_id, include_payload=not status_only)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Interview run not found")
+    return InterviewRunStatus(**run)
+
+@app.get(
+    "/api/v1/interviews/{run_id}/events",
+    summary="Subscribe to interview run progress",
+    description="Server-Sent Events stream of stage progress until the run completes or fails.",
+    response_description="text/event-stream of progress events"
+)
+async def interview_run_events(run_id: int):
+    """
+    Stream progress events for an interview run.
+    
+    Args:
+        run_id (int): ID returned when the run was queued
+        
+    Returns:
+        StreamingResponse: Server-Sent Events stream
+    """
+    events = job_queue.subscribe(run_id)
+    run = await job_queue.get_run(run_id)
+    if run is None:
+        job_queue.unsubscribe(run_id, events)
+        raise HTTPException(status_code=404, detail="Interview run not found")
+    
+    async def stream():
+        try:
+            yield sse_event("status", run)
+            if run["status"] in ("completed", "failed"):
+                return
+            while True:
+                event = await events.get()
+                yield sse_event(event["event"], event)
+                if event["event"] in ("run_completed", "run_failed"):
+                    return
+        finally:
+            job_queue.unsubscribe(run_id, events)
+    
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.post(
+    "/api/v1/agents/{agent_name}/stream",
+    summary="Stream a single agent run",
+    description="Runs one agent (hr, interviewer or supervisor) and streams its tokens and tool calls as Server-Sent Events. Disconnecting cancels the run.",
+    response_description="text/event-stream of token, function_call_delta, tool_start, tool_end and agent_response events"
+)
+async def stream_agent(
+    agent_name: str,
+    input_data: Dict[str, Any] = Body(..., description="Input data for the agent"),
+    session_id: Optional[str] = None
+):
+    """
+    Stream the output of a single agent while it runs.
+    
+    Args:
+        agent_name (str): One of hr, interviewer or supervisor
+        input_data (dict): Input data passed to the agent
+        session_id (str): Continue the conversation of this session; stateless when omitted
+        
+    Returns:
+        StreamingResponse: Server-Sent Events stream
+    """
+    agent = agent_factory.get(agent_name)
+    if agent is None:
+        raise HTTPException(status_code=404, detail=f"Unknown agent '{agent_name}'")
+    
+    async def stream():
+        try:
+            async for event in stream_agent_run(agent, input_data, session_id=session_id):
+                yield sse_event(event["type"], event)
+        except Exception as e:
+            yield sse_event("error", {"agent": agent.name, "detail": str(e)})
+    
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.websocket("/api/v1/ws/interview")
+async def interview_websocket(websocket: WebSocket):
+    """
+    Run the interview workflow over a WebSocket.
+    
+    The client sends an InterviewRequest as JSON and receives interview_started,
+    stage, token and function_call_delta events, one agent_response per agent and
+    interview_completed.
+    Sending {"type": "cancel"} or disconnecting cancels the run.
+    """
+    await websocket.accept()
+    try:
+        request = InterviewRequest(**await websocket.receive_json())
+    except (ValidationError, ValueError, TypeError) as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1003)
+        return
+    except WebSocketDisconnect:
+        return
+    
+    events = asyncio.Queue()
+    
+    async def on_event(event: str, stage: str, details: Dict[str, Any]):
+        await events.put({"type": event, "stage": stage, **details})
+    
+    run = asyncio.create_task(interview_workflow.run(request.dict(), on_event=on_event, stream=events))
+    run.add_done_callback(lambda _: events.put_nowait(None))
+    
+    async def watch_for_cancel():
+        try:
+            while True:
+                message = await websocket.receive_json()
+                if message.get("type") == "cancel":
+                    run.cancel()
+                    return
+        except (WebSocketDisconnect, ValueError):
+            run.cancel()
+    
+    watcher = asyncio.create_task(watch_for_cancel())
+    try:
+        await websocket.send_json({"type": "interview_started"})
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            await websocket.send_json(event)
+        
+        if run.cancelled():
+            await websocket.send_json({"type": "interview_cancelled"})
+        elif run.exception() is not None:
+            await websocket.send_json({"type": "error", "detail": str(run.exception())})
+        else:
+            result = run.result()
+            for agent_response in InterviewWorkflow.agent_responses(result):
+                await websocket.send_json(json.loads(json.dumps({"type": "agent_response", **agent_response}, default=str)))
+            await websocket.send_json({"type": "interview_completed", "timings": result.timings})
+        await websocket.close()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        watcher.cancel()
+        if not run.done():
+            run.cancel()
+        await asyncio.gather(watcher, run, return_exceptions=True)
+
+@app.get(
+    "/api/v1/llm-cache/stats",
+    summary="Get LLM cache statistics",
+    response_description="Hit, near-hit and miss counters of the LLM response cache"
+)
+async def get_llm_cache_stats():
+    """
+    Report LLM response cache metrics.
+    
+    Returns:
+        dict: Cache counters, hit rate and size, or enabled=false when caching is off
+    """
+    if llm_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **await asyncio.to_thread(llm_cache.stats)}
+
+@app.get(
+    "/api/v1/llm-gateway/stats",
+    summary="Get LLM gateway statistics",
+    response_description="Request, coalescing, retry and queueing counters of the LLM gateway"
+)
+async def get_llm_gateway_stats():
+    """
+    Report LLM gateway metrics.
+    
+    Returns:
+        dict: Counters and current queue depth, or enabled=false when the gateway is off
+    """
+    gateway = agent_factory.clients.gateway
+    if gateway is None:
+        return {"enabled": False}
+    return {"enabled": True, "models": agent_factory.routes, **gateway.stats()}
+
+@app.get(
+    "/metrics",
+    summary="Get Prometheus metrics",
+    response_description="Request, stage and agent latency histograms, token counters, cache and queue statistics",
+    include_in_schema=False
+)
+async def get_metrics():
+    """
+    Export metrics in the Prometheus text format.
+    
+    Returns:
+        Response: Metrics text, or 404 when metrics are disabled
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(await asyncio.to_thread(metrics.render), media_type=CONTENT_TYPE)
+
+@app.get(
+    "/api/v1/questions",
+    summary="Get interview questions",
+    description="Diverse, deduplicated questions for a topic from the question bank. With generate=true the LLM writes any missing questions, which are added to the bank.",
+    response_description="Questions with their expected answers and follow-ups"
+)
+async def get_questions(topic: str, difficulty: str = "medium", count: int = 3, generate: bool = False):
+    """
+    Serve interview questions from the question bank.
+    
+    Args:
+        topic (str): Skill or topic, e.g. "Python" or "distributed caching"
+        difficulty (str): easy, medium or hard
+        count (int): Number of questions
+        generate (bool): Fill a shortfall with newly generated questions
+        
+    Returns:
+        dict: The questions and bank size
+    """
+    if question_bank is None:
+        raise HTTPException(status_code=404, detail="Question bank is disabled")
+    llm = agent_factory.get("interviewer").question_llm if generate else None
+    questions = await question_bank.generate_questions(topic, difficulty, max(1, min(count, 20)), llm=llm)
+    return {"questions": questions, "bank": await asyncio.to_thread(question_bank.stats)}
+
+@app.get(
+    "/api/v1/job-descriptions/{job_description_id}/candidates",
+    summary="Rank candidates for a job description",
+    description="Candidates ordered by their precomputed similarity to the job description.",
+    response_description="A page of candidates with overall and per-section match scores"
+)
+async def get_job_description_candidates(job_description_id: int, limit: int = 20, offset: int = 0):
+    """
+    Read the best-matching candidates for a job description from the match matrix.
+    
+    Args:
+        job_description_id (int): ID of the job description
+        limit (int): Page size (1-100)
+        offset (int): Number of candidates to skip
+        
+    Returns:
+        dict: Total number of scored candidates and the requested page
+    """
+    if match_matrix is None:
+        raise HTTPException(status_code=404, detail="Match matrix is disabled")
+    if not 1 <= limit <= 100 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be 1-100 and offset non-negative")
+    return await asyncio.to_thread(match_matrix.top_candidates, job_description_id, limit, offset)
 
 @app.post(
     "/api/v1/upload-cv",
     summary="Upload a CV file",
-    description="Upload a CV file in PDF format for processing.",
-    response_description="Confirmation of file upload"
+    description="Upload a CV file in PDF format for processing. The body is streamed to storage, so memory use does not grow with the file size; identical CVs are deduplicated.",
+    response_description="Candidate created or matched for the uploaded CV",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file"],
+                        "properties": {
+                            "file": {
+                                "type": "string",
+                                "format": "binary",
+                                "description": "PDF file containing the candidate's CV"
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
 )
-async def upload_cv(file: UploadFile = File(..., description="PDF file containing the candidate's CV")):
+async def upload_cv(request: Request):
     """
     Upload a CV file for processing.
     
+    The multipart body is parsed incrementally and the file is hashed while it is
+    written to the content-addressed blob store, then parsed and stored as a Candidate.
+    
     Args:
-        file (UploadFile): PDF file containing the candidate's CV
+        request (Request): multipart/form-data request with a "file" field
         
     Returns:
-        dict: Confirmation of file upload with filename
+        dict: Filename, status ("uploaded" or "duplicate") and the candidate record
     """
     try:
-        # Handle CV file upload
-        # Implementation for file processing
-        return {"filename": file.filename, "status": "uploaded"}
+        stream = MultipartFileStream(request.headers.get("content-type", ""), "file")
+        result = await cv_ingest.ingest(stream.iter_chunks(request.stream()), max_bytes=settings.PDF_MAX_BYTES)
+    except (MultipartError, UnsupportedDocument) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (BlobTooLarge, PDFLimitExceeded) as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "filename": stream.filename,
+        "status": "duplicate" if result["duplicate"] else "uploaded",
+        **result
+    }
 
 def custom_openapi():
     if app.openapi_schema:
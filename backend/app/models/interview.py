@@ -1,9 +1,38 @@
-from sqlalchemy import Column, String, Text, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, JSON, ForeignKey, Float, LargeBinary, Index, UniqueConstraint
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
-from .base import BaseModel
+from .base import Base, BaseModel
+from .types import CompressedJSON, CompressedText
+
+
+def payload_proxy(field: str, payload_class):
+    """Expose a side-table column as an attribute, creating the payload row on first write"""
+    return association_proxy("payload", field, creator=lambda value: payload_class(**{field: value}))
+
+
+class CandidatePayload(Base):
+    """Large CV fields, compressed and kept out of the ``candidates`` rows"""
+    __tablename__ = "candidate_payloads"
+    
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    raw_cv_text = Column(CompressedText)
+    parsed_cv_data = Column(CompressedJSON)
+    candidate_info = Column(CompressedJSON)  # the HR agent's additions to the parsed CV
+
+class InterviewPayload(Base):
+    """Interview transcripts and results, compressed and kept out of the ``interviews`` rows"""
+    __tablename__ = "interview_payloads"
+    
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="CASCADE"), primary_key=True)
+    agenda = Column(CompressedJSON)
+    questions = Column(CompressedJSON)
+    responses = Column(CompressedJSON)
+    feedback = Column(CompressedJSON)
 
 class Candidate(BaseModel):
     __tablename__ = "candidates"
+    # One row per distinct CV, so parsed artifacts can be upserted on their hash
+    __table_args__ = (Index("uq_candidates_content_hash", "content_hash", unique=True),)
     
     name = Column(String(100))
     email = Column(String(100), unique=True, index=True)
@@ -11,32 +40,89 @@ class Candidate(BaseModel):
     linkedin_url = Column(String(255))
     github_url = Column(String(255))
     personal_website = Column(String(255))
-    raw_cv_text = Column(Text)
-    parsed_cv_data = Column(JSON)
+    content_hash = Column(String(64))
+    parser_version = Column(String(20))
     
     interviews = relationship("Interview", back_populates="candidate")
+    payload = relationship(CandidatePayload, uselist=False, cascade="all, delete-orphan")
+    raw_cv_text = payload_proxy("raw_cv_text", CandidatePayload)
+    parsed_cv_data = payload_proxy("parsed_cv_data", CandidatePayload)
+    candidate_info = payload_proxy("candidate_info", CandidatePayload)
 
 class JobDescription(BaseModel):
     __tablename__ = "job_descriptions"
+    __table_args__ = (Index("uq_job_descriptions_content_hash", "content_hash", unique=True),)
     
     title = Column(String(255))
     company_name = Column(String(100))
     company_website = Column(String(255))
     raw_description = Column(Text)
     parsed_description = Column(JSON)
+    job_requirements = Column(JSON)  # the HR agent's additions to the parsed description
+    content_hash = Column(String(64))
+    parser_version = Column(String(20))
+    # Where the description was last fetched from, with the validators to revalidate it
+    source_url = Column(String(2048), index=True)
+    etag = Column(String(255))
+    last_modified = Column(String(64))
     
     interviews = relationship("Interview", back_populates="job_description")
 
 class Interview(BaseModel):
     __tablename__ = "interviews"
+    # Listings filter on one of these and page newest first by (created_at, id)
+    __table_args__ = (
+        Index("ix_interviews_created_at_id", "created_at", "id"),
+        Index("ix_interviews_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_interviews_candidate_created_at_id", "candidate_id", "created_at", "id"),
+        Index("ix_interviews_job_description_created_at_id", "job_description_id", "created_at", "id"),
+    )
     
     candidate_id = Column(Integer, ForeignKey("candidates.id"))
     job_description_id = Column(Integer, ForeignKey("job_descriptions.id"))
-    agenda = Column(JSON)
-    questions = Column(JSON)
-    responses = Column(JSON)
-    feedback = Column(JSON)
-    status = Column(String(50))  # planned, in_progress, completed
+    status = Column(String(50))  # planned, in_progress, completed, failed
+    error = Column(Text)
     
     candidate = relationship("Candidate", back_populates="interviews")
-    job_description = relationship("JobDescription", back_populates="interviews") 
\ No newline at end of file
+    job_description = relationship("JobDescription", back_populates="interviews")
+    payload = relationship(InterviewPayload, uselist=False, cascade="all, delete-orphan")
+    agenda = payload_proxy("agenda", InterviewPayload)
+    questions = payload_proxy("questions", InterviewPayload)
+    responses = payload_proxy("responses", InterviewPayload)
+    feedback = payload_proxy("feedback", InterviewPayload)
+
+class MatchProfile(BaseModel):
+    __tablename__ = "match_profiles"
+    __table_args__ = (UniqueConstraint("kind", "owner_id", name="uq_match_profiles_kind_owner"),)
+    
+    kind = Column(String(20))  # candidate or job_description
+    owner_id = Column(Integer)
+    model = Column(String(100))
+    vectors = Column(LargeBinary)  # float32, one row per profile section
+
+class CandidateJobMatch(BaseModel):
+    __tablename__ = "candidate_job_matches"
+    __table_args__ = (
+        UniqueConstraint("candidate_id", "job_description_id", name="uq_candidate_job_matches_pair"),
+        Index("ix_candidate_job_matches_job_score", "job_description_id", "score"),
+    )
+    
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), index=True)
+    job_description_id = Column(Integer, ForeignKey("job_descriptions.id"))
+    score = Column(Float)
+    section_scores = Column(JSON)
+
+class BankQuestion(BaseModel):
+    __tablename__ = "question_bank"
+    __table_args__ = (Index("ix_question_bank_topic_difficulty", "topic", "difficulty"),)
+    
+    topic = Column(String(100))
+    difficulty = Column(String(20))  # easy, medium or hard
+    question = Column(Text)
+    question_type = Column(String(50))
+    expected_answer = Column(Text)
+    follow_up_questions = Column(JSON)
+    source = Column(String(20))  # seed or llm
+    content_hash = Column(String(64), unique=True)
+    model = Column(String(100))
+    embedding = Column(LargeBinary)  # float32 embedding of the question text
@@ -0,0 +1,147 @@
+import hashlib
+from datetime import datetime
+from typing import Dict, Any, Optional, Union
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import joinedload
+from ..db.session import SessionLocal
+from ..models.interview import Candidate, CandidatePayload, JobDescription
+from .pdf_parser import PDFParser
+from .web_scraper import WebScraper
+
+
+def _insert(db, model):
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(model)
+
+
+class ArtifactStore:
+    """Memoizes parsed CVs and job descriptions by a hash of their raw content.
+
+    Results live in ``Candidate.parsed_cv_data`` (compressed in the candidate's
+    payload row) and the ``JobDescription.parsed_description`` column. An artifact only counts as a hit
+    when it was produced by the current parser version, so bumping
+    ``PDFParser.PARSER_VERSION`` or ``WebScraper.PARSER_VERSION`` invalidates it.
+    ``content_hash`` is unique and writes are upserts, so concurrent runs on the
+    same document share one row. Job descriptions also remember their URL and
+    HTTP validators, and both keep the HR agent's assessment once one was made.
+    """
+
+    @staticmethod
+    def content_hash(raw: Union[bytes, str]) -> str:
+        """Hash raw document bytes or text"""
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def get_cv(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Get a parsed CV previously stored for this content hash"""
+        with SessionLocal() as db:
+            candidate = db.query(Candidate).options(joinedload(Candidate.payload)).filter(
+                Candidate.content_hash == content_hash,
+                Candidate.parser_version == PDFParser.PARSER_VERSION
+            ).first()
+            if candidate is None:
+                return None
+            return {
+                "candidate_id": candidate.id,
+                "text": candidate.raw_cv_text,
+                "parsed": candidate.parsed_cv_data,
+                "candidate_info": candidate.candidate_info
+            }
+
+    def put_cv(self, content_hash: str, text: str, parsed: Dict[str, Any], **fields) -> int:
+        """Store a parsed CV, replacing artifacts from older parser versions"""
+        now = datetime.utcnow()
+        values = {"parser_version": PDFParser.PARSER_VERSION, "updated_at": now, **fields}
+        payload = {"raw_cv_text": text, "parsed_cv_data": parsed, "candidate_info": None}
+        with SessionLocal() as db:
+            statement = _insert(db, Candidate).values(content_hash=content_hash, created_at=now, **values)
+            candidate_id = db.execute(
+                statement.on_conflict_do_update(index_elements=["content_hash"], set_=values).returning(Candidate.id)
+            ).scalar_one()
+            statement = _insert(db, CandidatePayload).values(candidate_id=candidate_id, **payload)
+            db.execute(statement.on_conflict_do_update(index_elements=["candidate_id"], set_=payload))
+            db.commit()
+            return candidate_id
+
+    def get_job_description(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Get a parsed job description previously stored for this content hash"""
+        return self._find_job_description(JobDescription.content_hash == content_hash)
+
+    def get_job_description_for_url(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get the parsed job description last fetched from ``url``, with its validators"""
+        return self._find_job_description(JobDescription.source_url == url)
+
+    def _find_job_description(self, condition) -> Optional[Dict[str, Any]]:
+        with SessionLocal() as db:
+            job_description = db.query(JobDescription).filter(
+                condition,
+                JobDescription.parser_version == WebScraper.PARSER_VERSION
+            ).order_by(JobDescription.updated_at.desc()).first()
+            if job_description is None:
+                return None
+            return {
+                "job_description_id": job_description.id,
+                "content_hash": job_description.content_hash,
+                "title": job_description.title,
+                "text": job_description.raw_description,
+                "parsed": job_description.parsed_description,
+                "job_requirements": job_description.job_requirements,
+                "source_url": job_description.source_url,
+                "etag": job_description.etag,
+                "last_modified": job_description.last_modified
+            }
+
+    def put_job_description(self, content_hash: str, text: str, parsed: Dict[str, Any], **fields) -> int:
+        """Store a parsed job description, replacing artifacts from older parser versions"""
+        now = datetime.utcnow()
+        values = {
+            "raw_description": text,
+            "parsed_description": parsed,
+            "job_requirements": None,
+            "parser_version": WebScraper.PARSER_VERSION,
+            "updated_at": now,
+            **fields
+        }
+        with SessionLocal() as db:
+            statement = _insert(db, JobDescription).values(content_hash=content_hash, created_at=now, **values)
+            job_description_id = db.execute(
+                statement.on_conflict_do_update(index_elements=["content_hash"], set_=values)
+                .returning(JobDescription.id)
+            ).scalar_one()
+            db.commit()
+            return job_description_id
+
+    def set_job_description_source(
+        self,
+        job_description_id: int,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """Record where a stored job description was fetched from and its validators"""
+        with SessionLocal() as db:
+            db.execute(update(JobDescription).where(JobDescription.id == job_description_id).values(
+                source_url=url, etag=etag, last_modified=last_modified, updated_at=datetime.utcnow()
+            ))
+            db.commit()
+
+    def put_assessment(
+        self,
+        candidate_id: int,
+        job_description_id: int,
+        candidate_info: Dict[str, Any],
+        job_requirements: Dict[str, Any]
+    ):
+        """Keep what the HR agent added to a parsed CV and job description, for runs that reuse both"""
+        with SessionLocal() as db:
+            db.execute(
+                update(CandidatePayload).where(CandidatePayload.candidate_id == candidate_id)
+                .values(candidate_info=candidate_info)
+            )
+            db.execute(
+                update(JobDescription).where(JobDescription.id == job_description_id)
+                .values(job_requirements=job_requirements)
+            )
+            db.commit()
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, AsyncIterator, List
+from .interview_workflow import InterviewWorkflow
+from .pdf_parser import PDFLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+
+class BatchScreening:
+    """Screens many candidates against one job description.
+
+    The job description and company website are loaded, parsed and profiled once;
+    the candidate runs reuse those stage outputs and run with at most
+    ``max_concurrency`` in flight. Results are yielded as each candidate finishes.
+    """
+
+    def __init__(self, workflow: InterviewWorkflow, max_concurrency: int = 8):
+        self.workflow = workflow
+        self.max_concurrency = max_concurrency
+
+    async def _screen(
+        self,
+        semaphore: asyncio.Semaphore,
+        index: int,
+        request: Dict[str, Any],
+        prepared: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await self.workflow.run(request, prepared=prepared)
+            except PDFLimitExceeded as e:
+                return {"event": "candidate_failed", "index": index, "error": str(e)}
+            except Exception as e:
+                logger.exception("Screening candidate %d failed", index)
+                return {"event": "candidate_failed", "index": index, "error": str(e)}
+        hr = result.outputs["hr"]
+        return {
+            "event": "candidate_completed",
+            "index": index,
+            "candidate_id": hr["candidate_id"],
+            "skill_match": hr["data"].get("skill_match"),
+            "job_match": result.outputs["match"] or None,
+            "responses": InterviewWorkflow.agent_responses(result),
+            "duration_ms": (time.perf_counter() - started) * 1000
+        }
+
+    async def run(self, job: Dict[str, Any], candidates: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ``job_prepared``, then one event per candidate in completion order, then ``screening_completed``
+
+        ``job`` holds job_description_url and company_website_url; each candidate
+        holds cv_url or cv_text. Candidate events carry the candidate's index in the
+        request. Closing the iterator cancels the runs still in progress.
+        """
+        started = time.perf_counter()
+        prepared = await self.workflow.prepare_job(job)
+        job_description = prepared["job_description"]
+        yield {
+            "event": "job_prepared",
+            "job_description_id": job_description["job_description_id"],
+            "title": job_description["page"].get("title"),
+            "error": job_description["page"].get("error"),
+            "required_skills": job_description["required_skills"],
+            "preferred_skills": job_description["preferred_skills"],
+            "duration_ms": (time.perf_counter() - started) * 1000
+        }
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.create_task(self._screen(semaphore, index, {**job, **candidate}, prepared))
+            for index, candidate in enumerate(candidates)
+        ]
+        completed = 0
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                event = await next_result
+                completed += event["event"] == "candidate_completed"
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        yield {
+            "event": "screening_completed",
+            "total": len(candidates),
+            "completed": completed,
+            "failed": len(candidates) - completed,
+            "total_ms": (time.perf_counter() - started) * 1000
+        }
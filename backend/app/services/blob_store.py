@@ -0,0 +1,71 @@
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+
+class BlobTooLarge(Exception):
+    """Raised when a blob exceeds the size limit while it is being written"""
+
+
+class BlobWriter:
+    """Writes a blob to a temporary file while hashing it"""
+
+    def __init__(self, store: "BlobStore", max_bytes: Optional[int] = None):
+        self.store = store
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+        fd, self._tmp_path = tempfile.mkstemp(dir=store.tmp_dir)
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        """Append a chunk of data"""
+        self.size += len(chunk)
+        if self.max_bytes and self.size > self.max_bytes:
+            self.abort()
+            raise BlobTooLarge(f"Upload exceeds the {self.max_bytes} byte limit")
+        self._hash.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self):
+        """Move the blob into place, returning (digest, path, created).
+
+        If a blob with the same content already exists the new copy is discarded.
+        """
+        self._file.close()
+        digest = self._hash.hexdigest()
+        path = self.store.path_for(digest)
+        if os.path.exists(path):
+            os.remove(self._tmp_path)
+            return digest, path, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self._tmp_path, path)
+        return digest, path, True
+
+    def abort(self):
+        """Discard the partially written blob"""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class BlobStore:
+    """Content-addressed file store keyed by SHA-256"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path_for(self, digest: str) -> str:
+        """Path of the blob with this digest"""
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path_for(digest))
+
+    def writer(self, max_bytes: Optional[int] = None) -> BlobWriter:
+        """Start writing a new blob"""
+        return BlobWriter(self, max_bytes=max_bytes)
@@ -0,0 +1,282 @@
+import json
+import logging
+import re
+import threading
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import tiktoken
+from ..core.config import settings
+from .pdf_parser import PDFParser
+from .section_segmenter import SectionSpan
+from .web_scraper import WebScraper
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+TOKENIZERS = ("tiktoken", "approximate")
+
+# Relative share of the budget per document section; zero drops the section.
+# "header" is the text before the first recognised section (name, contact, title).
+CV_SECTION_WEIGHTS = {"header": 2, "skills": 4, "experience": 4, "projects": 2, "education": 1}
+JOB_SECTION_WEIGHTS = {"header": 2, "requirements": 4, "responsibilities": 3, "about_company": 1, "benefits": 0}
+DOCUMENT_WEIGHTS = {"cv": 1.0, "job_description": 1.0, "company_website": 0.3}
+# Part of an agent's budget given to documents; the rest is for analysis and instructions
+DOCUMENT_SHARE = 0.75
+
+# Navigation, legal and social boilerplate found on scraped pages
+BOILERPLATE = re.compile(
+    r"cookie|privacy (policy|notice)|terms (of|and) (use|service|conditions)|all rights reserved|©|copyright"
+    r"|subscribe|newsletter|sign (in|up)\b|log ?in\b|follow us|share (this|on)|skip to (main )?content"
+    r"|enable javascript|equal (opportunity|employment)",
+    re.IGNORECASE
+)
+BOILERPLATE_MAX_WORDS = 30
+URL = re.compile(r"(?:https?://|www\.)\S+")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Keys of scraped page dicts that never belong in a prompt
+DROPPED_KEYS = ("links", "metadata")
+MAX_FIT_ROUNDS = 32
+MIN_TRUNCATED_TOKENS = 16
+
+
+def parse_token_budgets(value: str) -> Dict[str, int]:
+    """Parse ``agent=tokens`` pairs separated by commas"""
+    budgets = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        agent, _, tokens = entry.partition("=")
+        if not agent.strip() or not tokens.strip().isdigit():
+            raise ValueError(f"Invalid agent context budget '{entry.strip()}'")
+        budgets[agent.strip()] = int(tokens)
+    return budgets
+
+
+class TokenCounter:
+    """Counts tokens with the model's tiktoken encoding.
+
+    tiktoken downloads its encoding files on first use; when that fails (offline
+    deployments without TIKTOKEN_CACHE_DIR) or the approximate tokenizer is
+    configured, counts are estimated at four characters per token.
+    """
+
+    _counters: Dict[str, "TokenCounter"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, encoding: Optional[Any] = None):
+        self.encoding = encoding
+
+    @classmethod
+    def for_model(cls, model: str) -> "TokenCounter":
+        """Get the shared counter for a model's encoding"""
+        if settings.CONTEXT_TOKENIZER not in TOKENIZERS:
+            raise ValueError(f"Unknown context tokenizer '{settings.CONTEXT_TOKENIZER}'")
+        with cls._lock:
+            if model not in cls._counters:
+                encoding = None
+                if settings.CONTEXT_TOKENIZER == "tiktoken":
+                    try:
+                        try:
+                            encoding = tiktoken.encoding_for_model(model)
+                        except KeyError:
+                            encoding = tiktoken.get_encoding("cl100k_base")
+                    except Exception as e:
+                        logger.warning("tiktoken encoding for %s unavailable, estimating tokens: %s", model, e)
+                cls._counters[model] = cls(encoding)
+            return cls._counters[model]
+
+    def count(self, text: str) -> int:
+        if self.encoding is None:
+            return -(-len(text) // CHARS_PER_TOKEN)
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut ``text`` to at most ``max_tokens``, at a sentence or line end where possible"""
+        if max_tokens <= 0:
+            return ""
+        if self.encoding is None:
+            if len(text) <= max_tokens * CHARS_PER_TOKEN:
+                return text
+            head = text[:max_tokens * CHARS_PER_TOKEN]
+        else:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            head = self.encoding.decode(tokens[:max_tokens])
+        cut = max(head.rfind(". "), head.rfind("\n"))
+        if cut <= len(head) // 2:
+            # No sentence end late enough; at least do not stop mid-word
+            cut = head.rfind(" ") if not text[len(head):len(head) + 1].isspace() else len(head)
+        if cut > 0:
+            head = head[:cut + 1]
+        return head.rstrip()
+
+
+def allocate(sizes: Dict[Any, int], weights: Dict[Any, float], budget: int) -> Dict[Any, int]:
+    """Split ``budget`` across parts by weight; parts that need less than their share pass the rest on"""
+    grants = {key: 0 for key in sizes}
+    pending = {key for key in sizes if weights.get(key, 0) > 0 and sizes[key] > 0}
+    remaining = budget
+    while pending:
+        total = sum(weights[key] for key in pending)
+        fits = {key for key in pending if sizes[key] <= remaining * weights[key] / total}
+        if not fits:
+            for key in pending:
+                grants[key] = int(remaining * weights[key] / total)
+            break
+        for key in fits:
+            grants[key] = sizes[key]
+            remaining -= sizes[key]
+        pending -= fits
+    return grants
+
+
+def clean_text(text: str, boilerplate: bool = True) -> str:
+    """Drop URLs, repeated lines and, for scraped pages, repeated or short boilerplate sentences"""
+    lines, seen, seen_sentences = [], set(), set()
+    for line in URL.sub("", text).splitlines():
+        sentences = [sentence.strip() for sentence in SENTENCE_END.split(line) if sentence.strip()]
+        if boilerplate:
+            kept = []
+            for sentence in sentences:
+                key = sentence.casefold()
+                if key in seen_sentences:
+                    continue
+                seen_sentences.add(key)
+                if not (len(sentence.split()) <= BOILERPLATE_MAX_WORDS and BOILERPLATE.search(sentence)):
+                    kept.append(sentence)
+            sentences = kept
+        line = " ".join(sentences)
+        key = line.casefold()
+        if line and key not in seen:
+            seen.add(key)
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def split_sections(text: str, spans: List[SectionSpan]) -> List[Tuple[str, str]]:
+    """(section, body) pairs in document order, the text before the first header as "header"
+
+    Repeated sections are merged into the first occurrence.
+    """
+    parts: Dict[str, List[str]] = {"header": [text[:spans[0].header_start] if spans else text]}
+    for span in spans:
+        parts.setdefault(span.section, []).append(text[span.start:span.end])
+    return [(section, "\n".join(bodies)) for section, bodies in parts.items()]
+
+
+def _without_links(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _without_links(item) for key, item in value.items() if key not in DROPPED_KEYS}
+    if isinstance(value, list):
+        return [_without_links(item) for item in value]
+    return value
+
+
+def _leaves(value: Any, path: Tuple = ()) -> Iterator[Tuple[Tuple, str]]:
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _leaves(item, path + (key,))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _leaves(item, path + (index,))
+
+
+def _assign(data: Any, path: Tuple, value: str):
+    for key in path[:-1]:
+        data = data[key]
+    data[path[-1]] = value
+
+
+class ContextBuilder:
+    """Bounds what an agent sees to a token budget.
+
+    ``compact_documents`` builds the HR agent's view of the CV, job description and
+    company page: links, URLs and boilerplate are dropped, each document is split
+    into its parsed sections and the budget is shared across sections by weight
+    (requirements and skills before benefits and education), trimming each section
+    from the end. ``fit`` enforces the budget on any agent input by shortening its
+    longest strings. A builder without ``max_tokens`` only drops links.
+    """
+
+    def __init__(self, counter: TokenCounter, max_tokens: Optional[int] = None):
+        self.counter = counter
+        self.max_tokens = max_tokens
+
+    def count(self, value: Any) -> int:
+        if not isinstance(value, str):
+            value = json.dumps(value, default=str, ensure_ascii=False)
+        return self.counter.count(value)
+
+    def compact_documents(
+        self,
+        cv_text: str,
+        job_page: Dict[str, Any],
+        company_page: Dict[str, Any],
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Cleaned, section-ranked CV, job description and company page within ``max_tokens``"""
+        job_text = job_page.get("content") or ""
+        company_text = company_page.get("content") or ""
+        documents = {
+            "cv": (split_sections(cv_text, PDFParser.segment_cv(cv_text)), CV_SECTION_WEIGHTS, False),
+            "job_description": (
+                split_sections(job_text, WebScraper.segment_job_description(job_text)), JOB_SECTION_WEIGHTS, True
+            ),
+            "company_website": ([("header", company_text)], {"header": 1}, True)
+        }
+        parts, sizes, weights = {}, {}, {}
+        for document, (sections, section_weights, boilerplate) in documents.items():
+            for section, body in sections:
+                key = (document, section)
+                parts[key] = clean_text(body, boilerplate=boilerplate)
+                sizes[key] = self.counter.count(parts[key])
+                weights[key] = DOCUMENT_WEIGHTS[document] * section_weights.get(section, 1)
+        if max_tokens is None and self.max_tokens:
+            max_tokens = int(self.max_tokens * DOCUMENT_SHARE)
+        grants = allocate(sizes, weights, max_tokens) if max_tokens else {
+            key: size if weights[key] > 0 else 0 for key, size in sizes.items()
+        }
+
+        rendered: Dict[str, List[str]] = {document: [] for document in documents}
+        for (document, section), body in parts.items():
+            body = self.counter.truncate(body, grants[(document, section)])
+            if body:
+                title = "" if section == "header" else section.replace("_", " ").title() + ":\n"
+                rendered[document].append(title + body)
+        return {
+            "cv": "\n\n".join(rendered["cv"]),
+            "job_description": {
+                "title": job_page.get("title") or "",
+                "content": "\n\n".join(rendered["job_description"])
+            },
+            "company_website": {
+                "title": company_page.get("title") or "",
+                "content": "\n\n".join(rendered["company_website"])
+            },
+            "tokens": {"original": sum(sizes.values()), "compacted": sum(min(sizes[key], grants[key]) for key in sizes)}
+        }
+
+    def fit(self, input_data: Dict[str, Any], max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """A copy of ``input_data`` without links, its longest strings shortened to fit the budget"""
+        max_tokens = max_tokens or self.max_tokens
+        data = _without_links(input_data)
+        if not max_tokens:
+            return data
+        for _ in range(MAX_FIT_ROUNDS):
+            over = self.count(data) - max_tokens
+            if over <= 0:
+                return data
+            path, text = max(_leaves(data), key=lambda leaf: len(leaf[1]), default=((), ""))
+            tokens = self.counter.count(text)
+            if not path or tokens <= MIN_TRUNCATED_TOKENS:
+                break
+            _assign(data, path, self.counter.truncate(text, max(tokens - over, tokens // 2, MIN_TRUNCATED_TOKENS)))
+        logger.debug("Agent input still over its %d token budget after trimming", max_tokens)
+        return data
+
+
+def build_context_builder(model: str, max_tokens: Optional[int] = None) -> ContextBuilder:
+    """Create a context builder counting tokens for ``model``"""
+    return ContextBuilder(TokenCounter.for_model(model), max_tokens)
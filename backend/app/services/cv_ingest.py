@@ -0,0 +1,72 @@
+import asyncio
+from typing import Dict, Any, AsyncIterator, Optional
+from .artifact_store import ArtifactStore
+from .blob_store import BlobStore
+from .match_matrix import MatchMatrix
+from .pdf_parser import PDFParser
+
+class UnsupportedDocument(Exception):
+    """Raised when an uploaded CV is not a PDF"""
+
+
+class CVIngestService:
+    """Streams uploaded CVs into the blob store and persists them as candidates.
+
+    Bytes are hashed while they are written, so identical CVs are stored once and
+    their already parsed artifact is reused. Extraction reads the stored blob through
+    a memory map instead of loading it into memory. New candidates are scored
+    against every job description in the background when a ``match_matrix`` is given.
+    """
+
+    def __init__(
+        self,
+        blob_store: BlobStore,
+        artifact_store: Optional[ArtifactStore] = None,
+        match_matrix: Optional[MatchMatrix] = None
+    ):
+        self.blob_store = blob_store
+        self.artifact_store = artifact_store or ArtifactStore()
+        self.match_matrix = match_matrix
+
+    async def ingest(self, chunks: AsyncIterator[bytes], max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """Store an uploaded PDF and return its candidate record"""
+        writer = self.blob_store.writer(max_bytes=max_bytes)
+        try:
+            async for chunk in chunks:
+                if writer.size == 0 and not chunk.startswith(b"%PDF-"[:len(chunk)]):
+                    raise UnsupportedDocument("Uploaded file is not a PDF")
+                await asyncio.to_thread(writer.write, chunk)
+            if writer.size == 0:
+                raise UnsupportedDocument("Uploaded file is empty")
+        except BaseException:
+            writer.abort()
+            raise
+        digest, path, created = await asyncio.to_thread(writer.commit)
+
+        artifact = await asyncio.to_thread(self.artifact_store.get_cv, digest)
+        if artifact:
+            self._update_match(artifact["candidate_id"], artifact["text"], artifact["parsed"], refresh=False)
+            return {
+                "candidate_id": artifact["candidate_id"],
+                "content_hash": digest,
+                "size": writer.size,
+                "duplicate": True,
+                "parsed_cv_data": artifact["parsed"]
+            }
+
+        # The parser memory-maps the blob, and hands its path to pool workers for long CVs
+        text = await asyncio.to_thread(PDFParser.extract_text_from_pdf, path)
+        parsed = await asyncio.to_thread(PDFParser.parse_cv_content, text)
+        candidate_id = await asyncio.to_thread(self.artifact_store.put_cv, digest, text, parsed, cv_path=path)
+        self._update_match(candidate_id, text, parsed, refresh=True)
+        return {
+            "candidate_id": candidate_id,
+            "content_hash": digest,
+            "size": writer.size,
+            "duplicate": not created,
+            "parsed_cv_data": parsed
+        }
+
+    def _update_match(self, candidate_id: int, text: str, parsed: Dict[str, Any], refresh: bool):
+        if self.match_matrix is not None:
+            self.match_matrix.schedule_candidate(candidate_id, text, parsed, refresh=refresh)
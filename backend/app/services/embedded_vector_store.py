@@ -0,0 +1,503 @@
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import uuid
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from .vector_quantization import VectorCodec, kmeans, nearest_centroids
+from .vector_store import VectorStoreBackend
+
+
+class EmbeddedVectorBackend(VectorStoreBackend):
+    """In-process vector index on float32 NumPy matrices.
+
+    Vectors live in one row-major matrix, memory-mapped from ``path`` when given.
+    Once ``min_train_size`` vectors are indexed an IVF index is trained with k-means
+    and the rows are reordered so every inverted list is a contiguous slice; a search
+    scans the ``nprobe`` nearest lists plus the rows added since the last build, which
+    is redone when those grow past ``rebuild_ratio`` of the index. Scores follow the
+    OpenSearch l2 space, ``1 / (1 + squared distance)``, so thresholds carry over.
+
+    With a ``codec`` the lists are scanned over compact in-memory codes (reduced
+    and/or quantized) and the ``rescore_oversample * k`` best candidates are rescored
+    against the full-precision vectors, which then only need to be paged in from the
+    memory-mapped file for those rows.
+
+    A rebuild writes the reordered vectors, documents and index to a new
+    generation of files; replacing ``state.json`` switches to it, so a crash
+    mid-rebuild leaves the previous generation intact.
+
+    Documents re-added under an existing ``id`` replace the old row, which stays as
+    a tombstone until the next rebuild. A BM25 index over ``text`` serves
+    ``lexical_search``.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+")
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    KMEANS_ITERATIONS = 8
+    KMEANS_MAX_SAMPLE = 20000
+    CHUNK_ROWS = 8192
+    DATA_FILE_PATTERN = re.compile(r"(?:g\d+\.)?(?:vectors\.f32|documents\.jsonl|ivf\.npz|codec\.npz)")
+
+    def __init__(
+        self,
+        dimension: int,
+        path: Optional[str] = None,
+        nprobe: int = 8,
+        min_train_size: int = 4096,
+        rebuild_ratio: float = 0.2,
+        codec: Optional[VectorCodec] = None,
+        rescore_oversample: int = 4
+    ):
+        self.dimension = dimension
+        self.path = path
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.rebuild_ratio = rebuild_ratio
+        self.codec = codec
+        self.rescore_oversample = rescore_oversample
+        self._lock = threading.RLock()
+
+        self._count = 0
+        self._vectors = np.empty((0, dimension), dtype=np.float32)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._dead = np.zeros(0, dtype=bool)
+        self._documents: List[Dict[str, Any]] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[Tuple[str, str], List[int]] = {}
+        self._posting_arrays: Dict[Tuple[str, str], np.ndarray] = {}
+        self._term_rows: Dict[str, Dict[int, int]] = {}
+        self._lengths: List[int] = []
+        self._total_length = 0
+
+        # IVF state: rows [0, _indexed) are grouped by list, list i spanning
+        # _offsets[i]:_offsets[i + 1]; rows from _indexed on are unindexed
+        self._centroids: Optional[np.ndarray] = None
+        self._centroid_norms: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._indexed = 0
+        self._codes: Optional[np.ndarray] = None
+        self._code_norms: Optional[np.ndarray] = None
+        self._generation = 0
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        return self._count - int(self._dead[:self._count].sum())
+
+    @staticmethod
+    def _term(value: Any) -> str:
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return str(value)
+
+    @staticmethod
+    def _sort_key(value: Any) -> Tuple[int, Any]:
+        if value is None:
+            return (0, 0)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return (1, value)
+        return (2, str(value))
+
+    # Storage
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _data_file(self, name: str) -> str:
+        """Path of a vectors/documents/index file of the current generation"""
+        return self._file(f"g{self._generation}.{name}" if self._generation else name)
+
+    def _remove_stale_files(self):
+        """Delete data files of other generations, left by a rebuild or a crash during one"""
+        current = {
+            os.path.basename(self._data_file(name))
+            for name in ("vectors.f32", "documents.jsonl", "ivf.npz", "codec.npz")
+        }
+        for name in os.listdir(self.path):
+            if self.DATA_FILE_PATTERN.fullmatch(name) and name not in current:
+                os.remove(self._file(name))
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        if not self.path:
+            vectors = np.empty((capacity, self.dimension), dtype=np.float32)
+            vectors[:self._count] = self._vectors[:self._count]
+            return vectors
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+        filename = self._data_file("vectors.f32")
+        with open(filename, "ab") as f:
+            f.truncate(capacity * self.dimension * 4)
+        return np.memmap(filename, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+
+    def _reserve(self, rows: int):
+        needed = self._count + rows
+        if needed <= len(self._vectors):
+            return
+        capacity = max(needed, 2 * len(self._vectors), 1024)
+        self._vectors = self._allocate(capacity)
+        norms = np.empty(capacity, dtype=np.float32)
+        norms[:self._count] = self._norms[:self._count]
+        self._norms = norms
+        dead = np.zeros(capacity, dtype=bool)
+        dead[:self._count] = self._dead[:self._count]
+        self._dead = dead
+        if self._codes is not None:
+            codes = np.empty((capacity,) + self._codes.shape[1:], dtype=self._codes.dtype)
+            codes[:self._count] = self._codes[:self._count]
+            self._codes = codes
+            code_norms = np.empty(capacity, dtype=np.float32)
+            code_norms[:self._count] = self._code_norms[:self._count]
+            self._code_norms = code_norms
+
+    def _load(self):
+        try:
+            with open(self._file("state.json")) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        if state["dimension"] != self.dimension:
+            raise ValueError(
+                f"Vector store at {self.path} has dimension {state['dimension']}, expected {self.dimension}"
+            )
+        self._generation = state.get("generation", 0)
+        self._remove_stale_files()
+        with open(self._data_file("documents.jsonl")) as f:
+            documents = [json.loads(line) for line in f]
+        # Rows written after the last saved state are dropped with their documents
+        self._count = min(state["count"], len(documents))
+        self._documents = documents[:self._count]
+        self._vectors = self._allocate(max(state["capacity"], self._count, 1))
+        self._norms = np.empty(len(self._vectors), dtype=np.float32)
+        self._dead = np.zeros(len(self._vectors), dtype=bool)
+        for start in range(0, self._count, self.CHUNK_ROWS):
+            chunk = self._vectors[start:min(start + self.CHUNK_ROWS, self._count)]
+            self._norms[start:start + len(chunk)] = np.einsum("ij,ij->i", chunk, chunk)
+        self._reindex()
+        if state.get("indexed"):
+            ivf = np.load(self._data_file("ivf.npz"))
+            self._centroids = ivf["centroids"]
+            self._centroid_norms = np.einsum("ij,ij->i", self._centroids, self._centroids)
+            self._offsets = ivf["offsets"]
+            self._indexed = min(state["indexed"], self._count)
+        if self.codec is not None and os.path.exists(self._data_file("codec.npz")):
+            self.codec.load_state(dict(np.load(self._data_file("codec.npz"))))
+            self._encode_all()
+
+    def _save(self, rewrite_documents: bool = False):
+        """Persist the state; ``rewrite_documents`` after a rebuild moved to a new generation"""
+        if not self.path:
+            return
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+        if rewrite_documents:
+            # Files of the new generation are not read until state.json points at it
+            with open(self._data_file("documents.jsonl"), "w") as f:
+                for document in self._documents:
+                    f.write(json.dumps(document) + "\n")
+            if self._centroids is not None:
+                np.savez(self._data_file("ivf.npz"), centroids=self._centroids, offsets=self._offsets)
+            if self._codes is not None:
+                np.savez(self._data_file("codec.npz"), **self.codec.state())
+        state = {
+            "dimension": self.dimension,
+            "count": self._count,
+            "capacity": len(self._vectors),
+            "indexed": self._indexed,
+            "generation": self._generation
+        }
+        with open(self._file("state.json.tmp"), "w") as f:
+            json.dump(state, f)
+        os.replace(self._file("state.json.tmp"), self._file("state.json"))
+        if rewrite_documents:
+            self._remove_stale_files()
+
+    def _index_row(self, row: int, document: Dict[str, Any]):
+        """Add a row to the id map, metadata postings and BM25 index"""
+        previous = self._ids.get(document["id"])
+        if previous is not None:
+            self._dead[previous] = True
+        self._ids[document["id"]] = row
+        for field, value in document["metadata"].items():
+            if isinstance(value, (str, int, float, bool)):
+                self._postings.setdefault((field, self._term(value)), []).append(row)
+        tokens = self.TOKEN_PATTERN.findall(document["text"].lower())
+        for token in tokens:
+            rows = self._term_rows.setdefault(token, {})
+            rows[row] = rows.get(row, 0) + 1
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+
+    def _reindex(self):
+        self._ids, self._postings, self._term_rows = {}, {}, {}
+        self._lengths, self._total_length = [], 0
+        self._posting_arrays.clear()
+        for row, document in enumerate(self._documents):
+            self._index_row(row, document)
+
+    # Writes
+
+    def add_documents(self, documents: List[Dict[str, Any]], refresh: bool = True, **options) -> Dict[str, Any]:
+        """Append documents; batching options of remote backends are ignored"""
+        if not documents:
+            return {"indexed": 0, "failed": []}
+        vectors = np.asarray([document["embedding"] for document in documents], dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimension:
+            raise ValueError(f"Expected embeddings of dimension {self.dimension}, got shape {vectors.shape}")
+
+        with self._lock:
+            self._reserve(len(documents))
+            start = self._count
+            self._vectors[start:start + len(documents)] = vectors
+            self._norms[start:start + len(documents)] = np.einsum("ij,ij->i", vectors, vectors)
+            if self._codes is not None:
+                codes, code_norms = self.codec.encode(vectors)
+                self._codes[start:start + len(documents)] = codes
+                self._code_norms[start:start + len(documents)] = code_norms
+            new_documents = [
+                {
+                    "id": str(document["id"]) if document.get("id") is not None else uuid.uuid4().hex,
+                    "text": document["text"],
+                    "metadata": document.get("metadata", {})
+                }
+                for document in documents
+            ]
+            for offset, document in enumerate(new_documents):
+                self._index_row(start + offset, document)
+            self._documents.extend(new_documents)
+            self._count += len(documents)
+            self._posting_arrays.clear()
+
+            if self.path:
+                with open(self._data_file("documents.jsonl"), "a") as f:
+                    for document in new_documents:
+                        f.write(json.dumps(document) + "\n")
+            if refresh:
+                self.refresh()
+        return {"indexed": len(documents), "failed": []}
+
+    def refresh(self):
+        """Rebuild the IVF index if enough rows are unindexed, then persist"""
+        with self._lock:
+            unindexed = self._count - self._indexed
+            if self._count >= self.min_train_size and unindexed > self.rebuild_ratio * max(self._indexed, 1):
+                self._build_ivf()
+                self._save(rewrite_documents=True)
+            else:
+                self._save()
+
+    def _encode_all(self):
+        """Encode every stored vector with the trained codec"""
+        codes, code_norms = [], []
+        for start in range(0, self._count, self.CHUNK_ROWS):
+            chunk_codes, chunk_norms = self.codec.encode(self._vectors[start:min(start + self.CHUNK_ROWS, self._count)])
+            codes.append(chunk_codes)
+            code_norms.append(chunk_norms)
+        self._codes = np.empty((len(self._vectors),) + codes[0].shape[1:], dtype=codes[0].dtype)
+        self._codes[:self._count] = np.concatenate(codes)
+        self._code_norms = np.empty(len(self._vectors), dtype=np.float32)
+        self._code_norms[:self._count] = np.concatenate(code_norms)
+
+    def _build_ivf(self):
+        # Tombstoned rows are dropped while the rows are reordered
+        live = np.flatnonzero(~self._dead[:self._count])
+        count = len(live)
+        vectors = self._vectors[live]
+        norms = self._norms[live]
+        nlist = max(1, int(2 * np.sqrt(count)))
+        rng = np.random.default_rng(0)
+
+        sample_size = min(count, max(nlist * 16, self.KMEANS_MAX_SAMPLE // 2), self.KMEANS_MAX_SAMPLE)
+        sample = vectors[np.sort(rng.choice(count, size=sample_size, replace=False))]
+        centroids = kmeans(sample, nlist, self.KMEANS_ITERATIONS, rng)
+        nlist = len(centroids)
+
+        assignments = nearest_centroids(vectors, centroids)
+        order = np.argsort(assignments, kind="stable")
+        if self.path:
+            # Reorder into the next generation's file; the current one stays valid until _save
+            self._generation += 1
+            self._vectors = self._allocate(len(self._vectors))
+        self._vectors[:count] = vectors[order]
+        self._norms[:count] = norms[order]
+        self._dead[:] = False
+        self._documents = [self._documents[live[row]] for row in order]
+        self._count = count
+        self._reindex()
+
+        self._centroids = centroids
+        self._centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=nlist))])
+        self._indexed = count
+
+        if self.codec is not None:
+            self.codec.fit(sample, rng)
+            self._encode_all()
+
+    # Reads
+
+    def _posting(self, field: str, value: Any) -> np.ndarray:
+        key = (field, self._term(value))
+        posting = self._posting_arrays.get(key)
+        if posting is None:
+            posting = np.asarray(self._postings.get(key, []), dtype=np.int64)
+            self._posting_arrays[key] = posting
+        return posting
+
+    @staticmethod
+    def _in_range(value: Any, bounds: Dict[str, Any]) -> bool:
+        try:
+            return value is not None and all(
+                (op == "gte" and value >= bound) or (op == "gt" and value > bound)
+                or (op == "lte" and value <= bound) or (op == "lt" and value < bound)
+                for op, bound in bounds.items()
+            )
+        except TypeError:
+            return False
+
+    def _matching_rows(self, metadata_filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Sorted live rows matching every filter, or None for no filter
+
+        Filter values are matched exactly; a list accepts any of its values and a
+        dict of ``gte``/``gt``/``lte``/``lt`` bounds is a range.
+        """
+        if not metadata_filter:
+            return None
+        rows, ranges = None, {}
+        for field, value in metadata_filter.items():
+            if isinstance(value, dict):
+                ranges[field] = value
+                continue
+            if isinstance(value, (list, tuple, set)):
+                postings = [self._posting(field, item) for item in value]
+                posting = np.unique(np.concatenate(postings)) if postings else np.empty(0, dtype=np.int64)
+            else:
+                posting = self._posting(field, value)
+            rows = posting if rows is None else np.intersect1d(rows, posting, assume_unique=True)
+            if not len(rows):
+                return rows
+        if rows is None:
+            rows = np.arange(self._count)
+        rows = rows[~self._dead[rows]]
+        if ranges:
+            rows = np.asarray([
+                row for row in rows
+                if all(self._in_range(self._documents[row]["metadata"].get(field), bounds) for field, bounds in ranges.items())
+            ], dtype=np.int64)
+        return rows
+
+    def _hits(self, rows: np.ndarray, scores: Optional[np.ndarray]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": self._documents[row]["id"],
+                "text": self._documents[row]["text"],
+                "metadata": self._documents[row]["metadata"],
+                "score": float(scores[i]) if scores is not None else None
+            }
+            for i, row in enumerate(rows)
+        ]
+
+    @staticmethod
+    def _top_k(rows: np.ndarray, distances: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if len(distances) > k:
+            top = np.argpartition(distances, k)[:k]
+            rows, distances = rows[top], distances[top]
+        order = np.argsort(distances, kind="stable")
+        return rows[order], distances[order]
+
+    def _distances(self, query: np.ndarray, query_norm: float, start: int, end: int, prepared: Any = None) -> np.ndarray:
+        if prepared is not None:
+            return self.codec.distances(prepared, self._codes[start:end], self._code_norms[start:end])
+        return self._norms[start:end] + query_norm - 2 * (self._vectors[start:end] @ query)
+
+    def _exact(self, query: np.ndarray, query_norm: float, rows: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        if rows is None:
+            return np.arange(self._count), self._distances(query, query_norm, 0, self._count)
+        return rows, self._norms[rows] + query_norm - 2 * (self._vectors[rows] @ query)
+
+    def _probe(self, query: np.ndarray, query_norm: float, prepared: Any = None) -> Tuple[np.ndarray, np.ndarray]:
+        centroid_distances = self._centroid_norms - 2 * (self._centroids @ query)
+        nprobe = min(self.nprobe, len(centroid_distances))
+        lists = np.argpartition(centroid_distances, nprobe - 1)[:nprobe]
+        spans = [(self._offsets[i], self._offsets[i + 1]) for i in lists]
+        spans.append((self._indexed, self._count))
+        rows = np.concatenate([np.arange(start, end) for start, end in spans])
+        distances = np.concatenate([self._distances(query, query_norm, start, end, prepared) for start, end in spans])
+        return rows, distances
+
+    def search(self, query_embedding: List[float], k: int = 5, metadata_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Nearest neighbours by l2 distance, optionally restricted by metadata"""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = float(query @ query)
+        with self._lock:
+            if not self._count:
+                return []
+            allowed = self._matching_rows(metadata_filter)
+            if allowed is not None and not len(allowed):
+                return []
+
+            # Selective filters and small stores are cheaper to scan exactly
+            exact = self._centroids is None or (allowed is not None and len(allowed) <= max(self.CHUNK_ROWS, 50 * k))
+            prepared = None
+            if exact:
+                rows, distances = self._exact(query, query_norm, allowed)
+            else:
+                prepared = self.codec.prepare(query) if self._codes is not None else None
+                rows, distances = self._probe(query, query_norm, prepared)
+                if allowed is not None:
+                    keep = np.isin(rows, allowed, assume_unique=True)
+                    rows, distances = rows[keep], distances[keep]
+            if allowed is None and self._dead[:self._count].any():
+                keep = ~self._dead[rows]
+                rows, distances = rows[keep], distances[keep]
+            if not exact and allowed is not None and len(rows) < k:
+                rows, distances = self._exact(query, query_norm, allowed)
+            elif prepared is not None:
+                rows, _ = self._top_k(rows, distances, k * self.rescore_oversample)
+                rows, distances = self._exact(query, query_norm, np.sort(rows))
+
+            rows, distances = self._top_k(rows, distances, k)
+            return self._hits(rows, 1 / (1 + np.maximum(distances, 0)))
+
+    def lexical_search(self, query_text: str, k: int = 5, metadata_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Documents ranked by BM25 over their text, optionally restricted by metadata"""
+        with self._lock:
+            live = len(self)
+            if not live:
+                return []
+            allowed = self._matching_rows(metadata_filter)
+            allowed = set(allowed.tolist()) if allowed is not None else None
+            average_length = self._total_length / max(self._count, 1) or 1
+            scores: Dict[int, float] = {}
+            for token in set(self.TOKEN_PATTERN.findall(query_text.lower())):
+                rows = self._term_rows.get(token)
+                if not rows:
+                    continue
+                idf = math.log(1 + (live - len(rows) + 0.5) / (len(rows) + 0.5))
+                for row, frequency in rows.items():
+                    if self._dead[row] or (allowed is not None and row not in allowed):
+                        continue
+                    norm = self.BM25_K1 * (1 - self.BM25_B + self.BM25_B * self._lengths[row] / average_length)
+                    scores[row] = scores.get(row, 0.0) + idf * frequency * (self.BM25_K1 + 1) / (frequency + norm)
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return self._hits([row for row, _ in top], [score for _, score in top])
+
+    def find(self, metadata_filter: Dict[str, Any], k: int = 5, sort_by: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Documents matching the metadata filter, newest ``sort_by`` value first"""
+        with self._lock:
+            rows = self._matching_rows(metadata_filter)
+            if rows is None:
+                rows = np.flatnonzero(~self._dead[:self._count])
+            if sort_by:
+                rows = heapq.nlargest(
+                    k,
+                    rows,
+                    key=lambda row: self._sort_key(self._documents[row]["metadata"].get(sort_by))
+                )
+            return self._hits(rows[:k], None)
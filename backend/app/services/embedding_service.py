@@ -0,0 +1,273 @@
+import asyncio
+import hashlib
+import re
+import threading
+from typing import Dict, Any, List, Optional, Iterator, NamedTuple, Tuple
+import numpy as np
+from langchain.schema.embeddings import Embeddings
+from ..core.config import settings
+from .llm_cache import MemoryCacheBackend, SQLiteCacheBackend
+
+
+class TextChunk(NamedTuple):
+    """A chunk of a document, as offsets into the original text"""
+    text: str
+    start: int
+    end: int
+
+
+class EmbeddingModel:
+    """A model turning texts into fixed-size float32 vectors"""
+    name: str
+    dimension: int
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    async def aembed(self, texts: List[str]) -> np.ndarray:
+        return await asyncio.to_thread(self.embed, texts)
+
+
+class OpenAIEmbeddingModel(EmbeddingModel):
+    def __init__(self, model: str, dimension: int):
+        from langchain.embeddings import OpenAIEmbeddings
+        self.name = f"openai:{model}"
+        self.dimension = dimension
+        self._client = OpenAIEmbeddings(
+            model=model,
+            openai_api_key=settings.OPENAI_API_KEY,
+            openai_api_base=settings.OPENAI_API_BASE
+        )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self._client.embed_documents(texts, chunk_size=len(texts)), dtype=np.float32)
+
+    async def aembed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(await self._client.aembed_documents(texts, chunk_size=len(texts)), dtype=np.float32)
+
+
+class HashingEmbeddingModel(EmbeddingModel):
+    """Deterministic bag-of-words embeddings for offline development and tests.
+
+    Word unigrams and bigrams are hashed into signed buckets and the result is
+    L2-normalized, so texts sharing vocabulary land close together.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+")
+
+    def __init__(self, dimension: int):
+        self.name = f"hashing:{dimension}"
+        self.dimension = dimension
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = self.TOKEN_PATTERN.findall(text.lower())
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                bucket = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                vectors[row, bucket % self.dimension] += 1.0 if bucket >> 63 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class EmbeddingPipeline(Embeddings):
+    """Chunks, batches and caches embedding requests.
+
+    Texts are deduplicated and looked up in the cache by a hash of the model name and
+    the text; only misses are sent to the model, in batches bounded by count and
+    characters, with at most ``max_concurrency`` batches in flight. Implements the
+    LangChain ``Embeddings`` interface so it can stand in for ``OpenAIEmbeddings``.
+    """
+
+    def __init__(
+        self,
+        model: EmbeddingModel,
+        cache=None,
+        batch_size: int = 64,
+        max_batch_chars: int = 200000,
+        max_concurrency: int = 4,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200
+    ):
+        self.model = model
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_batch_chars = max_batch_chars
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stats = {"hits": 0, "misses": 0, "batches": 0}
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def chunk_text(text: str, chunk_size: int, overlap: int) -> List[TextChunk]:
+        """Split text into windows of about ``chunk_size`` characters overlapping by ``overlap``
+
+        Window boundaries are moved back to the nearest whitespace so words are not
+        cut in half.
+        """
+        chunks = []
+        length = len(text)
+        start = 0
+        while start < length:
+            while start < length and text[start].isspace():
+                start += 1
+            if start >= length:
+                break
+            end = min(start + chunk_size, length)
+            if end < length:
+                cut = max(text.rfind(" ", start + chunk_size // 2, end), text.rfind("\n", start + chunk_size // 2, end))
+                if cut > start:
+                    end = cut
+            chunks.append(TextChunk(text[start:end].rstrip(), start, end))
+            if end >= length:
+                break
+            next_start = max(end - overlap, start + 1)
+            space = text.find(" ", next_start, end)
+            start = space + 1 if space != -1 else next_start
+        return chunks
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model.name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _lookup(self, texts: List[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """Split unique texts into cached vectors and texts still to embed"""
+        found, missing = {}, []
+        for text in dict.fromkeys(texts):
+            value = self.cache.get(self._key(text), 0) if self.cache is not None else None
+            if value is None:
+                missing.append(text)
+            else:
+                found[text] = np.frombuffer(value, dtype=np.float32)
+        self._count("hits", len(found))
+        self._count("misses", len(missing))
+        return found, missing
+
+    def _batches(self, texts: List[str]) -> Iterator[List[str]]:
+        batch, batch_chars = [], 0
+        for text in texts:
+            if batch and (len(batch) >= self.batch_size or batch_chars + len(text) > self.max_batch_chars):
+                yield batch
+                batch, batch_chars = [], 0
+            batch.append(text)
+            batch_chars += len(text)
+        if batch:
+            yield batch
+
+    def _store(self, found: Dict[str, np.ndarray], batch: List[str], vectors: np.ndarray):
+        self._count("batches")
+        for text, vector in zip(batch, vectors):
+            found[text] = vector
+            if self.cache is not None:
+                self.cache.set(self._key(text), vector.astype(np.float32).tobytes())
+
+    def _assemble(self, texts: List[str], found: Dict[str, np.ndarray]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.model.dimension), dtype=np.float32)
+        return np.stack([found[text] for text in texts])
+
+    def embed_vectors(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, one row per text"""
+        found, missing = self._lookup(texts)
+        for batch in self._batches(missing):
+            self._store(found, batch, self.model.embed(batch))
+        return self._assemble(texts, found)
+
+    async def aembed_vectors(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with up to ``max_concurrency`` batches in flight"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        found, missing = await asyncio.to_thread(self._lookup, texts)
+
+        async def run(batch: List[str]):
+            async with self._semaphore:
+                vectors = await self.model.aembed(batch)
+            await asyncio.to_thread(self._store, found, batch, vectors)
+
+        await asyncio.gather(*(run(batch) for batch in self._batches(missing)))
+        return self._assemble(texts, found)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_vectors(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_vectors([text])[0].tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return (await self.aembed_vectors(texts)).tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_vectors([text]))[0].tolist()
+
+    async def embed_document(
+        self,
+        text: str,
+        metadata: Dict[str, Any],
+        document_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Chunk and embed a document into VectorStore documents
+
+        Each chunk carries the document metadata plus its chunk index and character
+        offsets; with a ``document_id`` chunks get stable ids so re-indexing the same
+        document overwrites rather than duplicates them.
+        """
+        chunks = self.chunk_text(text, self.chunk_size, self.chunk_overlap)
+        vectors = await self.aembed_vectors([chunk.text for chunk in chunks])
+        documents = []
+        for index, (chunk, vector) in enumerate(zip(chunks, vectors)):
+            document = {
+                "text": chunk.text,
+                "embedding": vector,
+                "metadata": {**metadata, "chunk": index, "start": chunk.start, "end": chunk.end}
+            }
+            if document_id is not None:
+                document["id"] = f"{document_id}:{index}"
+            documents.append(document)
+        return documents
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache hit/miss counters and number of model batches sent"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def build_embedding_pipeline() -> EmbeddingPipeline:
+    """Create the embedding pipeline configured in settings"""
+    if settings.EMBEDDING_MODEL == "openai":
+        model = OpenAIEmbeddingModel(settings.EMBEDDING_OPENAI_MODEL, settings.VECTOR_DIMENSION)
+    elif settings.EMBEDDING_MODEL == "local":
+        model = HashingEmbeddingModel(settings.VECTOR_DIMENSION)
+    else:
+        raise ValueError(f"Unknown embedding model '{settings.EMBEDDING_MODEL}'")
+
+    if settings.EMBEDDING_CACHE_BACKEND == "memory":
+        cache = MemoryCacheBackend(settings.EMBEDDING_CACHE_MAX_ENTRIES)
+    elif settings.EMBEDDING_CACHE_BACKEND == "sqlite":
+        cache = SQLiteCacheBackend(
+            settings.EMBEDDING_CACHE_SQLITE_PATH,
+            settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            table="embedding_cache"
+        )
+    elif settings.EMBEDDING_CACHE_BACKEND == "none":
+        cache = None
+    else:
+        raise ValueError(f"Unknown embedding cache backend '{settings.EMBEDDING_CACHE_BACKEND}'")
+
+    return EmbeddingPipeline(
+        model,
+        cache=cache,
+        batch_size=settings.EMBEDDING_BATCH_SIZE,
+        max_batch_chars=settings.EMBEDDING_MAX_BATCH_CHARS,
+        max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+        chunk_size=settings.EMBEDDING_CHUNK_SIZE,
+        chunk_overlap=settings.EMBEDDING_CHUNK_OVERLAP
+    )
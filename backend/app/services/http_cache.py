@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+
+class HTTPCache:
+    """On-disk response cache that supports conditional GET revalidation
+
+    A response is only served without a request while its own Cache-Control
+    max-age or Expires allows; entries with just an ETag/Last-Modified, or marked
+    no-cache, are revalidated every time.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".body"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a URL, or None if it is not cached"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            with open(body_path, "rb") as f:
+                entry["content"] = f.read()
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        """Check whether an entry can be served without revalidation"""
+        if entry.get("no_cache"):
+            return False
+        if entry.get("max_age") is not None:
+            return time.time() - entry.get("stored_at", 0) < entry["max_age"]
+        if entry.get("expires") is not None:
+            return time.time() < entry["expires"]
+        return False
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a cached entry"""
+        headers = {}
+        if not entry:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, status_code: int, headers: Dict[str, str], content: bytes) -> Dict[str, Any]:
+        """Store a response if it carries a validator or a cacheable max-age"""
+        entry = {
+            "url": url,
+            "status_code": status_code,
+            "content_type": headers.get("content-type", ""),
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "stored_at": time.time(),
+            **self._freshness(headers)
+        }
+        if "no-store" in headers.get("cache-control", "").lower():
+            return entry
+        if not (entry["etag"] or entry["last_modified"] or entry["max_age"] or entry["expires"]):
+            return entry
+
+        meta_path, body_path = self._paths(url)
+        self._atomic_write(body_path, content)
+        self._atomic_write(meta_path, json.dumps(entry).encode("utf-8"))
+        return entry
+
+    def touch(self, url: str, entry: Dict[str, Any], headers: Dict[str, str]):
+        """Refresh an entry after a 304 Not Modified response"""
+        meta = {k: v for k, v in entry.items() if k != "content"}
+        meta["stored_at"] = time.time()
+        if headers.get("etag"):
+            meta["etag"] = headers["etag"]
+        if headers.get("last-modified"):
+            meta["last_modified"] = headers["last-modified"]
+        # A 304 carries the current caching directives, which replace the stored ones
+        if "cache-control" in headers or "expires" in headers:
+            meta.update(self._freshness(headers))
+        meta_path, _ = self._paths(url)
+        self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        entry.update(meta)
+
+    @classmethod
+    def _freshness(cls, headers: Dict[str, str]) -> Dict[str, Any]:
+        cache_control = headers.get("cache-control", "").lower()
+        return {
+            "max_age": cls._parse_max_age(cache_control),
+            "expires": cls._parse_expires(headers.get("expires")),
+            "no_cache": "no-cache" in cache_control
+        }
+
+    @staticmethod
+    def _parse_expires(expires: Optional[str]) -> Optional[float]:
+        if not expires:
+            return None
+        try:
+            return parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return 0.0  # an invalid date means already expired
+
+    @staticmethod
+    def _parse_max_age(cache_control: str) -> Optional[int]:
+        for directive in cache_control.split(","):
+            directive = directive.strip()
+            if directive.startswith("max-age="):
+                try:
+                    return int(directive.split("=", 1)[1])
+                except ValueError:
+                    return None
+        return None
+
+    def _atomic_write(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,108 @@
+import re
+from typing import Dict, Any, List, Optional, Tuple
+from .skill_taxonomy import SkillTaxonomy, match_requirements
+
+# Scraped pages are joined into one line, so requirements are classified per sentence,
+# semicolon-separated clause or bullet rather than per line
+CLAUSE_BREAK = re.compile(r"(?<=[.!?])\s+|[;\n\u2022\u00b7\u25aa\u25cf]|\s[-*]\s")
+# Requirement clauses containing one of these list preferred rather than required skills
+PREFERRED_MARKERS = re.compile(
+    r"\b(nice to have|nice-to-have|preferred|bonus|a plus|is a plus|desirable|ideally|optional)\b",
+    re.IGNORECASE
+)
+LEADERSHIP_MARKERS = re.compile(r"\b(lead|leading|senior|staff|principal|mentor\w*|manage\w*)\b", re.IGNORECASE)
+
+# Skill categories that warrant a system design round
+DESIGN_CATEGORIES = {"architecture", "cloud_devops", "databases"}
+
+DURATIONS = {"technical_interview": "60 minutes", "system_design": "45 minutes", "behavioral": "30 minutes"}
+BEHAVIORAL_TOPICS = ["Past projects and their impact", "Collaboration and handling disagreement"]
+
+
+def candidate_skills(text: str, taxonomy: Optional[SkillTaxonomy] = None) -> List[str]:
+    """Canonical skills mentioned anywhere in a CV"""
+    return (taxonomy or SkillTaxonomy.get()).extract(text or "")
+
+
+def job_skills(
+    sections: Dict[str, str],
+    text: str = "",
+    taxonomy: Optional[SkillTaxonomy] = None
+) -> Tuple[List[str], List[str]]:
+    """Required and preferred skills of a job description
+
+    Reads the requirements section (the whole text when there is none); skills in
+    sentences or bullets marked "nice to have", "preferred" and the like are preferred.
+    """
+    taxonomy = taxonomy or SkillTaxonomy.get()
+    required, preferred = [], []
+    for clause in CLAUSE_BREAK.split(sections.get("requirements") or text or ""):
+        skills = taxonomy.extract(clause)
+        (preferred if PREFERRED_MARKERS.search(clause) else required).extend(skills)
+    required = list(dict.fromkeys(required))
+    return required, [skill for skill in dict.fromkeys(preferred) if skill not in required]
+
+
+def build_agenda(
+    skill_match: Dict[str, Any],
+    job_text: str = "",
+    taxonomy: Optional[SkillTaxonomy] = None
+) -> Dict[str, Any]:
+    """Interview agenda from a ``match_requirements`` result, by rule rather than by LLM
+
+    Matched required skills are verified in depth and missing ones probed as gaps;
+    a system design round is planned only when the job asks for architecture,
+    infrastructure or database skills.
+    """
+    taxonomy = taxonomy or SkillTaxonomy.get()
+
+    def topic(skill: str, focus: str) -> Dict[str, Any]:
+        return {"skill": skill, "category": taxonomy.category(skill), "focus": focus}
+
+    technical, design, behavioral = [], [], list(BEHAVIORAL_TOPICS)
+    for focus, skills in (
+        ("verify", skill_match["matched_skills"]),
+        ("gap", skill_match["missing_skills"]),
+        ("preferred", skill_match["matched_preferred"])
+    ):
+        for skill in skills:
+            category = taxonomy.category(skill)
+            if category == "soft_skills":
+                behavioral.append(skill)
+            elif category in DESIGN_CATEGORIES and focus != "preferred":
+                design.append(topic(skill, focus))
+            else:
+                technical.append(topic(skill, focus))
+    if LEADERSHIP_MARKERS.search(job_text or "") and "Leadership" not in behavioral:
+        behavioral.append("Leadership")
+
+    agenda = {"technical_interview": {"topics": technical, "duration": DURATIONS["technical_interview"]}}
+    if design:
+        agenda["system_design"] = {"topics": design, "duration": DURATIONS["system_design"]}
+    agenda["behavioral"] = {"topics": behavioral, "duration": DURATIONS["behavioral"]}
+    return agenda
+
+
+def plan_interview(
+    cv_text: str,
+    job_sections: Dict[str, str],
+    job_text: str = "",
+    taxonomy: Optional[SkillTaxonomy] = None,
+    requirements: Optional[Tuple[List[str], List[str]]] = None
+) -> Dict[str, Any]:
+    """Skills, requirement match and agenda for a CV against a job description
+
+    Pass the job's ``(required, preferred)`` skills as ``requirements`` when they
+    were already extracted, e.g. once for a batch of candidates.
+    """
+    taxonomy = taxonomy or SkillTaxonomy.get()
+    skills = candidate_skills(cv_text, taxonomy)
+    required, preferred = requirements or job_skills(job_sections, job_text, taxonomy)
+    skill_match = match_requirements(skills, required, preferred)
+    return {
+        "skills": skills,
+        "required_skills": required,
+        "preferred_skills": preferred,
+        "skill_match": skill_match,
+        "agenda": build_agenda(skill_match, job_text or "\n".join(job_sections.values()), taxonomy)
+    }
@@ -0,0 +1,162 @@
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Type
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
+from ..models.base import Base
+from ..models.interview import Candidate, Interview, InterviewPayload, JobDescription
+
+BULK_BATCH_SIZE = 1000
+
+
+class InterviewRepository:
+    """Async queries for interviews and the candidates and job descriptions they reference.
+
+    Listings page by keyset on ``(created_at, id)`` so every page is an index range
+    scan whatever its depth, and load the related candidate and job description in
+    the same query (without their large text and JSON columns) instead of one lazy
+    load per row. Agenda, questions, responses and feedback live compressed in
+    ``interview_payloads`` and are only read when a single run is fetched with them.
+    """
+
+    PAYLOAD_FIELDS = ("agenda", "questions", "responses", "feedback")
+
+    SUMMARY_COLUMNS = (
+        Interview.id, Interview.status, Interview.error, Interview.candidate_id,
+        Interview.job_description_id, Interview.created_at, Interview.updated_at
+    )
+
+    @staticmethod
+    async def bulk_insert(
+        db: AsyncSession,
+        model: Type[Base],
+        rows: List[Dict[str, Any]],
+        commit: bool = True
+    ) -> List[int]:
+        """Insert rows with multi-row INSERT statements and return their ids in order"""
+        ids = []
+        for start in range(0, len(rows), BULK_BATCH_SIZE):
+            result = await db.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                rows[start:start + BULK_BATCH_SIZE]
+            )
+            ids.extend(result.scalars().all())
+        if commit:
+            await db.commit()
+        return ids
+
+    def _split(self, fields: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Separate row columns from side-table payload fields"""
+        payload = {name: fields[name] for name in self.PAYLOAD_FIELDS if name in fields}
+        return {name: value for name, value in fields.items() if name not in payload}, payload
+
+    async def create_interview(self, db: AsyncSession, **fields) -> int:
+        interview = Interview(**fields)
+        db.add(interview)
+        await db.commit()
+        return interview.id
+
+    async def bulk_create_interviews(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert interviews, and the payloads of those that have any, in one transaction"""
+        split = [self._split(row) for row in rows]
+        ids = await self.bulk_insert(db, Interview, [columns for columns, _ in split], commit=False)
+        payloads = [{"interview_id": interview_id, **payload} for interview_id, (_, payload) in zip(ids, split) if payload]
+        for start in range(0, len(payloads), BULK_BATCH_SIZE):
+            await db.execute(insert(InterviewPayload), payloads[start:start + BULK_BATCH_SIZE])
+        await db.commit()
+        return ids
+
+    async def update_interview(self, db: AsyncSession, interview_id: int, **fields) -> bool:
+        """Update an interview and upsert its payload without loading either first"""
+        columns, payload = self._split(fields)
+        result = await db.execute(
+            update(Interview).where(Interview.id == interview_id).values(**(columns or {"updated_at": datetime.utcnow()}))
+        )
+        if payload and result.rowcount:
+            dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+            statement = dialect.insert(InterviewPayload).values(interview_id=interview_id, **payload)
+            await db.execute(statement.on_conflict_do_update(index_elements=["interview_id"], set_=payload))
+        await db.commit()
+        return result.rowcount > 0
+
+    async def get_interview(
+        self,
+        db: AsyncSession,
+        interview_id: int,
+        include_payload: bool = True
+    ) -> Optional[Interview]:
+        """Load an interview with its candidate, job description and optionally its payload"""
+        options = [joinedload(Interview.candidate), joinedload(Interview.job_description)]
+        if include_payload:
+            options.append(joinedload(Interview.payload))
+        return await db.get(Interview, interview_id, options=options)
+
+    async def list_interviews(
+        self,
+        db: AsyncSession,
+        status: Optional[str] = None,
+        candidate_id: Optional[int] = None,
+        job_description_id: Optional[int] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> Tuple[List[Interview], Optional[Tuple[datetime, int]]]:
+        """Newest interviews first, with the cursor of the next page (None on the last page)
+
+        ``before`` is the ``(created_at, id)`` cursor returned with the previous page.
+        """
+        query = select(Interview).options(
+            load_only(*self.SUMMARY_COLUMNS),
+            joinedload(Interview.candidate).load_only(Candidate.id, Candidate.name, Candidate.email),
+            joinedload(Interview.job_description).load_only(
+                JobDescription.id, JobDescription.title, JobDescription.company_name
+            )
+        )
+        if status is not None:
+            query = query.where(Interview.status == status)
+        if candidate_id is not None:
+            query = query.where(Interview.candidate_id == candidate_id)
+        if job_description_id is not None:
+            query = query.where(Interview.job_description_id == job_description_id)
+        if before is not None:
+            query = query.where(tuple_(Interview.created_at, Interview.id) < tuple_(*before))
+        query = query.order_by(Interview.created_at.desc(), Interview.id.desc()).limit(limit + 1)
+
+        interviews = list((await db.execute(query)).scalars().all())
+        next_cursor = None
+        if len(interviews) > limit:
+            interviews = interviews[:limit]
+            next_cursor = (interviews[-1].created_at, interviews[-1].id)
+        return interviews, next_cursor
+
+    @staticmethod
+    def summary(interview: Interview) -> Dict[str, Any]:
+        """Listing view of an interview loaded by ``list_interviews``"""
+        candidate, job_description = interview.candidate, interview.job_description
+        return {
+            "run_id": interview.id,
+            "status": interview.status,
+            "error": interview.error,
+            "candidate": {"id": candidate.id, "name": candidate.name, "email": candidate.email} if candidate else None,
+            "job_description": {
+                "id": job_description.id,
+                "title": job_description.title,
+                "company_name": job_description.company_name
+            } if job_description else None,
+            "created_at": interview.created_at,
+            "updated_at": interview.updated_at
+        }
+
+    @staticmethod
+    def encode_cursor(cursor: Optional[Tuple[datetime, int]]) -> Optional[str]:
+        if cursor is None:
+            return None
+        return f"{cursor[0].isoformat()}_{cursor[1]}"
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+        """Parse a cursor from ``encode_cursor``; raises ValueError when malformed"""
+        if not cursor:
+            return None
+        created_at, _, interview_id = cursor.rpartition("_")
+        return datetime.fromisoformat(created_at), int(interview_id)
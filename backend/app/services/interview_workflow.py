@@ -0,0 +1,328 @@
+import asyncio
+import logging
+import uuid
+from typing import Dict, Any, List, Optional
+from ..agents.factory import AgentSession
+from ..agents.streaming import AgentStreamHandler
+from ..core.pipeline import Pipeline, PipelineResult, Stage, StageListener
+from .artifact_store import ArtifactStore
+from .interview_agenda import job_skills
+from .match_matrix import MatchMatrix
+from .pdf_parser import PDFParser
+from .web_scraper import WebScraper
+
+logger = logging.getLogger(__name__)
+
+class InterviewWorkflow:
+    """Dependency graph for a single interview run.
+
+    CV parsing, job description scraping/parsing and company site scraping run
+    concurrently; each agent stage starts as soon as the stages it reads from finish.
+    The documents are compacted to the HR agent's token budget before it sees them.
+    With a ``match_matrix`` the candidate and job description are profiled and scored
+    in the background; the supervisor sees the pair's score once it is stored.
+    """
+
+    AGENT_STAGES = [("HR Agent", "hr"), ("Interviewer Agent", "interviewer"), ("Supervisor Agent", "supervisor")]
+
+    def __init__(
+        self,
+        hr_agent,
+        interviewer_agent,
+        supervisor_agent,
+        artifact_store: Optional[ArtifactStore] = None,
+        match_matrix: Optional[MatchMatrix] = None
+    ):
+        self.artifact_store = artifact_store or ArtifactStore()
+        self.match_matrix = match_matrix
+        self.hr_agent = hr_agent
+        self.interviewer_agent = interviewer_agent
+        self.supervisor_agent = supervisor_agent
+        self.pipeline = Pipeline([
+            Stage("cv", self._load_cv),
+            Stage("job_description", self._load_job_description),
+            Stage("company_website", self._load_company_website),
+            Stage("hr_context", self._build_hr_context, depends_on=["cv", "job_description", "company_website"]),
+            Stage("hr", self._run_hr, depends_on=["cv", "job_description", "hr_context"]),
+            Stage("interviewer", self._run_interviewer, depends_on=["hr"]),
+            Stage("match", self._update_match, depends_on=["cv", "job_description"]),
+            Stage("supervisor", self._run_supervisor, depends_on=["hr", "interviewer", "match"]),
+        ])
+
+    async def run(
+        self,
+        request: Dict[str, Any],
+        on_event: Optional[StageListener] = None,
+        stream: Optional[asyncio.Queue] = None,
+        session_id: Optional[str] = None,
+        prepared: Optional[Dict[str, Any]] = None
+    ) -> PipelineResult:
+        """Run the workflow for an interview request
+
+        When ``stream`` is given, agent token and tool-call events are put on it while
+        the agent stages run. Agent memory is keyed by ``session_id`` (the interview
+        ID for queued runs), or by a fresh ID per run. ``prepared`` holds job-side
+        stage outputs from ``prepare_job`` to reuse instead of loading them again.
+        """
+        session_id = session_id or uuid.uuid4().hex
+        context = {
+            "request": request,
+            "stream": stream,
+            "agents": {
+                "hr": AgentSession(self.hr_agent, session_id),
+                "interviewer": AgentSession(self.interviewer_agent, session_id),
+                "supervisor": AgentSession(self.supervisor_agent, session_id)
+            }
+        }
+        return await self.pipeline.run(context, on_event=on_event, outputs=prepared)
+
+    async def prepare_job(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Load the job description and company website once for many candidate runs
+
+        The job description's match profile is also scheduled here, so the
+        candidate runs only score themselves against it.
+        """
+        context = {"request": request, "stream": None, "agents": {}}
+        job_description, company_website = await asyncio.gather(
+            self._load_job_description(context),
+            self._load_company_website(context)
+        )
+        if self.match_matrix is not None and job_description["job_description_id"] is not None:
+            self.match_matrix.schedule_job_description(
+                job_description["job_description_id"],
+                job_description["page"].get("content", ""),
+                job_description["parsed"],
+                refresh=not job_description["from_artifact_store"]
+            )
+            # Stored and being profiled now, so candidate runs must not refresh it again
+            job_description = {**job_description, "from_artifact_store": True}
+        return {"job_description": job_description, "company_website": company_website}
+
+    @staticmethod
+    def _callbacks(context: Dict[str, Any], agent) -> Optional[List[Any]]:
+        if context["stream"] is None:
+            return None
+        return [AgentStreamHandler(context["stream"], agent.name)]
+
+    @classmethod
+    def agent_responses(cls, result: PipelineResult) -> List[Dict[str, Any]]:
+        """Collect the agent stage outputs of a run in workflow order"""
+        return [
+            {
+                "agent": agent,
+                "response": result.outputs[stage]["response"],
+                "data": result.outputs[stage]["data"],
+                "duration_ms": result.timings[stage]["duration_ms"]
+            }
+            for agent, stage in cls.AGENT_STAGES
+        ]
+
+    async def _load_cv(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        request = context["request"]
+        raw, fetched = request.get("cv_text"), None
+        if not raw and request.get("cv_url"):
+            fetched = await WebScraper.fetch(request["cv_url"])
+            raw = fetched["content"]
+        if not raw:
+            # Nothing to memoize, and an empty CV must not become a candidate every such run shares
+            parsed = await asyncio.to_thread(PDFParser.parse_cv_content, "")
+            return {"candidate_id": None, "text": "", "parsed": parsed, "from_artifact_store": False}
+
+        content_hash = ArtifactStore.content_hash(raw)
+        artifact = await asyncio.to_thread(self.artifact_store.get_cv, content_hash)
+        if artifact:
+            return {**artifact, "from_artifact_store": True}
+
+        text = raw
+        if fetched is not None:
+            if "pdf" in fetched["content_type"] or fetched["content"][:5] == b"%PDF-":
+                text = await asyncio.to_thread(PDFParser.extract_text_from_pdf, fetched["content"])
+            else:
+                text = (await asyncio.to_thread(WebScraper.parse_html, fetched))["content"]
+        parsed = await asyncio.to_thread(PDFParser.parse_cv_content, text)
+        candidate_id = await asyncio.to_thread(
+            self.artifact_store.put_cv,
+            content_hash,
+            text,
+            parsed,
+            cv_path=request.get("cv_url")
+        )
+        return {"candidate_id": candidate_id, "text": text, "parsed": parsed, "from_artifact_store": False}
+
+    async def _load_job_description(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        job_description = await self._fetch_job_description(context)
+        required, preferred = await asyncio.to_thread(
+            job_skills, job_description["parsed"], job_description["page"].get("content", "")
+        )
+        return {**job_description, "required_skills": required, "preferred_skills": preferred}
+
+    async def _fetch_job_description(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        url = context["request"]["job_description_url"]
+        # The copy stored for this URL is revalidated with its own ETag/Last-Modified,
+        # so an unchanged page is neither downloaded nor parsed again
+        known = await asyncio.to_thread(self.artifact_store.get_job_description_for_url, url)
+        try:
+            fetched = await WebScraper.fetch(url, validators=known)
+        except Exception as e:
+            return {"page": {"error": str(e), "url": url}, "parsed": {}, "job_description_id": None}
+
+        if fetched["status_code"] == 304:
+            return self._stored_job_description(url, known)
+        content_hash = ArtifactStore.content_hash(fetched["content"])
+        artifact = known if known and known["content_hash"] == content_hash else await asyncio.to_thread(
+            self.artifact_store.get_job_description, content_hash
+        )
+        if artifact:
+            source = (url, fetched["etag"], fetched["last_modified"])
+            if (artifact["source_url"], artifact["etag"], artifact["last_modified"]) != source:
+                await asyncio.to_thread(
+                    self.artifact_store.set_job_description_source, artifact["job_description_id"], *source
+                )
+            return self._stored_job_description(url, artifact)
+
+        page = await asyncio.to_thread(WebScraper.parse_html, fetched)
+        parsed = await asyncio.to_thread(WebScraper.extract_job_description, page["content"])
+        job_description_id = await asyncio.to_thread(
+            self.artifact_store.put_job_description,
+            content_hash,
+            page["content"],
+            parsed,
+            title=(page["title"] or "")[:255],
+            company_website=context["request"].get("company_website_url"),
+            source_url=url,
+            etag=fetched["etag"],
+            last_modified=fetched["last_modified"]
+        )
+        return {
+            "job_description_id": job_description_id,
+            "page": page,
+            "parsed": parsed,
+            "from_artifact_store": False
+        }
+
+    @staticmethod
+    def _stored_job_description(url: str, artifact: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "job_description_id": artifact["job_description_id"],
+            "page": {"title": artifact["title"], "content": artifact["text"], "metadata": {"url": url}},
+            "parsed": artifact["parsed"],
+            "job_requirements": artifact["job_requirements"],
+            "from_artifact_store": True
+        }
+
+    async def _load_company_website(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        return await WebScraper.ascrape_webpage(context["request"]["company_website_url"])
+
+    def _build_hr_context(self, context: Dict[str, Any], cv, job_description, company_website) -> Dict[str, Any]:
+        # Links, boilerplate and low-value sections never reach the prompt
+        return context["agents"]["hr"].agent.context_builder.compact_documents(
+            cv["text"], job_description["page"], company_website
+        )
+
+    async def _run_hr(self, context: Dict[str, Any], cv, job_description, hr_context) -> Dict[str, Any]:
+        request = context["request"]
+        agent = context["agents"]["hr"]
+        # Skills, requirement match and agenda are deterministic; the LLM only narrates them
+        analysis = await asyncio.to_thread(
+            agent.agent.analyze,
+            cv["text"],
+            cv["parsed"],
+            job_description["page"].get("content", ""),
+            job_description["parsed"],
+            requirements=(job_description["required_skills"], job_description["preferred_skills"])
+        )
+        ids = {"candidate_id": cv["candidate_id"], "job_description_id": job_description["job_description_id"]}
+        if cv.get("candidate_info") is not None and job_description.get("job_requirements") is not None:
+            # Both documents were assessed before; their stored assessment replaces the LLM run
+            data = self._merge_assessment(analysis, {
+                "candidate_info": cv["candidate_info"],
+                "job_requirements": job_description["job_requirements"]
+            })
+            return {"response": agent.agent.summarize(data), "data": data, **ids}
+
+        response = await agent.process_input({
+            "cv_url": request.get("cv_url"),
+            "job_description_url": request["job_description_url"],
+            "company_website_url": request["company_website_url"],
+            "cv_text": hr_context["cv"],
+            "job_description": hr_context["job_description"],
+            "company_website": hr_context["company_website"],
+            "analysis": {key: analysis[key] for key in ("skill_match", "agenda")},
+            "instructions": "Summarize the candidate's fit and the agenda in the analysis for the interviewer"
+        }, callbacks=self._callbacks(context, agent))
+        assessment = response.get("data") or {}
+        if assessment and None not in ids.values():
+            await asyncio.to_thread(
+                self.artifact_store.put_assessment,
+                cv["candidate_id"],
+                job_description["job_description_id"],
+                assessment.get("candidate_info") or {},
+                assessment.get("job_requirements") or {}
+            )
+        return {"response": response["response"], "data": self._merge_assessment(analysis, assessment), **ids}
+
+    @staticmethod
+    def _merge_assessment(analysis: Dict[str, Any], assessment: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill the deterministic analysis with what the structured HR answer adds
+        
+        Skills, the skill match and the agenda stay as computed; the answer only
+        supplies fields the templates leave empty (name, experience, seniority, ...).
+        """
+        data = dict(analysis)
+        for key in ("candidate_info", "job_requirements"):
+            merged = dict(analysis.get(key) or {})
+            for name, value in (assessment.get(key) or {}).items():
+                if merged.get(name) in (None, "", []) and value not in (None, "", []):
+                    merged[name] = value
+            data[key] = merged
+        return data
+
+    async def _run_interviewer(self, context: Dict[str, Any], hr) -> Dict[str, Any]:
+        agent = context["agents"]["interviewer"]
+        # Served from the question bank; the LLM only writes what the bank lacks
+        questions = await agent.agent.plan_questions(hr["data"]["agenda"])
+        response = await agent.process_input({
+            "agenda": hr["data"]["agenda"],
+            "candidate_info": hr["data"]["candidate_info"],
+            "questions": [
+                {key: question.get(key) for key in ("section", "skill", "difficulty", "question")}
+                for question in questions
+            ]
+        }, callbacks=self._callbacks(context, agent))
+        # A structured plan replaces the banked list with the interviewer's ordering
+        return {"response": response["response"], "data": {"questions": questions, **(response.get("data") or {})}}
+
+    async def _update_match(self, context: Dict[str, Any], cv, job_description) -> Dict[str, Any]:
+        if self.match_matrix is None or cv["candidate_id"] is None or job_description["job_description_id"] is None:
+            return {}
+        # Profiling embeds whole documents, so it runs off the request path; a pair
+        # scored by an earlier run (or by the time this one reads) is used right away
+        self.match_matrix.schedule_candidate(
+            cv["candidate_id"], cv["text"], cv["parsed"], refresh=not cv["from_artifact_store"]
+        )
+        self.match_matrix.schedule_job_description(
+            job_description["job_description_id"],
+            job_description["page"].get("content", ""),
+            job_description["parsed"],
+            refresh=not job_description["from_artifact_store"]
+        )
+        try:
+            return await asyncio.to_thread(
+                self.match_matrix.get_match, cv["candidate_id"], job_description["job_description_id"]
+            ) or {}
+        except Exception as e:
+            # Scores are advisory; the supervisor falls back to the interview alone
+            logger.warning("Reading the match score failed: %s", e)
+            return {}
+
+    async def _run_supervisor(self, context: Dict[str, Any], hr, interviewer, match) -> Dict[str, Any]:
+        agent = context["agents"]["supervisor"]
+        response = await agent.process_input({
+            "interview_data": interviewer["data"],
+            "job_requirements": hr["data"]["job_requirements"],
+            "candidate_id": hr["candidate_id"],
+            "job_description_id": hr["job_description_id"],
+            "job_match": match,
+            "skill_match": hr["data"].get("skill_match")
+        }, callbacks=self._callbacks(context, agent))
+        return {"response": response["response"], "data": response.get("data") or {}}
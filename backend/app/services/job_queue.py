@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+from ..db.session import AsyncSessionLocal
+from .interview_repository import InterviewRepository
+from .interview_workflow import InterviewWorkflow
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue cannot accept more interview runs"""
+
+
+class InterviewJobQueue:
+    """Bounded background queue that runs interview workflows on a fixed pool of workers.
+
+    Run state is persisted on the ``Interview`` row (planned -> in_progress ->
+    completed/failed); progress events are fanned out to in-process subscribers.
+    Runs still waiting when the queue stops are marked failed, as the requests
+    themselves are not persisted.
+    """
+
+    def __init__(self, workflow: InterviewWorkflow, max_workers: int, max_pending: int):
+        self.workflow = workflow
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.repository = InterviewRepository()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._subscribers: Dict[int, List[asyncio.Queue]] = {}
+        self._in_flight = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of runs waiting for a worker"""
+        return self._queue.qsize() if self._queue else 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of runs currently being processed"""
+        return self._in_flight
+
+    async def start(self):
+        """Start the worker pool"""
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"interview-worker-{i}")
+            for i in range(self.max_workers)
+        ]
+
+    async def stop(self):
+        """Cancel the worker pool and fail the runs that never reached a worker"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while self._queue is not None and not self._queue.empty():
+            run_id, _ = self._queue.get_nowait()
+            error = "Server shut down before the run started"
+            await self._update_run(run_id, status="failed", error=error)
+            self._publish(run_id, "run_failed", {"error": error})
+
+    async def submit(self, request: Dict[str, Any]) -> int:
+        """Create a planned interview run and enqueue it, returning its run ID"""
+        if self._queue is None:
+            raise RuntimeError("Job queue has not been started")
+        if self._queue.full():
+            raise QueueFullError(f"{self.max_pending} interview runs are already waiting")
+
+        run_id = await self._create_run()
+        try:
+            self._queue.put_nowait((run_id, request))
+        except asyncio.QueueFull:
+            await self._update_run(run_id, status="failed", error="Queue is full")
+            raise QueueFullError(f"{self.max_pending} interview runs are already waiting")
+        return run_id
+
+    async def get_run(self, run_id: int, include_payload: bool = True) -> Optional[Dict[str, Any]]:
+        """Load the persisted state of a run; without the payload only status fields are read"""
+        async with AsyncSessionLocal() as db:
+            interview = await self.repository.get_interview(db, run_id, include_payload=include_payload)
+            if interview is None:
+                return None
+            run = {
+                "run_id": interview.id,
+                "status": interview.status,
+                "error": interview.error,
+                "created_at": interview.created_at,
+                "updated_at": interview.updated_at
+            }
+            if include_payload:
+                run.update(agenda=interview.agenda, responses=interview.responses)
+            return run
+
+    def subscribe(self, run_id: int) -> asyncio.Queue:
+        """Register a queue that receives progress events for a run"""
+        events = asyncio.Queue()
+        self._subscribers.setdefault(run_id, []).append(events)
+        return events
+
+    def unsubscribe(self, run_id: int, events: asyncio.Queue):
+        """Remove a progress subscriber"""
+        subscribers = self._subscribers.get(run_id, [])
+        if events in subscribers:
+            subscribers.remove(events)
+        if not subscribers:
+            self._subscribers.pop(run_id, None)
+
+    def _publish(self, run_id: int, event: str, data: Dict[str, Any]):
+        for events in self._subscribers.get(run_id, []):
+            events.put_nowait({"event": event, "run_id": run_id, **data})
+
+    async def _worker(self):
+        while True:
+            run_id, request = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._process(run_id, request)
+            except asyncio.CancelledError:
+                # Published first: subscribers must hear of it even if the update is cut short
+                self._publish(run_id, "run_failed", {"error": "Run was cancelled"})
+                await asyncio.shield(self._update_run(run_id, status="failed", error="Run was cancelled"))
+                raise
+            except Exception as e:
+                logger.exception("Interview run %s failed", run_id)
+                await self._update_run(run_id, status="failed", error=str(e))
+                self._publish(run_id, "run_failed", {"error": str(e)})
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def _process(self, run_id: int, request: Dict[str, Any]):
+        await self._update_run(run_id, status="in_progress")
+        self._publish(run_id, "run_started", {})
+
+        async def on_event(event: str, stage: str, details: Dict[str, Any]):
+            self._publish(run_id, event, {"stage": stage, **details})
+
+        result = await self.workflow.run(request, on_event=on_event, session_id=f"interview-{run_id}")
+        responses = InterviewWorkflow.agent_responses(result)
+        await self._update_run(
+            run_id,
+            status="completed",
+            candidate_id=result.outputs["hr"]["candidate_id"],
+            job_description_id=result.outputs["hr"]["job_description_id"],
+            agenda=result.outputs["hr"]["data"].get("agenda"),
+            questions=result.outputs["interviewer"]["data"].get("questions"),
+            feedback=result.outputs["supervisor"]["data"],
+            responses=responses
+        )
+        self._publish(run_id, "run_completed", {"responses": responses, "timings": result.timings})
+
+    async def _create_run(self) -> int:
+        async with AsyncSessionLocal() as db:
+            return await self.repository.create_interview(db, status="planned")
+
+    async def _update_run(self, run_id: int, **fields):
+        async with AsyncSessionLocal() as db:
+            await self.repository.update_interview(db, run_id, **fields)
+
@@ -0,0 +1,263 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from langchain.schema.cache import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+from ..core.config import settings
+
+NEAR_HIT_CANDIDATES = 20
+
+
+class MemoryCacheBackend:
+    """In-process LRU store with per-entry expiry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, ttl: float) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if ttl and time.time() - stored_at > ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> int:
+        """Store a value and return the number of evicted entries"""
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """SQLite store shared across processes, evicting least recently used rows
+
+    The row count is only checked every ``evict_every`` inserts (a tenth of
+    ``max_entries`` by default, at most 100), so the table can briefly run that
+    far over ``max_entries`` instead of paying for a COUNT(*) on every insert.
+    """
+
+    def __init__(self, path: str, max_entries: int, table: str = "llm_cache", evict_every: Optional[int] = None):
+        self.max_entries = max_entries
+        self.table = table
+        self.evict_every = evict_every or min(100, max(1, max_entries // 10))
+        self._inserts = 0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_accessed_at ON {table} (accessed_at)")
+
+    def get(self, key: str, ttl: float) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if ttl and now - stored_at > ttl:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str) -> int:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._inserts += 1
+            if self._inserts < self.evict_every:
+                return 0
+            self._inserts = 0
+            overflow = len(self) - self.max_entries
+            if overflow <= 0:
+                return 0
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+            return overflow
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class LLMCache(BaseCache):
+    """Content-addressed cache for chat model generations.
+
+    Exact hits are keyed on a hash of the serialized model configuration (model,
+    temperature and any bound function/tool schemas) and the rendered prompt. When a
+    vector store and embedding model are given, misses fall back to a near-hit lookup
+    on prompt embeddings for the same model configuration.
+    """
+
+    def __init__(
+        self,
+        backend,
+        ttl: float = 0,
+        vector_store=None,
+        embeddings=None,
+        similarity_threshold: float = 0.97
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.vector_store = vector_store
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self._stats = {"hits": 0, "near_hits": 0, "misses": 0, "evictions": 0}
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def _hash(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    @property
+    def semantic(self) -> bool:
+        return self.vector_store is not None and self.embeddings is not None
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Look up generations for a prompt and model configuration"""
+        value = self.backend.get(self._hash(llm_string, prompt), self.ttl)
+        if value is None and self.semantic:
+            value = self._near_hit(prompt, llm_string)
+            if value is not None:
+                self._count("near_hits")
+                return loads(value)
+        if value is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return loads(value)
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """``lookup`` in a worker thread, off the event loop"""
+        return await asyncio.to_thread(self.lookup, prompt, llm_string)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store generations for a prompt and model configuration"""
+        key = self._hash(llm_string, prompt)
+        self._count("evictions", self.backend.set(key, dumps(list(return_val))))
+        if self.semantic:
+            self.vector_store.add_document(
+                text=prompt,
+                embedding=self.embeddings.embed_query(prompt),
+                metadata={
+                    "type": "llm_cache",
+                    "llm_key": self._hash(llm_string),
+                    "cache_key": key,
+                    "timestamp": int(time.time() * 1000)
+                }
+            )
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """``update`` in a worker thread, off the event loop"""
+        await asyncio.to_thread(self.update, prompt, llm_string, return_val)
+
+    def _near_hit(self, prompt: str, llm_string: str) -> Optional[str]:
+        # OpenSearch applies the filter to the k nearest prompts of any model, so
+        # over-fetch and keep the closest one cached for this configuration
+        llm_key = self._hash(llm_string)
+        matches = self.vector_store.search_similar(
+            self.embeddings.embed_query(prompt),
+            k=NEAR_HIT_CANDIDATES,
+            metadata_filter={"type": "llm_cache", "llm_key": llm_key}
+        )
+        for match in matches:
+            if match["score"] < self.similarity_threshold:
+                break
+            if match["metadata"].get("llm_key") != llm_key:
+                continue
+            value = self.backend.get(match["metadata"]["cache_key"], self.ttl)
+            if value is not None:
+                return value
+        return None
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove all cached generations"""
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current cache size"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["near_hits"] + stats["misses"]
+        stats["entries"] = len(self.backend)
+        stats["hit_rate"] = (stats["hits"] + stats["near_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+def build_llm_cache() -> Optional[LLMCache]:
+    """Create the LLM cache configured in settings, or None if caching is disabled"""
+    if settings.LLM_CACHE_BACKEND == "memory":
+        backend = MemoryCacheBackend(settings.LLM_CACHE_MAX_ENTRIES)
+    elif settings.LLM_CACHE_BACKEND == "sqlite":
+        backend = SQLiteCacheBackend(settings.LLM_CACHE_SQLITE_PATH, settings.LLM_CACHE_MAX_ENTRIES)
+    elif settings.LLM_CACHE_BACKEND == "none":
+        return None
+    else:
+        raise ValueError(f"Unknown LLM cache backend '{settings.LLM_CACHE_BACKEND}'")
+
+    vector_store = embeddings = None
+    if settings.LLM_CACHE_SEMANTIC:
+        from .embedding_service import build_embedding_pipeline
+        from .vector_store import VectorStore
+        vector_store = VectorStore()
+        embeddings = build_embedding_pipeline()
+
+    return LLMCache(
+        backend,
+        ttl=settings.LLM_CACHE_TTL,
+        vector_store=vector_store,
+        embeddings=embeddings,
+        similarity_threshold=settings.LLM_CACHE_SEMANTIC_THRESHOLD
+    )
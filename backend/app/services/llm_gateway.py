@@ -0,0 +1,317 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+import openai
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+# Lower goes first when the budget runs short: the verdict, then extraction, summaries last
+ROUTE_PRIORITIES = {"supervisor": 0, "hr": 1, "interviewer": 1, "question_generation": 2, "summary": 3}
+DEFAULT_PRIORITY = 1
+
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+def parse_model_routes(value: str) -> Dict[str, str]:
+    """Parse ``route=model`` pairs separated by commas"""
+    routes = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        route, _, model = entry.partition("=")
+        if not route.strip() or not model.strip():
+            raise ValueError(f"Invalid LLM model route '{entry.strip()}'")
+        routes[route.strip()] = model.strip()
+    return routes
+
+
+class TokenBucket:
+    """A per-minute budget refilled continuously, holding at most one minute's worth"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` is available; larger-than-capacity requests wait for a full bucket"""
+        self._refill(now)
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount: float, now: float):
+        self._refill(now)
+        self.level = min(self.capacity, self.level - amount)
+
+
+class RateLimiter:
+    """Global requests- and tokens-per-minute budget, granted in priority order.
+
+    Waiters queue by (priority, arrival) and the head of the queue is granted as
+    soon as both buckets cover it. Nothing overtakes the head, so a stream of
+    cheap low-priority calls cannot starve a large high-priority one. A 429 from
+    the API pauses all grants until its retry-after has passed.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int], tokens_per_minute: Optional[int]):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _wait(self, tokens: int, now: float) -> float:
+        return max(
+            self._paused_until - now,
+            self.requests.wait(1, now) if self.requests else 0.0,
+            self.tokens.wait(tokens, now) if self.tokens else 0.0
+        )
+
+    def _take(self, tokens: int, now: float):
+        if self.requests:
+            self.requests.take(1, now)
+        if self.tokens:
+            self.tokens.take(tokens, now)
+
+    def _dispatch(self):
+        with self._lock:
+            now = time.monotonic()
+            while self._waiters:
+                _, _, tokens, future = self._waiters[0]
+                if future.done():
+                    # Cancelled while queued
+                    heapq.heappop(self._waiters)
+                    continue
+                wait = self._wait(tokens, now)
+                if wait > 0:
+                    if self._timer is not None:
+                        self._timer.cancel()
+                    self._timer = future.get_loop().call_later(wait, self._dispatch)
+                    return
+                heapq.heappop(self._waiters)
+                self._take(tokens, now)
+                future.set_result(None)
+
+    async def acquire(self, tokens: int, priority: int = DEFAULT_PRIORITY):
+        """Wait for budget for one request of about ``tokens`` tokens"""
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            heapq.heappush(self._waiters, (priority, next(self._sequence), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            self._dispatch()
+            raise
+
+    def acquire_blocking(self, tokens: int):
+        """Synchronous ``acquire``; yields to queued async callers"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._wait(tokens, now)
+                if wait <= 0 and not self._waiters:
+                    self._take(tokens, now)
+                    return
+            time.sleep(min(max(wait, 0.05), 1.0))
+
+    def settle(self, estimated: int, actual: int):
+        """Charge (or refund) the difference between a request's estimated and actual tokens"""
+        if self.tokens:
+            with self._lock:
+                self.tokens.take(actual - estimated, time.monotonic())
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    @property
+    def depth(self) -> int:
+        return len(self._waiters)
+
+
+class LLMGateway:
+    """Shared front door for chat completion calls.
+
+    Every call waits for the global rate budget (by route priority), identical
+    non-streaming calls already in flight are coalesced into one API request, and
+    rate-limit, connection and 5xx errors are retried with full-jitter exponential
+    backoff (or the server's retry-after, which also pauses other callers).
+    """
+
+    def __init__(
+        self,
+        client: openai.OpenAI,
+        async_client: openai.AsyncOpenAI,
+        limiter: Optional[RateLimiter] = None,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        completion_tokens: int = 512
+    ):
+        self.client = client
+        self.async_client = async_client
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.completion_tokens = completion_tokens
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "coalesced": 0, "retries": 0, "rate_limited": 0, "failed": 0, "queued_ms": 0.0}
+
+    def completions(self, route: Optional[str] = None) -> "GatewayCompletions":
+        return GatewayCompletions(self, route)
+
+    def async_completions(self, route: Optional[str] = None) -> "AsyncGatewayCompletions":
+        return AsyncGatewayCompletions(self, route)
+
+    def _count(self, name: str, amount: float = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def estimate_tokens(self, params: Dict[str, Any]) -> int:
+        prompt = json.dumps(params.get("messages", []), default=str)
+        return len(prompt) // CHARS_PER_TOKEN + (params.get("max_tokens") or self.completion_tokens)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying ``error``, or None to give up"""
+        if attempt >= self.max_retries or getattr(error, "code", None) == "insufficient_quota":
+            return None
+        retry_after = 0.0
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("retry-after") or 0)
+            except ValueError:
+                pass
+        # Full jitter spreads out the retries of requests that failed together
+        delay = max(retry_after, random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+        if isinstance(error, openai.RateLimitError):
+            self._count("rate_limited")
+            if self.limiter is not None:
+                self.limiter.pause(delay)
+        self._count("retries")
+        logger.info("LLM request failed (%s), retrying in %.2fs", type(error).__name__, delay)
+        return delay
+
+    def _settle(self, estimated: int, response: Any):
+        usage = getattr(response, "usage", None)
+        if self.limiter is not None and usage is not None:
+            self.limiter.settle(estimated, usage.total_tokens)
+
+    def create(self, route: Optional[str], params: Dict[str, Any]) -> Any:
+        """Synchronous chat completion through the gateway (not coalesced)"""
+        estimated = self.estimate_tokens(params)
+        for attempt in itertools.count():
+            if self.limiter is not None:
+                started = time.monotonic()
+                self.limiter.acquire_blocking(estimated)
+                self._count("queued_ms", (time.monotonic() - started) * 1000)
+            self._count("requests")
+            try:
+                response = self.client.chat.completions.create(**params)
+            except RETRYABLE_ERRORS as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    self._count("failed")
+                    raise
+                time.sleep(delay)
+                continue
+            self._settle(estimated, response)
+            return response
+
+    async def _acreate(self, priority: int, params: Dict[str, Any]) -> Any:
+        estimated = self.estimate_tokens(params)
+        for attempt in itertools.count():
+            if self.limiter is not None:
+                started = time.monotonic()
+                await self.limiter.acquire(estimated, priority)
+                self._count("queued_ms", (time.monotonic() - started) * 1000)
+            self._count("requests")
+            try:
+                response = await self.async_client.chat.completions.create(**params)
+            except RETRYABLE_ERRORS as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    self._count("failed")
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._settle(estimated, response)
+            return response
+
+    async def acreate(self, route: Optional[str], params: Dict[str, Any]) -> Any:
+        """Chat completion through the gateway; identical in-flight calls share one request"""
+        priority = ROUTE_PRIORITIES.get(route, DEFAULT_PRIORITY)
+        if params.get("stream"):
+            return await self._acreate(priority, params)
+        key = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._count("coalesced")
+        else:
+            pending = self._inflight[key] = asyncio.ensure_future(self._acreate(priority, params))
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["in_flight"] = len(self._inflight)
+        stats["queued"] = self.limiter.depth if self.limiter is not None else 0
+        return stats
+
+
+class GatewayCompletions:
+    """Stand-in for ``OpenAI().chat.completions`` that sends calls through a gateway"""
+
+    def __init__(self, gateway: LLMGateway, route: Optional[str]):
+        self.gateway = gateway
+        self.route = route
+
+    def create(self, **params) -> Any:
+        return self.gateway.create(self.route, params)
+
+
+class AsyncGatewayCompletions:
+    """Stand-in for ``AsyncOpenAI().chat.completions`` that sends calls through a gateway"""
+
+    def __init__(self, gateway: LLMGateway, route: Optional[str]):
+        self.gateway = gateway
+        self.route = route
+
+    async def create(self, **params) -> Any:
+        return await self.gateway.acreate(self.route, params)
+
+
+def build_llm_gateway(client: openai.OpenAI, async_client: openai.AsyncOpenAI) -> Optional[LLMGateway]:
+    """Create the LLM gateway configured in settings, or None when disabled"""
+    if not settings.LLM_GATEWAY_ENABLED:
+        return None
+    return LLMGateway(
+        client,
+        async_client,
+        # The limiter also spreads out retries after a 429, so it exists even without budgets
+        limiter=RateLimiter(settings.LLM_REQUESTS_PER_MINUTE, settings.LLM_TOKENS_PER_MINUTE),
+        max_retries=settings.LLM_MAX_RETRIES,
+        base_delay=settings.LLM_RETRY_BASE_DELAY,
+        max_delay=settings.LLM_RETRY_MAX_DELAY,
+        completion_tokens=settings.LLM_COMPLETION_TOKEN_ESTIMATE
+    )
@@ -0,0 +1,268 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.dialects import postgresql, sqlite
+from ..db.session import SessionLocal
+from ..models.interview import Candidate, CandidateJobMatch, MatchProfile
+from .embedding_service import EmbeddingPipeline
+
+CANDIDATE = "candidate"
+JOB_DESCRIPTION = "job_description"
+PROFILE_PAGE_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class MatchMatrix:
+    """Precomputed candidate x job description similarity scores.
+
+    Every CV and job description is reduced to a small profile: one unit vector for
+    the whole document and one per matched section (CV skills against JD
+    requirements, CV experience against JD responsibilities). When a new document
+    arrives its profile is scored against the profiles of the other kind, a page of
+    them per matrix product, and the pair scores are upserted into
+    ``candidate_job_matches``, so ranking candidates for a job is an indexed read.
+    The ``schedule_*`` methods do this in a background task for request paths.
+    """
+
+    # name, candidate section, job description section, weight
+    PAIRS = [
+        ("overall", "document", "document", 0.5),
+        ("skills", "skills", "requirements", 0.3),
+        ("experience", "experience", "responsibilities", 0.2),
+    ]
+
+    def __init__(self, embeddings: EmbeddingPipeline, page_size: int = PROFILE_PAGE_SIZE):
+        self.embeddings = embeddings
+        self.page_size = page_size
+        self._tasks: Dict[Tuple[str, int], asyncio.Task] = {}
+
+    @property
+    def model(self) -> str:
+        return self.embeddings.model.name
+
+    @staticmethod
+    def _section_text(value: Any) -> str:
+        if isinstance(value, (list, tuple)):
+            return "\n".join(str(item) for item in value)
+        return str(value or "")
+
+    def _sides(self, kind: str) -> List[str]:
+        column = 1 if kind == CANDIDATE else 2
+        return [pair[column] for pair in self.PAIRS]
+
+    async def _profile(self, kind: str, text: str, parsed: Dict[str, Any]) -> np.ndarray:
+        """One normalized mean chunk embedding per profile section; empty sections are zero"""
+        sections = parsed.get("sections", parsed) if kind == CANDIDATE else parsed
+        texts = [text if name == "document" else self._section_text(sections.get(name)) for name in self._sides(kind)]
+        profile = np.zeros((len(texts), self.embeddings.model.dimension), dtype=np.float32)
+        for row, section_text in enumerate(texts):
+            chunks = self.embeddings.chunk_text(section_text, self.embeddings.chunk_size, self.embeddings.chunk_overlap)
+            if not chunks:
+                continue
+            mean = (await self.embeddings.aembed_vectors([chunk.text for chunk in chunks])).mean(axis=0)
+            norm = np.linalg.norm(mean)
+            if norm > 0:
+                profile[row] = mean / norm
+        return profile
+
+    def _pages(self, kind: str) -> Iterator[Tuple[List[int], np.ndarray]]:
+        """Stored profiles of one kind for the current model, ``page_size`` at a time"""
+        shape = (len(self.PAIRS), self.embeddings.model.dimension)
+        after = 0
+        while True:
+            with SessionLocal() as db:
+                page = db.query(MatchProfile.id, MatchProfile.owner_id, MatchProfile.vectors).filter(
+                    MatchProfile.kind == kind,
+                    MatchProfile.model == self.model,
+                    MatchProfile.id > after
+                ).order_by(MatchProfile.id).limit(self.page_size).all()
+            if not page:
+                return
+            after = page[-1][0]
+            vectors = np.stack([np.frombuffer(blob, dtype=np.float32).reshape(shape) for _, _, blob in page])
+            yield [owner_id for _, owner_id, _ in page], vectors
+
+    def _scores(self, profile: np.ndarray, others: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Weighted and per-section cosine scores of a profile against stacked profiles"""
+        section_scores = np.einsum("sd,nsd->ns", profile, others)
+        weights = np.array([pair[3] for pair in self.PAIRS], dtype=np.float32)
+        # Sections missing on either side drop out of the weighted mean
+        present = (np.abs(profile).sum(axis=1) > 0)[None, :] & (np.abs(others).sum(axis=2) > 0)
+        weighted = (section_scores * weights * present).sum(axis=1)
+        total = (weights * present).sum(axis=1)
+        return np.where(total > 0, weighted / np.where(total > 0, total, 1), 0.0), section_scores
+
+    @staticmethod
+    def _upsert(db, model, rows: List[Dict[str, Any]], keys: List[str]):
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(model)
+        columns = [name for name in rows[0] if name not in keys and name != "created_at"]
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=keys, set_={name: statement.excluded[name] for name in columns}
+            ),
+            rows
+        )
+
+    def _update(self, kind: str, owner_id: int, profile: np.ndarray):
+        # The profile is committed before the other side is read, so of two documents
+        # arriving together the later reader always sees the other and scores the pair
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            self._upsert(db, MatchProfile, [{
+                "kind": kind, "owner_id": owner_id, "model": self.model,
+                "vectors": profile.tobytes(), "created_at": now, "updated_at": now
+            }], ["kind", "owner_id"])
+            db.commit()
+
+        other = JOB_DESCRIPTION if kind == CANDIDATE else CANDIDATE
+        rows = []
+        for other_ids, others in self._pages(other):
+            scores, section_scores = self._scores(profile, others)
+            rows.extend(
+                {
+                    "candidate_id": owner_id if kind == CANDIDATE else other_id,
+                    "job_description_id": other_id if kind == CANDIDATE else owner_id,
+                    "score": float(score),
+                    "section_scores": {pair[0]: round(float(value), 4) for pair, value in zip(self.PAIRS, sections)},
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for other_id, score, sections in zip(other_ids, scores, section_scores)
+            )
+        if rows:
+            with SessionLocal() as db:
+                for start in range(0, len(rows), self.page_size):
+                    self._upsert(
+                        db, CandidateJobMatch, rows[start:start + self.page_size], ["candidate_id", "job_description_id"]
+                    )
+                db.commit()
+
+    def _has_profile(self, kind: str, owner_id: int) -> bool:
+        with SessionLocal() as db:
+            return db.query(MatchProfile.id).filter(
+                MatchProfile.kind == kind,
+                MatchProfile.owner_id == owner_id,
+                MatchProfile.model == self.model
+            ).first() is not None
+
+    async def _ensure(self, kind: str, owner_id: Optional[int], text: str, parsed: Dict[str, Any], refresh: bool) -> bool:
+        if owner_id is None:
+            return False
+        if not refresh and await asyncio.to_thread(self._has_profile, kind, owner_id):
+            return False
+        profile = await self._profile(kind, text or "", parsed or {})
+        await asyncio.to_thread(self._update, kind, owner_id, profile)
+        return True
+
+    async def ensure_candidate(
+        self,
+        candidate_id: Optional[int],
+        text: str,
+        parsed: Dict[str, Any],
+        refresh: bool = False
+    ) -> bool:
+        """Score a candidate against every job description unless already scored
+
+        Pass ``refresh=True`` when the CV was (re)parsed so stale scores are replaced.
+        """
+        return await self._ensure(CANDIDATE, candidate_id, text, parsed, refresh)
+
+    async def ensure_job_description(
+        self,
+        job_description_id: Optional[int],
+        text: str,
+        parsed: Dict[str, Any],
+        refresh: bool = False
+    ) -> bool:
+        """Score a job description against every candidate unless already scored"""
+        return await self._ensure(JOB_DESCRIPTION, job_description_id, text, parsed, refresh)
+
+    def schedule_candidate(self, candidate_id: Optional[int], text: str, parsed: Dict[str, Any], refresh: bool = False):
+        """``ensure_candidate`` as a background task, so requests do not wait on the embeddings"""
+        self._schedule(CANDIDATE, candidate_id, text, parsed, refresh)
+
+    def schedule_job_description(
+        self,
+        job_description_id: Optional[int],
+        text: str,
+        parsed: Dict[str, Any],
+        refresh: bool = False
+    ):
+        """``ensure_job_description`` as a background task"""
+        self._schedule(JOB_DESCRIPTION, job_description_id, text, parsed, refresh)
+
+    def _schedule(self, kind: str, owner_id: Optional[int], text: str, parsed: Dict[str, Any], refresh: bool):
+        if owner_id is None or (kind, owner_id) in self._tasks:
+            return
+        task = asyncio.create_task(self._ensure_logged(kind, owner_id, text, parsed, refresh))
+        self._tasks[(kind, owner_id)] = task
+        task.add_done_callback(lambda _: self._tasks.pop((kind, owner_id), None))
+
+    async def _ensure_logged(self, kind: str, owner_id: int, text: str, parsed: Dict[str, Any], refresh: bool):
+        try:
+            await self._ensure(kind, owner_id, text, parsed, refresh)
+        except Exception as e:
+            # Scores are advisory; the next document of either kind retries the pair
+            logger.warning("Match scoring failed for %s %s: %s", kind, owner_id, e)
+
+    @property
+    def pending(self) -> int:
+        """Number of background scoring tasks still running"""
+        return len(self._tasks)
+
+    async def close(self):
+        """Cancel the background scoring tasks"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def top_candidates(self, job_description_id: int, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """Best-matching candidates for a job description, highest score first"""
+        with SessionLocal() as db:
+            query = db.query(CandidateJobMatch).filter(CandidateJobMatch.job_description_id == job_description_id)
+            total = query.count()
+            matches = query.join(Candidate, Candidate.id == CandidateJobMatch.candidate_id).with_entities(
+                CandidateJobMatch.candidate_id,
+                Candidate.name,
+                Candidate.email,
+                CandidateJobMatch.score,
+                CandidateJobMatch.section_scores
+            ).order_by(CandidateJobMatch.score.desc(), CandidateJobMatch.candidate_id).offset(offset).limit(limit).all()
+        return {
+            "job_description_id": job_description_id,
+            "total": total,
+            "candidates": [
+                {
+                    "candidate_id": candidate_id,
+                    "name": name,
+                    "email": email,
+                    "score": score,
+                    "section_scores": section_scores
+                }
+                for candidate_id, name, email, score, section_scores in matches
+            ]
+        }
+
+    def get_match(self, candidate_id: int, job_description_id: int) -> Optional[Dict[str, Any]]:
+        """Stored score of one pair, with the candidate's rank among all candidates for the job"""
+        with SessionLocal() as db:
+            match = db.query(CandidateJobMatch).filter(
+                CandidateJobMatch.candidate_id == candidate_id,
+                CandidateJobMatch.job_description_id == job_description_id
+            ).first()
+            if match is None:
+                return None
+            candidates = db.query(CandidateJobMatch).filter(CandidateJobMatch.job_description_id == job_description_id)
+            return {
+                "candidate_id": candidate_id,
+                "job_description_id": job_description_id,
+                "score": match.score,
+                "section_scores": match.section_scores,
+                "rank": candidates.filter(CandidateJobMatch.score > match.score).count() + 1,
+                "total": candidates.count()
+            }
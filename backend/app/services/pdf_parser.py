@@ -1,18 +1,187 @@
 from PyPDF2 import PdfReader
-from typing import Dict, Any
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import ExitStack
+from typing import Dict, Any, Iterator, List, Optional, Union, BinaryIO
+import io
+import mmap
+import os
 import re
+import shutil
+import tempfile
+import time
+from .section_segmenter import SectionSegmenter, SectionSpan, CV_SECTION_HEADERS
+from ..core.config import settings
+from ..core.telemetry import span, traced
+
+PDFSource = Union[str, bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+
+class PDFLimitExceeded(Exception):
+    """Raised when a PDF exceeds the configured page, size or time budget"""
+
+def _extract_page_range(
+    path: str,
+    start: int,
+    stop: int,
+    deadline: Optional[float] = None,
+    timeout: Optional[float] = None
+) -> List[str]:
+    """Extract the text of pages [start, stop) in a worker process, stopping at the wall-clock deadline"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        reader = PdfReader(mapped)
+        pages = []
+        for index in range(start, stop):
+            if deadline and time.time() > deadline:
+                raise PDFLimitExceeded(f"PDF extraction exceeded {timeout} seconds")
+            pages.append(reader.pages[index].extract_text() or "")
+        return pages
 
 class PDFParser:
+    # Bump whenever parse_cv_content or extract_text_from_pdf output changes to invalidate stored artifacts
+    PARSER_VERSION = "3"
+    _segmenter: Optional[SectionSegmenter] = None
+    _pool: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def get_segmenter(cls) -> SectionSegmenter:
+        """Get the CV section segmenter for the configured header languages"""
+        if cls._segmenter is None:
+            cls._segmenter = SectionSegmenter.for_languages(
+                CV_SECTION_HEADERS,
+                [language.strip() for language in settings.SECTION_HEADER_LANGUAGES.split(",")]
+            )
+        return cls._segmenter
+
+    @staticmethod
+    def segment_cv(text: str) -> List[SectionSpan]:
+        """Find CV sections as offsets into the text"""
+        return PDFParser.get_segmenter().segment(text)
+
+    @classmethod
+    def get_pool(cls) -> ProcessPoolExecutor:
+        """Get the shared process pool used for page-parallel extraction"""
+        if cls._pool is None:
+            cls._pool = ProcessPoolExecutor(max_workers=settings.PDF_EXTRACTION_WORKERS)
+        return cls._pool
+
+    @classmethod
+    def shutdown_pool(cls):
+        """Shut down the page extraction process pool"""
+        if cls._pool is not None:
+            cls._pool.shutdown(cancel_futures=True)
+            cls._pool = None
+
+    @staticmethod
+    def _source_size(source: PDFSource) -> Optional[int]:
+        if isinstance(source, str):
+            return os.path.getsize(source)
+        if isinstance(source, (bytes, bytearray, mmap.mmap)):
+            return len(source)
+        if isinstance(source, memoryview):
+            return source.nbytes
+        try:
+            position = source.tell()
+            size = source.seek(0, os.SEEK_END)
+            source.seek(position)
+            return size
+        except (AttributeError, OSError):
+            return None
+
+    @staticmethod
+    def _open_reader(source: PDFSource, stack: ExitStack) -> PdfReader:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return PdfReader(io.BytesIO(source))
+        if isinstance(source, str):
+            # Map the file rather than let PdfReader read it into memory
+            f = stack.enter_context(open(source, "rb"))
+            source = stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        # File objects and mmap objects can be read in place
+        return PdfReader(source)
+
+    @staticmethod
+    def _spill(source: PDFSource, stack: ExitStack) -> str:
+        """Write an in-memory source to a temporary file once, for pool workers to open"""
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        stack.callback(os.remove, path)
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+                f.write(source)
+            else:
+                source.seek(0)
+                shutil.copyfileobj(source, f)
+        return path
+
+    @staticmethod
+    def iter_pages(
+        source: PDFSource,
+        max_pages: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        """Yield the text of each page of a PDF, enforcing page, size and time budgets
+        
+        ``source`` can be a path, bytes, a memory-mapped file or a binary file object.
+        Large documents are extracted in the shared process pool, in page order.
+        """
+        max_pages = settings.PDF_MAX_PAGES if max_pages is None else max_pages
+        max_bytes = settings.PDF_MAX_BYTES if max_bytes is None else max_bytes
+        timeout = settings.PDF_EXTRACTION_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout if timeout else None
+        
+        size = PDFParser._source_size(source)
+        if max_bytes and size is not None and size > max_bytes:
+            raise PDFLimitExceeded(f"PDF is {size} bytes, the limit is {max_bytes}")
+        
+        with ExitStack() as stack:
+            reader = PDFParser._open_reader(source, stack)
+            page_count = len(reader.pages)
+            if max_pages and page_count > max_pages:
+                raise PDFLimitExceeded(f"PDF has {page_count} pages, the limit is {max_pages}")
+
+            if page_count < settings.PDF_PARALLEL_MIN_PAGES or settings.PDF_EXTRACTION_WORKERS < 2:
+                for page in reader.pages:
+                    if deadline and time.monotonic() > deadline:
+                        raise PDFLimitExceeded(f"PDF extraction exceeded {timeout} seconds")
+                    yield page.extract_text() or ""
+                return
+
+            # Workers open the document by path themselves instead of receiving a
+            # pickled copy per chunk; in-memory sources are written to disk once
+            path = source if isinstance(source, str) else PDFParser._spill(source, stack)
+            # Workers stop at the deadline themselves (wall clock, shared across processes)
+            worker_deadline = time.time() + timeout if timeout else None
+            chunk_size = max(1, -(-page_count // settings.PDF_EXTRACTION_WORKERS))
+            pool = PDFParser.get_pool()
+            futures = [
+                pool.submit(
+                    _extract_page_range, path, start, min(start + chunk_size, page_count), worker_deadline, timeout
+                )
+                for start in range(0, page_count, chunk_size)
+            ]
+            try:
+                for future in futures:
+                    remaining = deadline - time.monotonic() if deadline else None
+                    if remaining is not None and remaining <= 0:
+                        raise PDFLimitExceeded(f"PDF extraction exceeded {timeout} seconds")
+                    try:
+                        pages = future.result(timeout=remaining)
+                    except FutureTimeoutError:
+                        raise PDFLimitExceeded(f"PDF extraction exceeded {timeout} seconds")
+                    yield from pages
+            finally:
+                # Chunks not started yet are dropped; running ones end at their deadline
+                for future in futures:
+                    future.cancel()
+
     @staticmethod
-    def extract_text_from_pdf(file_path: str) -> str:
-        """Extract text content from a PDF file"""
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
+    def extract_text_from_pdf(file_path: PDFSource, **limits) -> str:
+        """Extract text content from a PDF file, bytes or memory-mapped file"""
+        with span("pdf.extract_text") as attributes:
+            pages = list(PDFParser.iter_pages(file_path, **limits))
+            attributes["pages"] = len(pages)
+        return "\n".join(pages)
 
     @staticmethod
+    @traced("pdf.parse_cv")
     def parse_cv_content(text: str) -> Dict[str, Any]:
         """Parse CV content and extract structured information"""
         # Extract contact information
@@ -26,40 +195,8 @@ class PDFParser:
         linkedin = re.findall(linkedin_pattern, text)
         github = re.findall(github_pattern, text)
         
-        # Extract sections using common CV section headers
-        sections = {
-            "education": [],
-            "experience": [],
-            "skills": [],
-            "projects": []
-        }
-        
-        # Simple section detection
-        section_patterns = {
-            "education": r"(?i)(education|academic background|qualifications)",
-            "experience": r"(?i)(experience|work history|employment)",
-            "skills": r"(?i)(skills|technical skills|competencies)",
-            "projects": r"(?i)(projects|portfolio|work samples)"
-        }
-        
-        for section, pattern in section_patterns.items():
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                start = match.end()
-                next_section = None
-                for other_section, other_pattern in section_patterns.items():
-                    if other_section != section:
-                        next_match = re.search(other_pattern, text[start:])
-                        if next_match:
-                            if next_section is None or next_match.start() < next_section[1]:
-                                next_section = (other_section, next_match.start())
-                
-                if next_section:
-                    section_text = text[start:start + next_section[1]]
-                else:
-                    section_text = text[start:]
-                
-                sections[section].append(section_text.strip())
+        # Extract sections in a single pass over the text
+        sections = PDFParser.get_segmenter().extract(text)
         
         return {
             "contact_info": {
@@ -0,0 +1,347 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import insert
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.interview import BankQuestion
+from .embedding_service import EmbeddingPipeline, build_embedding_pipeline
+from .skill_taxonomy import SkillTaxonomy
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+GENERATION_PROMPT = """Write {count} distinct {difficulty} technical interview questions about {topic}.
+Do not repeat or rephrase these questions:
+{avoid}
+
+Answer with a JSON array only. Each item has "question", "expected_answer" and
+"follow_up_questions" (a list of strings)."""
+
+
+def normalize_difficulty(difficulty: Optional[str]) -> str:
+    difficulty = (difficulty or "").strip().lower()
+    return difficulty if difficulty in DIFFICULTIES else "medium"
+
+
+def normalize_topic(topic: str) -> str:
+    """Canonical skill name for a topic the taxonomy knows, else the lowercased topic"""
+    skills = SkillTaxonomy.get().extract(topic or "")
+    return skills[0] if len(skills) == 1 else " ".join((topic or "").lower().split())[:100]
+
+
+async def generate_with_llm(
+    llm,
+    topic: str,
+    difficulty: str,
+    count: int,
+    avoid: Iterable[str] = ()
+) -> List[Dict[str, Any]]:
+    """Ask the LLM for new questions; unparseable output yields none"""
+    prompt = GENERATION_PROMPT.format(
+        count=count,
+        difficulty=difficulty,
+        topic=topic,
+        avoid="\n".join(f"- {question}" for question in avoid) or "(none)"
+    )
+    output = await llm.apredict(prompt)
+    try:
+        items = json.loads(output[output.index("["):output.rindex("]") + 1])
+    except ValueError:
+        logger.warning("Could not parse generated questions for '%s'", topic)
+        return []
+    return [
+        {
+            "topic": topic,
+            "difficulty": difficulty,
+            "question": str(item["question"]).strip(),
+            "expected_answer": str(item.get("expected_answer") or ""),
+            "follow_up_questions": [str(question) for question in item.get("follow_up_questions") or []]
+        }
+        for item in items
+        if isinstance(item, dict) and item.get("question")
+    ][:count]
+
+
+class QuestionBank:
+    """Interview questions indexed by topic/difficulty and by embedding.
+
+    The whole bank is held in memory as a matrix of unit vectors plus a
+    (topic, difficulty) -> rows index, so serving questions is a dictionary lookup
+    and a small matrix product. Selection drops near-duplicates and picks by
+    maximal marginal relevance, so a topic's questions do not all ask the same
+    thing. Topics with too few banked questions borrow the closest questions of
+    the same difficulty; only what is still missing is generated by the LLM, and
+    generated questions are written back to the bank.
+
+    Loading and inserting are serialized by a write lock held across the
+    database I/O; the lock guarding the in-memory index is only held while it is
+    read or appended to, so searches never wait on the database.
+    """
+
+    def __init__(
+        self,
+        embeddings: EmbeddingPipeline,
+        dedup_threshold: float = 0.9,
+        diversity: float = 0.3,
+        related_threshold: float = 0.75
+    ):
+        self.embeddings = embeddings
+        self.dedup_threshold = dedup_threshold
+        self.diversity = diversity
+        self.related_threshold = related_threshold
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._loaded = False
+        self._generated = 0
+        self._questions: List[Dict[str, Any]] = []
+        self._vectors = np.zeros((16, embeddings.model.dimension), dtype=np.float32)
+        self._index: Dict[Tuple[str, str], List[int]] = {}
+        self._hashes: Dict[str, int] = {}
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    @property
+    def model(self) -> str:
+        return self.embeddings.model.name
+
+    @staticmethod
+    def content_hash(topic: str, difficulty: str, question: str) -> str:
+        text = "\n".join([topic, difficulty, " ".join(question.lower().split())])
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _unit(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32)
+
+    def _put(self, question: Dict[str, Any], vector: np.ndarray):
+        row = len(self._questions)
+        if row == len(self._vectors):
+            grown = np.zeros((row * 2, self._vectors.shape[1]), dtype=np.float32)
+            grown[:row] = self._vectors
+            self._vectors = grown
+        self._vectors[row] = vector
+        self._questions.append(question)
+        self._index.setdefault((question["topic"], question["difficulty"]), []).append(row)
+        self._hashes[question["content_hash"]] = row
+        if question["source"] == "llm":
+            self._generated += 1
+
+    def _load(self):
+        """Read the questions embedded with the current model into memory"""
+        if self._loaded:
+            return
+        with self._write_lock:
+            if self._loaded:
+                return
+            with SessionLocal() as db:
+                stored = db.query(BankQuestion).filter(BankQuestion.model == self.model).order_by(BankQuestion.id).all()
+                records = [
+                    (self._record(question), np.frombuffer(question.embedding, dtype=np.float32))
+                    for question in stored
+                ]
+            with self._lock:
+                for record, vector in records:
+                    self._put(record, vector)
+                self._loaded = True
+
+    @staticmethod
+    def _record(question: BankQuestion) -> Dict[str, Any]:
+        return {
+            "id": question.id,
+            "topic": question.topic,
+            "difficulty": question.difficulty,
+            "question": question.question,
+            "type": question.question_type,
+            "expected_answer": question.expected_answer,
+            "follow_up_questions": question.follow_up_questions or [],
+            "source": question.source,
+            "content_hash": question.content_hash
+        }
+
+    async def warm(self):
+        """Load the bank and import the seed file from settings, if any"""
+        await asyncio.to_thread(self._load)
+        if settings.QUESTION_BANK_SEED_PATH:
+            with open(settings.QUESTION_BANK_SEED_PATH, encoding="utf-8") as f:
+                added = await self.add_questions(json.load(f), source="seed")
+            logger.info("Imported %d seed questions", len(added))
+
+    async def add_questions(self, questions: List[Dict[str, Any]], source: str = "llm") -> List[Dict[str, Any]]:
+        """Store new questions, skipping exact and near duplicates; returns those added"""
+        await asyncio.to_thread(self._load)
+        fresh, seen = [], set()
+        for question in questions:
+            topic = normalize_topic(question.get("topic", ""))
+            difficulty = normalize_difficulty(question.get("difficulty"))
+            text = str(question.get("question") or "").strip()
+            content_hash = self.content_hash(topic, difficulty, text)
+            if not text or content_hash in seen or content_hash in self._hashes:
+                continue
+            seen.add(content_hash)
+            fresh.append({
+                "topic": topic,
+                "difficulty": difficulty,
+                "question": text,
+                "type": question.get("type") or "technical",
+                "expected_answer": question.get("expected_answer") or "",
+                "follow_up_questions": list(question.get("follow_up_questions") or []),
+                "source": source,
+                "content_hash": content_hash
+            })
+        if not fresh:
+            return []
+        vectors = self._unit(await self.embeddings.aembed_vectors([question["question"] for question in fresh]))
+        return await asyncio.to_thread(self._insert, fresh, vectors)
+
+    def _insert(self, questions: List[Dict[str, Any]], vectors: np.ndarray) -> List[Dict[str, Any]]:
+        # Only writers change the index, so under the write lock it can be read without _lock
+        with self._write_lock:
+            keep = []
+            for row, question in enumerate(questions):
+                if question["content_hash"] in self._hashes:
+                    continue
+                key = (question["topic"], question["difficulty"])
+                others = np.vstack([self._vectors[self._index.get(key, [])]] + [
+                    vectors[kept_row][None, :] for kept_row, kept in keep
+                    if (kept["topic"], kept["difficulty"]) == key
+                ])
+                if len(others) and float((others @ vectors[row]).max()) >= self.dedup_threshold:
+                    continue
+                keep.append((row, question))
+            if not keep:
+                return []
+            with SessionLocal() as db:
+                result = db.execute(insert(BankQuestion).returning(BankQuestion.id, sort_by_parameter_order=True), [
+                    {
+                        "topic": question["topic"],
+                        "difficulty": question["difficulty"],
+                        "question": question["question"],
+                        "question_type": question["type"],
+                        "expected_answer": question["expected_answer"],
+                        "follow_up_questions": question["follow_up_questions"],
+                        "source": question["source"],
+                        "content_hash": question["content_hash"],
+                        "model": self.model,
+                        "embedding": vectors[row].tobytes()
+                    }
+                    for row, question in keep
+                ])
+                ids = result.scalars().all()
+                db.commit()
+            added = []
+            with self._lock:
+                for question_id, (row, question) in zip(ids, keep):
+                    question["id"] = question_id
+                    self._put(question, vectors[row])
+                    added.append(question)
+            return added
+
+    def search(
+        self,
+        topic: str,
+        difficulty: str,
+        count: int,
+        query: Optional[np.ndarray] = None,
+        exclude: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """Up to ``count`` diverse banked questions for a topic and difficulty
+
+        ``query`` is the topic's unit embedding; with it, related topics' questions
+        of the same difficulty fill in when the topic itself has too few.
+        ``exclude`` holds content hashes of questions already asked. Only what is
+        already loaded is searched; call it in a worker thread, after ``warm``.
+        """
+        topic, difficulty = normalize_topic(topic), normalize_difficulty(difficulty)
+        excluded = set(exclude)
+        with self._lock:
+            rows = [row for row in self._index.get((topic, difficulty), []) if self._questions[row]["content_hash"] not in excluded]
+            relevance = self._vectors[rows] @ query if query is not None else np.ones(len(rows), dtype=np.float32)
+            if len(rows) < count and query is not None:
+                related = [
+                    row for (other_topic, other_difficulty), other_rows in self._index.items()
+                    if other_difficulty == difficulty and other_topic != topic
+                    for row in other_rows
+                    if self._questions[row]["content_hash"] not in excluded
+                ]
+                if related:
+                    scores = self._vectors[related] @ query
+                    close = scores >= self.related_threshold
+                    rows += [row for row, keep in zip(related, close) if keep]
+                    relevance = np.concatenate([relevance, scores[close]])
+            return [dict(self._questions[row]) for row in self._select(rows, relevance, count)]
+
+    def _select(self, rows: List[int], relevance: np.ndarray, count: int) -> List[int]:
+        """Maximal marginal relevance: trade relevance against similarity to picks so far"""
+        if not rows:
+            return []
+        vectors = self._vectors[rows]
+        similarity = vectors @ vectors.T
+        selected: List[int] = []
+        closest = np.full(len(rows), -1.0, dtype=np.float32)
+        available = np.ones(len(rows), dtype=bool)
+        while len(selected) < count and available.any():
+            scores = (1 - self.diversity) * relevance - self.diversity * np.maximum(closest, 0)
+            scores[~available] = -np.inf
+            best = int(np.argmax(scores))
+            selected.append(best)
+            closest = np.maximum(closest, similarity[best])
+            # Near-duplicates of a pick are never picked themselves
+            available &= similarity[best] < self.dedup_threshold
+            available[best] = False
+        return [rows[index] for index in selected]
+
+    async def generate_questions(
+        self,
+        topic: str,
+        difficulty: str,
+        count: int = 3,
+        llm=None,
+        exclude: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """Questions from the bank, with ``llm`` generating only the shortfall"""
+        topic, difficulty = normalize_topic(topic), normalize_difficulty(difficulty)
+        await asyncio.to_thread(self._load)
+        query = self._unit(await self.embeddings.aembed_vectors([topic]))[0]
+        questions = await asyncio.to_thread(self.search, topic, difficulty, count, query=query, exclude=exclude)
+        if len(questions) < count and llm is not None:
+            # Concurrent interviews short on the same topic share one generation
+            key = (topic, difficulty)
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = asyncio.ensure_future(self._fill(
+                    llm, topic, difficulty, count - len(questions), [question["question"] for question in questions]
+                ))
+                pending.add_done_callback(lambda _: self._pending.pop(key, None))
+            await asyncio.shield(pending)
+            questions = await asyncio.to_thread(self.search, topic, difficulty, count, query=query, exclude=exclude)
+        return questions
+
+    async def _fill(self, llm, topic: str, difficulty: str, count: int, avoid: List[str]):
+        await self.add_questions(await generate_with_llm(llm, topic, difficulty, count, avoid=avoid))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "questions": len(self._questions),
+                "topics": len({topic for topic, _ in self._index}),
+                "generated": self._generated
+            }
+
+
+def build_question_bank() -> Optional[QuestionBank]:
+    """Create the question bank configured in settings, or None when disabled"""
+    if not settings.QUESTION_BANK_ENABLED:
+        return None
+    return QuestionBank(
+        build_embedding_pipeline(),
+        dedup_threshold=settings.QUESTION_BANK_DEDUP_THRESHOLD,
+        diversity=settings.QUESTION_BANK_DIVERSITY,
+        related_threshold=settings.QUESTION_BANK_RELATED_THRESHOLD
+    )
@@ -0,0 +1,151 @@
+import re
+from typing import Dict, List, NamedTuple, Iterable, Optional
+
+# Header vocabularies per language: section name -> header phrases
+CV_SECTION_HEADERS: Dict[str, Dict[str, List[str]]] = {
+    "en": {
+        "education": ["education", "academic background", "qualifications"],
+        "experience": ["experience", "work history", "employment"],
+        "skills": ["skills", "technical skills", "competencies"],
+        "projects": ["projects", "portfolio", "work samples"]
+    },
+    "es": {
+        "education": ["educación", "formación académica"],
+        "experience": ["experiencia", "experiencia laboral", "historial laboral"],
+        "skills": ["habilidades", "competencias", "conocimientos técnicos"],
+        "projects": ["proyectos", "portafolio"]
+    },
+    "de": {
+        "education": ["ausbildung", "bildungsweg", "studium"],
+        "experience": ["berufserfahrung", "werdegang", "erfahrung"],
+        "skills": ["kenntnisse", "fähigkeiten", "kompetenzen"],
+        "projects": ["projekte", "portfolio"]
+    },
+    "fr": {
+        "education": ["formation", "éducation", "parcours académique"],
+        "experience": ["expérience", "expérience professionnelle", "parcours professionnel"],
+        "skills": ["compétences", "compétences techniques"],
+        "projects": ["projets", "portfolio"]
+    },
+    "zh": {
+        "education": ["教育背景", "学历", "教育经历"],
+        "experience": ["工作经历", "工作经验", "实习经历"],
+        "skills": ["专业技能", "技能", "技术栈"],
+        "projects": ["项目经历", "项目经验"]
+    }
+}
+
+JOB_SECTION_HEADERS: Dict[str, Dict[str, List[str]]] = {
+    "en": {
+        "requirements": ["requirements", "qualifications", "what you'll need"],
+        "responsibilities": ["responsibilities", "what you'll do", "key responsibilities"],
+        "benefits": ["benefits", "perks", "what we offer"],
+        "about_company": ["about us", "company", "who we are"]
+    },
+    "es": {
+        "requirements": ["requisitos", "lo que necesitas"],
+        "responsibilities": ["responsabilidades", "funciones"],
+        "benefits": ["beneficios", "ofrecemos"],
+        "about_company": ["sobre nosotros", "quiénes somos"]
+    },
+    "de": {
+        "requirements": ["anforderungen", "dein profil", "ihr profil"],
+        "responsibilities": ["aufgaben", "deine aufgaben", "ihre aufgaben"],
+        "benefits": ["benefits", "wir bieten"],
+        "about_company": ["über uns", "wer wir sind"]
+    },
+    "fr": {
+        "requirements": ["prérequis", "profil recherché"],
+        "responsibilities": ["missions", "responsabilités"],
+        "benefits": ["avantages", "ce que nous offrons"],
+        "about_company": ["à propos de nous", "qui sommes-nous"]
+    },
+    "zh": {
+        "requirements": ["任职要求", "岗位要求"],
+        "responsibilities": ["岗位职责", "工作职责"],
+        "benefits": ["福利待遇", "我们提供"],
+        "about_company": ["关于我们", "公司介绍"]
+    }
+}
+
+
+class SectionSpan(NamedTuple):
+    """A section found in a document, as offsets into the original text"""
+    section: str
+    header_start: int
+    start: int
+    end: int
+
+
+class SectionSegmenter:
+    """Splits a document into sections in a single linear pass.
+
+    All header phrases are compiled into one alternation (longest phrase first, so
+    "technical skills" wins over "skills") and matched against a lowercased copy of
+    the document; each section runs from the end of its header to the start of the
+    next header of any section.
+    """
+
+    def __init__(self, vocabulary: Dict[str, Iterable[str]]):
+        self.sections = list(vocabulary)
+        self._header_sections: Dict[str, str] = {}
+        for section, headers in vocabulary.items():
+            for header in headers:
+                self._header_sections[self._normalize(header)] = section
+
+        phrases = sorted(self._header_sections, key=len, reverse=True)
+        alternation = "|".join(self._header_pattern(phrase) for phrase in phrases)
+        self._pattern = re.compile(alternation) if phrases else None
+        # Used when lowercasing changes the text length, which would shift offsets
+        self._fallback_pattern = re.compile(alternation, re.IGNORECASE) if phrases else None
+
+    @classmethod
+    def for_languages(cls, vocabularies: Dict[str, Dict[str, List[str]]], languages: Optional[Iterable[str]] = None):
+        """Build a segmenter from the header vocabularies of several languages"""
+        merged: Dict[str, List[str]] = {}
+        for language in languages or vocabularies:
+            for section, headers in vocabularies[language].items():
+                merged.setdefault(section, []).extend(headers)
+        return cls(merged)
+
+    @staticmethod
+    def _normalize(header: str) -> str:
+        return " ".join(header.lower().split())
+
+    @staticmethod
+    def _header_pattern(header: str) -> str:
+        pattern = re.escape(header).replace(r"\ ", r"\s+")
+        # Only anchor on word boundaries where the header starts/ends with a word
+        # character in a space-delimited script; CJK headers have no boundaries.
+        if header[:1].isascii() and header[:1].isalnum():
+            pattern = r"\b" + pattern
+        if header[-1:].isascii() and header[-1:].isalnum():
+            pattern = pattern + r"\b"
+        return pattern
+
+    def segment(self, text: str) -> List[SectionSpan]:
+        """Return the sections of a document in order of appearance"""
+        if self._pattern is None:
+            return []
+        haystack = text.lower()
+        if len(haystack) == len(text):
+            matches = self._pattern.finditer(haystack)
+        else:
+            matches = self._fallback_pattern.finditer(text)
+
+        headers = [
+            (match.start(), match.end(), self._header_sections[self._normalize(match.group())])
+            for match in matches
+        ]
+        spans = []
+        for index, (header_start, start, section) in enumerate(headers):
+            end = headers[index + 1][0] if index + 1 < len(headers) else len(text)
+            spans.append(SectionSpan(section, header_start, start, end))
+        return spans
+
+    def extract(self, text: str, spans: Optional[List[SectionSpan]] = None) -> Dict[str, List[str]]:
+        """Collect the stripped text of every section, grouped by section name"""
+        sections: Dict[str, List[str]] = {section: [] for section in self.sections}
+        for span in spans if spans is not None else self.segment(text):
+            sections[span.section].append(text[span.start:span.end].strip())
+        return sections
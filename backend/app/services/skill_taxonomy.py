@@ -0,0 +1,247 @@
+import json
+from collections import deque
+from typing import Dict, Any, List, NamedTuple, Iterable, Optional, Tuple
+from ..core.config import settings
+
+# Category -> canonical skill -> aliases (matched case-insensitively, as whole tokens).
+# Only the aliases are matched, so ambiguous names like "Go" need an explicit form.
+SKILL_TAXONOMY: Dict[str, Dict[str, List[str]]] = {
+    "languages": {
+        "Python": ["python"],
+        "Java": ["java"],
+        "JavaScript": ["javascript", "js", "ecmascript"],
+        "TypeScript": ["typescript", "ts"],
+        "Go": ["golang", "go lang"],
+        "Rust": ["rust"],
+        "C": ["c language", "ansi c"],
+        "C++": ["c++", "cpp"],
+        "C#": ["c#", "csharp"],
+        "Ruby": ["ruby"],
+        "PHP": ["php"],
+        "Kotlin": ["kotlin"],
+        "Swift": ["swift"],
+        "Scala": ["scala"],
+        "SQL": ["sql"],
+        "Bash": ["bash", "shell scripting"],
+    },
+    "frameworks": {
+        "Django": ["django"],
+        "Flask": ["flask"],
+        "FastAPI": ["fastapi"],
+        "Spring": ["spring", "spring boot"],
+        "Node.js": ["node.js", "nodejs", "node"],
+        "Express": ["express.js", "expressjs"],
+        "React": ["react", "react.js", "reactjs"],
+        "Angular": ["angular", "angularjs"],
+        "Vue": ["vue", "vue.js", "vuejs"],
+        ".NET": [".net", "dotnet", "asp.net"],
+        "Ruby on Rails": ["rails", "ruby on rails"],
+        "GraphQL": ["graphql"],
+        "gRPC": ["grpc"],
+        "REST APIs": ["restful", "rest api", "rest apis"],
+    },
+    "databases": {
+        "PostgreSQL": ["postgresql", "postgres"],
+        "MySQL": ["mysql", "mariadb"],
+        "SQLite": ["sqlite"],
+        "MongoDB": ["mongodb", "mongo"],
+        "Redis": ["redis"],
+        "Elasticsearch": ["elasticsearch", "opensearch"],
+        "Cassandra": ["cassandra"],
+        "DynamoDB": ["dynamodb"],
+    },
+    "cloud_devops": {
+        "AWS": ["aws", "amazon web services"],
+        "GCP": ["gcp", "google cloud"],
+        "Azure": ["azure"],
+        "Docker": ["docker", "containers"],
+        "Kubernetes": ["kubernetes", "k8s"],
+        "Terraform": ["terraform"],
+        "CI/CD": ["ci/cd", "continuous integration", "continuous delivery", "github actions", "jenkins"],
+        "Linux": ["linux", "unix"],
+        "Kafka": ["kafka"],
+        "RabbitMQ": ["rabbitmq"],
+    },
+    "data_ml": {
+        "Machine Learning": ["machine learning", "ml"],
+        "Deep Learning": ["deep learning"],
+        "NLP": ["nlp", "natural language processing"],
+        "LLMs": ["llm", "llms", "large language models"],
+        "PyTorch": ["pytorch"],
+        "TensorFlow": ["tensorflow"],
+        "scikit-learn": ["scikit-learn", "sklearn"],
+        "pandas": ["pandas"],
+        "NumPy": ["numpy"],
+        "Spark": ["spark", "pyspark"],
+        "Airflow": ["airflow"],
+        "LangChain": ["langchain"],
+    },
+    "architecture": {
+        "System Design": ["system design", "systems design"],
+        "Distributed Systems": ["distributed systems"],
+        "Microservices": ["microservices", "microservice"],
+        "Event-Driven Architecture": ["event-driven", "event driven"],
+        "Scalability": ["scalability", "high availability"],
+        "Caching": ["caching"],
+    },
+    "practices": {
+        "Testing": ["unit testing", "tdd", "test-driven", "pytest", "integration testing"],
+        "Git": ["git"],
+        "Agile": ["agile", "scrum", "kanban"],
+        "Code Review": ["code review", "code reviews"],
+        "Security": ["security", "oauth", "owasp"],
+        "Observability": ["observability", "monitoring", "prometheus", "grafana", "opentelemetry"],
+    },
+    "soft_skills": {
+        "Communication": ["communication"],
+        "Leadership": ["leadership", "mentoring", "mentorship"],
+        "Teamwork": ["teamwork", "collaboration"],
+        "Problem Solving": ["problem solving", "problem-solving"],
+    },
+}
+
+
+class SkillMatch(NamedTuple):
+    skill: str
+    start: int
+    end: int
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every occurrence of every pattern in one pass over the text.
+
+    Patterns are compiled into a trie with failure links (breadth-first), so the scan
+    costs O(len(text) + matches) however many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+        for pattern, value in patterns:
+            node = 0
+            for char in pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = child
+            self._output[node].append((len(pattern), value))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                # Children of the root fail back to the root
+                self._fail[child] = self._goto[fail].get(char, 0) if node else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def finditer(self, text: str) -> Iterable[Tuple[int, int, str]]:
+        """Yield ``(start, end, value)`` for every pattern occurrence, overlaps included"""
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for length, value in self._output[node]:
+                yield index + 1 - length, index + 1, value
+
+
+class SkillTaxonomy:
+    """Extracts canonical skills from free text with a compiled Aho-Corasick automaton.
+
+    Aliases match case-insensitively on token boundaries ("java" does not match
+    inside "javascript"); where matches overlap the leftmost, then longest wins, so
+    "spring boot" is one skill rather than "spring" plus noise.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, List[str]]]):
+        self.categories: Dict[str, str] = {}
+        patterns = []
+        for category, skills in taxonomy.items():
+            for skill, aliases in skills.items():
+                self.categories[skill] = category
+                for alias in aliases:
+                    patterns.append((" ".join(alias.lower().split()), skill))
+        self._automaton = AhoCorasick(patterns)
+
+    _instance: Optional["SkillTaxonomy"] = None
+
+    @classmethod
+    def get(cls) -> "SkillTaxonomy":
+        """The taxonomy from settings: the built-in one, extended by SKILL_TAXONOMY_PATH"""
+        if cls._instance is None:
+            taxonomy = {category: dict(skills) for category, skills in SKILL_TAXONOMY.items()}
+            if settings.SKILL_TAXONOMY_PATH:
+                with open(settings.SKILL_TAXONOMY_PATH, encoding="utf-8") as f:
+                    for category, skills in json.load(f).items():
+                        taxonomy.setdefault(category, {}).update(skills)
+            cls._instance = cls(taxonomy)
+        return cls._instance
+
+    @staticmethod
+    def _is_boundary(text: str, index: int) -> bool:
+        return index < 0 or index >= len(text) or not (text[index].isalnum() or text[index] in "+#")
+
+    @staticmethod
+    def _fold(text: str) -> str:
+        """Lowercase with whitespace as plain spaces, keeping offsets into the original text"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            lowered = "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+        return "".join(" " if char.isspace() else char for char in lowered)
+
+    def matches(self, text: str) -> List[SkillMatch]:
+        """Non-overlapping skill mentions in order of appearance"""
+        haystack = self._fold(text)
+        candidates = sorted(
+            (start, -end, skill)
+            for start, end, skill in self._automaton.finditer(haystack)
+            if self._is_boundary(haystack, start - 1) and self._is_boundary(haystack, end)
+        )
+        found, covered = [], 0
+        for start, negative_end, skill in candidates:
+            if start >= covered:
+                found.append(SkillMatch(skill, start, -negative_end))
+                covered = -negative_end
+        return found
+
+    def extract(self, text: str) -> List[str]:
+        """Distinct canonical skills mentioned in the text, in order of first mention"""
+        return list(dict.fromkeys(match.skill for match in self.matches(text)))
+
+    def category(self, skill: str) -> Optional[str]:
+        return self.categories.get(skill)
+
+
+def match_requirements(
+    candidate_skills: Iterable[str],
+    required_skills: Iterable[str],
+    preferred_skills: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """Set-based comparison of a candidate's skills with a job's requirements
+
+    ``match_percentage`` is the share of required skills the candidate has; with no
+    required skills it falls back to the preferred ones.
+    """
+    candidate = list(dict.fromkeys(candidate_skills))
+    required = list(dict.fromkeys(required_skills))
+    preferred = [skill for skill in dict.fromkeys(preferred_skills) if skill not in required]
+    have = set(candidate)
+    scored = required or preferred
+    matched = [skill for skill in scored if skill in have]
+    return {
+        "match_percentage": round(100 * len(matched) / len(scored), 1) if scored else 0,
+        "matched_skills": [skill for skill in required if skill in have],
+        "missing_skills": [skill for skill in required if skill not in have],
+        "matched_preferred": [skill for skill in preferred if skill in have],
+        "missing_preferred": [skill for skill in preferred if skill not in have],
+        "extra_skills": [skill for skill in candidate if skill not in set(required) | set(preferred)]
+    }
@@ -0,0 +1,271 @@
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+from ..core.config import settings
+
+CHUNK_ROWS = 8192
+
+
+def nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid (l2) for every vector"""
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), CHUNK_ROWS):
+        chunk = vectors[start:start + CHUNK_ROWS]
+        distances = centroid_norms[None, :] - 2 * (chunk @ centroids.T)
+        assignments[start:start + len(chunk)] = np.argmin(distances, axis=1)
+    return assignments
+
+
+def kmeans(sample: np.ndarray, clusters: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    """Lloyd's k-means; empty clusters are reseeded from random sample points"""
+    clusters = min(clusters, len(sample))
+    centroids = sample[rng.choice(len(sample), size=clusters, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        assignments = nearest_centroids(sample, centroids)
+        sizes = np.bincount(assignments, minlength=clusters)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        filled = sizes > 0
+        centroids[filled] = sums[filled] / sizes[filled, None]
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = sample[rng.choice(len(sample), size=len(empty), replace=False)]
+    return centroids
+
+
+class PCAReducer:
+    """Projects vectors onto the top principal components of a training sample"""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+
+    def fit(self, sample: np.ndarray, rng: np.random.Generator):
+        self.mean = sample.mean(axis=0)
+        centered = sample - self.mean
+        _, eigenvectors = np.linalg.eigh(centered.T @ centered)
+        self.components = np.ascontiguousarray(eigenvectors[:, ::-1][:, :self.dimension], dtype=np.float32)
+
+    def transform(self, vectors: np.ndarray) -> np.ndarray:
+        return (vectors - self.mean) @ self.components
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"mean": self.mean, "components": self.components}
+
+    def load_state(self, state: Dict[str, np.ndarray]):
+        self.mean, self.components = state["mean"], state["components"]
+
+
+class MatryoshkaReducer:
+    """Keeps the leading dimensions and renormalizes.
+
+    Only meaningful for models trained with Matryoshka representation learning (e.g.
+    text-embedding-3-*); ``text-embedding-ada-002`` should use PCA instead.
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def fit(self, sample: np.ndarray, rng: np.random.Generator):
+        pass
+
+    def transform(self, vectors: np.ndarray) -> np.ndarray:
+        truncated = vectors[..., :self.dimension]
+        norms = np.linalg.norm(truncated, axis=-1, keepdims=True)
+        return truncated / np.where(norms == 0, 1, norms)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {}
+
+    def load_state(self, state: Dict[str, np.ndarray]):
+        pass
+
+
+class FloatQuantizer:
+    """Stores vectors as float32 (used with dimension reduction alone)"""
+
+    def fit(self, sample: np.ndarray, rng: np.random.Generator):
+        pass
+
+    def encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        return vectors, np.einsum("ij,ij->i", vectors, vectors)
+
+    def prepare(self, query: np.ndarray) -> Any:
+        return query.astype(np.float32)
+
+    def distances(self, prepared: Any, codes: np.ndarray, code_norms: np.ndarray) -> np.ndarray:
+        return code_norms + prepared @ prepared - 2 * (codes @ prepared)
+
+    def bytes_per_vector(self, dimension: int) -> int:
+        return dimension * 4 + 4
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {}
+
+    def load_state(self, state: Dict[str, np.ndarray]):
+        pass
+
+
+class Int8Quantizer(FloatQuantizer):
+    """Per-dimension affine scalar quantization to one byte per dimension"""
+
+    def __init__(self):
+        self.low: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+
+    def fit(self, sample: np.ndarray, rng: np.random.Generator):
+        self.low = sample.min(axis=0).astype(np.float32)
+        scale = (sample.max(axis=0) - self.low) / 255
+        self.scale = np.where(scale == 0, 1, scale).astype(np.float32)
+
+    def _decode(self, codes: np.ndarray) -> np.ndarray:
+        return (codes.astype(np.float32) + 128) * self.scale + self.low
+
+    def encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        codes = (np.clip(np.rint((vectors - self.low) / self.scale), 0, 255) - 128).astype(np.int8)
+        decoded = self._decode(codes)
+        return codes, np.einsum("ij,ij->i", decoded, decoded)
+
+    def prepare(self, query: np.ndarray) -> Any:
+        # q . decode(c) = c . (scale * q) + (128 * scale + low) . q
+        query = query.astype(np.float32)
+        return query @ query, self.scale * query, float((128 * self.scale + self.low) @ query)
+
+    def distances(self, prepared: Any, codes: np.ndarray, code_norms: np.ndarray) -> np.ndarray:
+        query_norm, scaled_query, offset = prepared
+        return code_norms + query_norm - 2 * (codes.astype(np.float32) @ scaled_query + offset)
+
+    def bytes_per_vector(self, dimension: int) -> int:
+        return dimension + 4
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"low": self.low, "scale": self.scale}
+
+    def load_state(self, state: Dict[str, np.ndarray]):
+        self.low, self.scale = state["low"], state["scale"]
+
+
+class ProductQuantizer(FloatQuantizer):
+    """Splits vectors into ``subvectors`` parts, each coded as one of 256 centroids.
+
+    Distances use asymmetric lookup tables: the query stays in full precision and is
+    compared against every subspace centroid once per search.
+    """
+
+    ITERATIONS = 8
+
+    def __init__(self, subvectors: int):
+        self.subvectors = subvectors
+        self.codebooks: Optional[np.ndarray] = None
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors.reshape(len(vectors), self.subvectors, -1)
+
+    def fit(self, sample: np.ndarray, rng: np.random.Generator):
+        if sample.shape[1] % self.subvectors:
+            raise ValueError(f"Dimension {sample.shape[1]} is not divisible into {self.subvectors} subvectors")
+        parts = self._split(sample.astype(np.float32))
+        self.codebooks = np.stack([
+            kmeans(np.ascontiguousarray(parts[:, m]), 256, self.ITERATIONS, rng)
+            for m in range(self.subvectors)
+        ])
+
+    def encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        parts = self._split(vectors.astype(np.float32))
+        codes = np.stack([
+            nearest_centroids(np.ascontiguousarray(parts[:, m]), self.codebooks[m])
+            for m in range(self.subvectors)
+        ], axis=1).astype(np.uint8)
+        return codes, np.zeros(len(codes), dtype=np.float32)
+
+    def prepare(self, query: np.ndarray) -> Any:
+        parts = query.astype(np.float32).reshape(self.subvectors, 1, -1)
+        return ((self.codebooks - parts) ** 2).sum(axis=2)
+
+    def distances(self, prepared: Any, codes: np.ndarray, code_norms: np.ndarray) -> np.ndarray:
+        return prepared[np.arange(self.subvectors), codes].sum(axis=1)
+
+    def bytes_per_vector(self, dimension: int) -> int:
+        return self.subvectors
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"codebooks": self.codebooks}
+
+    def load_state(self, state: Dict[str, np.ndarray]):
+        self.codebooks = state["codebooks"]
+
+
+class VectorCodec:
+    """Optional dimension reduction followed by a quantizer.
+
+    Codes approximate squared l2 distances for candidate selection; callers rescore
+    the best candidates against the full-precision vectors.
+    """
+
+    def __init__(self, reducer=None, quantizer=None):
+        self.reducer = reducer
+        self.quantizer = quantizer or FloatQuantizer()
+        self.trained = False
+
+    def _reduce(self, vectors: np.ndarray) -> np.ndarray:
+        return self.reducer.transform(vectors) if self.reducer is not None else vectors
+
+    def fit(self, sample: np.ndarray, rng: np.random.Generator):
+        if self.reducer is not None:
+            self.reducer.fit(sample, rng)
+        self.quantizer.fit(self._reduce(sample), rng)
+        self.trained = True
+
+    def encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Codes and the squared norms of the decoded vectors"""
+        return self.quantizer.encode(self._reduce(np.asarray(vectors, dtype=np.float32)))
+
+    def prepare(self, query: np.ndarray) -> Any:
+        return self.quantizer.prepare(self._reduce(query))
+
+    def distances(self, prepared: Any, codes: np.ndarray, code_norms: np.ndarray) -> np.ndarray:
+        return self.quantizer.distances(prepared, codes, code_norms)
+
+    def bytes_per_vector(self, dimension: int) -> int:
+        if self.reducer is not None:
+            dimension = self.reducer.dimension
+        return self.quantizer.bytes_per_vector(dimension)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        state = {f"quantizer_{name}": value for name, value in self.quantizer.state().items()}
+        if self.reducer is not None:
+            state.update({f"reducer_{name}": value for name, value in self.reducer.state().items()})
+        return state
+
+    def load_state(self, state: Dict[str, np.ndarray]):
+        self.quantizer.load_state({name[10:]: value for name, value in state.items() if name.startswith("quantizer_")})
+        if self.reducer is not None:
+            self.reducer.load_state({name[8:]: value for name, value in state.items() if name.startswith("reducer_")})
+        self.trained = True
+
+
+def build_vector_codec() -> Optional[VectorCodec]:
+    """Create the vector codec configured in settings, or None for full precision only"""
+    if settings.VECTOR_REDUCTION == "pca":
+        reducer = PCAReducer(settings.VECTOR_REDUCED_DIMENSION)
+    elif settings.VECTOR_REDUCTION == "matryoshka":
+        reducer = MatryoshkaReducer(settings.VECTOR_REDUCED_DIMENSION)
+    elif settings.VECTOR_REDUCTION == "none":
+        reducer = None
+    else:
+        raise ValueError(f"Unknown vector reduction '{settings.VECTOR_REDUCTION}'")
+
+    if settings.VECTOR_QUANTIZATION == "int8":
+        quantizer = Int8Quantizer()
+    elif settings.VECTOR_QUANTIZATION == "pq":
+        quantizer = ProductQuantizer(settings.VECTOR_PQ_SUBVECTORS)
+    elif settings.VECTOR_QUANTIZATION == "none":
+        quantizer = None
+    else:
+        raise ValueError(f"Unknown vector quantization '{settings.VECTOR_QUANTIZATION}'")
+
+    if reducer is None and quantizer is None:
+        return None
+    return VectorCodec(reducer, quantizer)
@@ -1,10 +1,49 @@
 from opensearchpy import OpenSearch, RequestsHttpConnection
-from typing import List, Dict, Any
+from opensearchpy.exceptions import ConnectionError as OpenSearchConnectionError, TransportError
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+import asyncio
+import base64
+import json
+import logging
+import random
+import time
+import uuid
 import numpy as np
 from ..core.config import settings
+from ..core.telemetry import traced
 
-class VectorStore:
-    def __init__(self):
+logger = logging.getLogger(__name__)
+
+
+class VectorStoreBackend:
+    """Storage and search operations a VectorStore delegates to"""
+    
+    def add_documents(self, documents: List[Dict[str, Any]], refresh: bool = True, **options) -> Dict[str, Any]:
+        """Index documents with ``text``, ``embedding``, ``metadata`` and optional ``id``"""
+        raise NotImplementedError
+    
+    def search(self, query_embedding: List[float], k: int = 5, metadata_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Nearest neighbours of a query embedding, optionally restricted by metadata"""
+        raise NotImplementedError
+    
+    def lexical_search(self, query_text: str, k: int = 5, metadata_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """BM25 matches of a text query, optionally restricted by metadata"""
+        raise NotImplementedError
+    
+    def find(self, metadata_filter: Dict[str, Any], k: int = 5, sort_by: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Documents matching a metadata filter, sorted descending on a metadata field"""
+        raise NotImplementedError
+
+
+class OpenSearchBackend(VectorStoreBackend):
+    """Vectors in an OpenSearch k-NN index
+    
+    With a ``reducer`` the k-NN field holds reduced vectors and the full-precision
+    vector is kept as an unindexed binary field; searches over-fetch
+    ``rescore_oversample * k`` hits and rescore them against the full vectors.
+    """
+    
+    def __init__(self, dimension: int = 1536, reducer=None, rescore_oversample: int = 4):
         self.client = OpenSearch(
             hosts=[{'host': settings.OPENSEARCH_HOST, 'port': settings.OPENSEARCH_PORT}],
             http_compress=True,
@@ -13,10 +52,35 @@ class VectorStore:
             connection_class=RequestsHttpConnection
         )
         self.index_name = "interview_data"
+        self.dimension = dimension
+        self.reducer = reducer
+        self.rescore_oversample = rescore_oversample
         self._create_index_if_not_exists()
     
+    def _properties(self) -> Dict[str, Any]:
+        return {
+            "text": {"type": "text"},
+            "embedding": {
+                "type": "knn_vector",
+                "dimension": self.reducer.dimension if self.reducer else self.dimension
+            },
+            "embedding_full": {"type": "binary"},
+            "metadata": {
+                "properties": {
+                    "source": {"type": "keyword"},
+                    "type": {"type": "keyword"},
+                    "timestamp": {"type": "date"},
+                    "llm_key": {"type": "keyword"},
+                    "cache_key": {"type": "keyword"},
+                    "candidate_id": {"type": "keyword"},
+                    "job_description_id": {"type": "keyword"},
+                    "interview_id": {"type": "keyword"}
+                }
+            }
+        }
+    
     def _create_index_if_not_exists(self):
-        """Create the OpenSearch index if it doesn't exist"""
+        """Create the OpenSearch index, or add fields mapped since it was created"""
         if not self.client.indices.exists(index=self.index_name):
             self.client.indices.create(
                 index=self.index_name,
@@ -26,96 +90,216 @@ class VectorStore:
                             "knn": True
                         }
                     },
-                    "mappings": {
-                        "properties": {
-                            "text": {"type": "text"},
-                            "embedding": {
-                                "type": "knn_vector",
-                                "dimension": 1536  # OpenAI embedding dimension
-                            },
-                            "metadata": {
-                                "properties": {
-                                    "source": {"type": "keyword"},
-                                    "type": {"type": "keyword"},
-                                    "timestamp": {"type": "date"}
-                                }
-                            }
-                        }
-                    }
+                    "mappings": {"properties": self._properties()}
                 }
             )
+            return
+        # Mapping new fields is allowed on a live index; only the vector field is left as it is
+        properties = {name: value for name, value in self._properties().items() if name != "embedding"}
+        try:
+            self.client.indices.put_mapping(index=self.index_name, body={"properties": properties})
+        except TransportError as e:
+            # A field already mapped dynamically with another type needs a reindex
+            logger.warning("Updating the %s mapping failed, reindex to pick up new fields: %s", self.index_name, e)
     
-    def add_document(self, text: str, embedding: List[float], metadata: Dict[str, Any]):
-        """Add a document to the vector store"""
-        document = {
-            "text": text,
-            "embedding": embedding,
-            "metadata": metadata
+    @staticmethod
+    def _to_list(embedding) -> List[float]:
+        return embedding.tolist() if isinstance(embedding, np.ndarray) else list(embedding)
+    
+    RETRYABLE_STATUSES = {429, 502, 503, 504}
+    
+    def _source(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        source = {
+            "text": document["text"],
+            "embedding": self._to_list(document["embedding"]),
+            "metadata": document.get("metadata", {})
         }
-        self.client.index(
-            index=self.index_name,
-            body=document,
-            refresh=True
-        )
+        if self.reducer is not None:
+            embedding = np.asarray(document["embedding"], dtype=np.float32)
+            source["embedding"] = self.reducer.transform(embedding).tolist()
+            source["embedding_full"] = base64.b64encode(embedding.tobytes()).decode("ascii")
+        return source
     
-    def search_similar(self, query_embedding: List[float], k: int = 5) -> List[Dict[str, Any]]:
+    def _bulk_batches(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        batch_size: int,
+        max_batch_bytes: int
+    ) -> Iterator[List[Tuple[str, str]]]:
+        """Serialize documents into batches of (action, source) NDJSON lines
+
+        Documents without an ``id`` get one here, so resending a batch after a
+        connection error overwrites what was already indexed instead of duplicating it.
+        """
+        batch, batch_bytes = [], 0
+        for document in documents:
+            document_id = document["id"] if document.get("id") is not None else uuid.uuid4().hex
+            action = {"index": {"_index": self.index_name, "_id": document_id}}
+            lines = (
+                json.dumps(action),
+                json.dumps(self._source(document))
+            )
+            size = len(lines[0]) + len(lines[1]) + 2
+            if batch and (len(batch) >= batch_size or batch_bytes + size > max_batch_bytes):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(lines)
+            batch_bytes += size
+        if batch:
+            yield batch
+    
+    def _send_bulk(self, batch: List[Tuple[str, str]], max_retries: int, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Send one bulk request, retrying failed items; returns permanent failures"""
+        pending = batch
+        for attempt in range(max_retries + 1):
+            body = "\n".join(line for lines in pending for line in lines) + "\n"
+            try:
+                response = self.client.bulk(body=body, refresh=refresh)
+            except (OpenSearchConnectionError, TransportError) as e:
+                status = getattr(e, "status_code", None)
+                retryable = isinstance(e, OpenSearchConnectionError) or status in self.RETRYABLE_STATUSES
+                if not retryable or attempt == max_retries:
+                    raise
+                time.sleep(min(2 ** attempt, 30) * (0.5 + random.random() / 2))
+                continue
+            
+            if not response.get("errors"):
+                return []
+            retry, failed = [], []
+            for lines, item in zip(pending, response["items"]):
+                result = next(iter(item.values()))
+                if result.get("status", 200) < 300:
+                    continue
+                if result.get("status") in self.RETRYABLE_STATUSES and attempt < max_retries:
+                    retry.append(lines)
+                else:
+                    failed.append({"status": result.get("status"), "error": result.get("error"), "document": lines[1]})
+            if not retry:
+                return failed
+            pending = retry
+            time.sleep(min(2 ** attempt, 30) * (0.5 + random.random() / 2))
+    
+    def add_documents(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        refresh: bool = True,
+        batch_size: Optional[int] = None,
+        max_batch_bytes: Optional[int] = None,
+        max_retries: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Index documents through the _bulk API
+        
+        Documents are sent in batches bounded by count and payload size; items
+        rejected with a retryable status are resent with backoff. The index is
+        refreshed once, by the request carrying the last batch, rather than per
+        document.
+        """
+        batch_size = batch_size or settings.VECTOR_BULK_BATCH_SIZE
+        max_batch_bytes = max_batch_bytes or settings.VECTOR_BULK_MAX_BYTES
+        max_retries = settings.VECTOR_BULK_MAX_RETRIES if max_retries is None else max_retries
+        
+        indexed, failed = 0, []
+        batches = self._bulk_batches(documents, batch_size, max_batch_bytes)
+        batch = next(batches, None)
+        while batch is not None:
+            following = next(batches, None)
+            batch_failed = self._send_bulk(batch, max_retries, refresh=refresh and following is None)
+            indexed += len(batch) - len(batch_failed)
+            failed.extend(batch_failed)
+            batch = following
+        return {"indexed": indexed, "failed": failed}
+    
+    def search(
+        self,
+        query_embedding: List[float],
+        k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """Search for similar documents using vector similarity"""
+        size = k
+        vector = self._to_list(query_embedding)
+        if self.reducer is not None:
+            size = k * self.rescore_oversample
+            vector = self.reducer.transform(np.asarray(query_embedding, dtype=np.float32)).tolist()
+        knn_query = {
+            "knn": {
+                "embedding": {
+                    "vector": vector,
+                    "k": size
+                }
+            }
+        }
+        if metadata_filter:
+            knn_query = {
+                "bool": {
+                    "must": [knn_query],
+                    "filter": self._filter_clauses(metadata_filter)
+                }
+            }
+        query = {
+            "size": size,
+            "query": knn_query
+        }
+        if self.reducer is None:
+            return self._search_hits(query)
+        
+        hits = self._search_hits(query, rescore=True)
+        if not hits:
+            return hits
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        full = np.stack([np.frombuffer(base64.b64decode(hit.pop("embedding_full")), dtype=np.float32) for hit in hits])
+        scores = 1 / (1 + ((full - query_vector) ** 2).sum(axis=1))
+        for hit, score in zip(hits, scores):
+            hit["score"] = float(score)
+        return sorted(hits, key=lambda hit: hit["score"], reverse=True)[:k]
+    
+    def lexical_search(self, query_text: str, k: int = 5, metadata_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Search documents by BM25 relevance of their text"""
         query = {
             "size": k,
             "query": {
-                "knn": {
-                    "embedding": {
-                        "vector": query_embedding,
-                        "k": k
-                    }
+                "bool": {
+                    "must": [{"match": {"text": query_text}}],
+                    "filter": self._filter_clauses(metadata_filter or {})
                 }
             }
         }
-        
-        response = self.client.search(
-            index=self.index_name,
-            body=query
-        )
-        
-        results = []
-        for hit in response["hits"]["hits"]:
-            results.append({
-                "text": hit["_source"]["text"],
-                "metadata": hit["_source"]["metadata"],
-                "score": hit["_score"]
-            })
-        
-        return results
+        return self._search_hits(query)
     
-    def get_candidate_history(self, candidate_id: str, k: int = 5) -> List[Dict[str, Any]]:
-        """Get similar candidate interview history"""
+    def find(self, metadata_filter: Dict[str, Any], k: int = 5, sort_by: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get documents matching a metadata filter"""
         query = {
             "size": k,
             "query": {
                 "bool": {
-                    "must": [
-                        {
-                            "term": {
-                                "metadata.type": "interview"
-                            }
-                        },
-                        {
-                            "term": {
-                                "metadata.candidate_id": candidate_id
-                            }
-                        }
-                    ]
+                    "filter": self._filter_clauses(metadata_filter)
                 }
-            },
-            "sort": [
+            }
+        }
+        if sort_by:
+            query["sort"] = [
                 {
-                    "metadata.timestamp": {
+                    f"metadata.{sort_by}": {
                         "order": "desc"
                     }
                 }
             ]
-        }
-        
+        return self._search_hits(query)
+    
+    @staticmethod
+    def _filter_clauses(metadata_filter: Dict[str, Any]) -> List[Dict[str, Any]]:
+        clauses = []
+        for field, value in metadata_filter.items():
+            if isinstance(value, dict):
+                clauses.append({"range": {f"metadata.{field}": value}})
+            elif isinstance(value, (list, tuple, set)):
+                clauses.append({"terms": {f"metadata.{field}": list(value)}})
+            else:
+                clauses.append({"term": {f"metadata.{field}": value}})
+        return clauses
+    
+    def _search_hits(self, query: Dict[str, Any], rescore: bool = False) -> List[Dict[str, Any]]:
+        query["_source"] = ["text", "metadata", "embedding_full"] if rescore else ["text", "metadata"]
         response = self.client.search(
             index=self.index_name,
             body=query
@@ -123,10 +307,138 @@ class VectorStore:
         
         results = []
         for hit in response["hits"]["hits"]:
-            results.append({
+            result = {
+                "id": hit["_id"],
                 "text": hit["_source"]["text"],
                 "metadata": hit["_source"]["metadata"],
                 "score": hit["_score"]
-            })
+            }
+            if rescore:
+                result["embedding_full"] = hit["_source"]["embedding_full"]
+            results.append(result)
+        
+        return results
+
+
+def build_vector_backend() -> VectorStoreBackend:
+    """Create the vector store backend configured in settings"""
+    from .vector_quantization import MatryoshkaReducer, build_vector_codec
+    if settings.VECTOR_STORE_BACKEND == "opensearch":
+        # The k-NN plugin of the bundled OpenSearch (2.5) has no byte vectors and PQ
+        # needs its model training API, so only untrained truncation is supported here
+        if settings.VECTOR_QUANTIZATION != "none" or settings.VECTOR_REDUCTION not in ("none", "matryoshka"):
+            raise ValueError("The opensearch backend only supports VECTOR_REDUCTION=matryoshka")
+        reducer = None
+        if settings.VECTOR_REDUCTION == "matryoshka":
+            reducer = MatryoshkaReducer(settings.VECTOR_REDUCED_DIMENSION)
+        return OpenSearchBackend(
+            settings.VECTOR_DIMENSION,
+            reducer=reducer,
+            rescore_oversample=settings.VECTOR_RESCORE_OVERSAMPLE
+        )
+    if settings.VECTOR_STORE_BACKEND == "embedded":
+        from .embedded_vector_store import EmbeddedVectorBackend
+        return EmbeddedVectorBackend(
+            settings.VECTOR_DIMENSION,
+            path=settings.VECTOR_STORE_PATH,
+            nprobe=settings.VECTOR_IVF_NPROBE,
+            min_train_size=settings.VECTOR_IVF_MIN_TRAIN_SIZE,
+            codec=build_vector_codec(),
+            rescore_oversample=settings.VECTOR_RESCORE_OVERSAMPLE
+        )
+    raise ValueError(f"Unknown vector store backend '{settings.VECTOR_STORE_BACKEND}'")
+
+
+class VectorStore:
+    def __init__(self, backend: Optional[VectorStoreBackend] = None):
+        self.backend = backend if backend is not None else build_vector_backend()
+    
+    @traced("vector_store.add_document")
+    def add_document(self, text: str, embedding: List[float], metadata: Dict[str, Any], refresh: bool = True):
+        """Add a document to the vector store"""
+        self.backend.add_documents(
+            [{"text": text, "embedding": embedding, "metadata": metadata}],
+            refresh=refresh
+        )
+    
+    @traced("vector_store.add_documents")
+    def add_documents(self, documents: Iterable[Dict[str, Any]], refresh: bool = True, **options) -> Dict[str, Any]:
+        """Index many documents in batches
+        
+        Each document is a dict with ``text``, ``embedding``, ``metadata`` and an
+        optional ``id``. ``options`` (``batch_size``, ``max_batch_bytes``,
+        ``max_retries``) tune the OpenSearch _bulk requests.
         
-        return results 
\ No newline at end of file
+        Returns:
+            dict: Number of indexed documents and the permanently failed items
+        """
+        return self.backend.add_documents(list(documents), refresh=refresh, **options)
+    
+    async def aadd_documents(self, documents: Iterable[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        """Async variant of add_documents that runs the bulk requests off the event loop"""
+        return await asyncio.to_thread(self.add_documents, list(documents), **kwargs)
+    
+    @traced("vector_store.search")
+    def search_similar(
+        self,
+        query_embedding: List[float],
+        k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search for similar documents using vector similarity
+        
+        ``metadata_filter`` maps metadata fields to a value, a list of accepted
+        values, or a range such as ``{"gte": 0, "lt": 10}``.
+        """
+        return self.backend.search(query_embedding, k=k, metadata_filter=metadata_filter)
+    
+    @traced("vector_store.hybrid_search")
+    def hybrid_search(
+        self,
+        query_text: str,
+        query_embedding: Optional[List[float]] = None,
+        k: int = 10,
+        offset: int = 0,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        rank_window: Optional[int] = None,
+        rank_constant: int = 60
+    ) -> List[Dict[str, Any]]:
+        """Combine BM25 and vector similarity with reciprocal-rank fusion
+        
+        Each retriever returns its best ``rank_window`` documents; a document scores
+        ``sum(1 / (rank_constant + rank))`` over the lists it appears in, so neither
+        score scale dominates. ``offset`` and ``k`` page through the fused ranking.
+        
+        Returns:
+            list: Hits with the fused ``score`` and each retriever's 1-based rank
+        """
+        window = max(rank_window or settings.HYBRID_RANK_WINDOW, offset + k)
+        ranked = [("lexical_rank", self.backend.lexical_search(query_text, k=window, metadata_filter=metadata_filter))]
+        if query_embedding is not None:
+            ranked.append(("vector_rank", self.backend.search(query_embedding, k=window, metadata_filter=metadata_filter)))
+        
+        fused: Dict[str, Dict[str, Any]] = {}
+        for rank_name, hits in ranked:
+            for rank, hit in enumerate(hits, start=1):
+                entry = fused.setdefault(hit["id"], {
+                    "id": hit["id"],
+                    "text": hit["text"],
+                    "metadata": hit["metadata"],
+                    "score": 0.0,
+                    "lexical_rank": None,
+                    "vector_rank": None
+                })
+                entry["score"] += 1 / (rank_constant + rank)
+                entry[rank_name] = rank
+        
+        results = sorted(fused.values(), key=lambda hit: hit["score"], reverse=True)
+        return results[offset:offset + k]
+    
+    @traced("vector_store.find")
+    def get_candidate_history(self, candidate_id: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Get similar candidate interview history"""
+        return self.backend.find(
+            {"type": "interview", "candidate_id": candidate_id},
+            k=k,
+            sort_by="timestamp"
+        )
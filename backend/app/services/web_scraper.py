@@ -1,73 +1,245 @@
+import asyncio
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from typing import Dict, Any, Optional
-import re
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
+from .http_cache import HTTPCache
+from .section_segmenter import SectionSegmenter, SectionSpan, JOB_SECTION_HEADERS
+from ..core.config import settings
+from ..core.telemetry import metrics, span, traced
+
+SCRAPER_FETCHES = metrics.counter(
+    "scraper_fetches", "Page fetches by how they were served (cache, revalidated or network)", ("source",)
+)
 
 class WebScraper:
+    # Bump whenever parse_html/extract_job_description output changes to invalidate stored artifacts
+    PARSER_VERSION = "2"
+    _job_segmenter: Optional[SectionSegmenter] = None
+
+    _session: Optional[requests.Session] = None
+    _client: Optional[httpx.AsyncClient] = None
+    _host_limits: Dict[str, asyncio.Semaphore] = {}
+    _cache: Optional[HTTPCache] = None
+
+    @classmethod
+    def get_cache(cls) -> Optional[HTTPCache]:
+        """Get the shared on-disk response cache, if enabled"""
+        if cls._cache is None and settings.SCRAPER_CACHE_DIR:
+            cls._cache = HTTPCache(settings.SCRAPER_CACHE_DIR)
+        return cls._cache
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """Get the shared blocking HTTP session"""
+        if cls._session is None:
+            cls._session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=settings.SCRAPER_MAX_CONNECTIONS,
+                pool_maxsize=settings.SCRAPER_PER_HOST_LIMIT
+            )
+            cls._session.mount("http://", adapter)
+            cls._session.mount("https://", adapter)
+            cls._session.headers["User-Agent"] = settings.SCRAPER_USER_AGENT
+        return cls._session
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """Get the shared async HTTP client and its connection pool"""
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(
+                    settings.SCRAPER_TIMEOUT,
+                    connect=settings.SCRAPER_CONNECT_TIMEOUT
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.SCRAPER_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.SCRAPER_MAX_CONNECTIONS
+                ),
+                headers={"User-Agent": settings.SCRAPER_USER_AGENT},
+                follow_redirects=True
+            )
+        return cls._client
+
+    @classmethod
+    async def close(cls):
+        """Close the shared HTTP clients"""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+        if cls._session is not None:
+            cls._session.close()
+            cls._session = None
+        cls._host_limits = {}
+
+    @classmethod
+    def _host_limit(cls, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        if host not in cls._host_limits:
+            cls._host_limits[host] = asyncio.Semaphore(settings.SCRAPER_PER_HOST_LIMIT)
+        return cls._host_limits[host]
+
     @staticmethod
-    def scrape_webpage(url: str) -> Dict[str, Any]:
-        """Scrape content from a webpage"""
+    def _cached_result(url: str, entry: Dict[str, Any], from_cache: bool) -> Dict[str, Any]:
+        return {
+            "url": url,
+            "status_code": entry["status_code"],
+            "content_type": entry.get("content_type", ""),
+            "content": entry["content"],
+            "etag": entry.get("etag"),
+            "last_modified": entry.get("last_modified"),
+            "from_cache": from_cache
+        }
+
+    @classmethod
+    async def fetch(cls, url: str, validators: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fetch raw bytes for a URL, revalidating against the on-disk cache
+
+        ``validators`` holds the etag/last_modified of a copy the caller keeps itself;
+        without a cache entry they make the request conditional, and a 304 for them
+        comes back with ``status_code`` 304 and no content.
+        """
+        cache = cls.get_cache()
+        # Cache reads and writes are disk I/O, kept off the event loop
+        entry = await asyncio.to_thread(cache.get, url) if cache else None
+        if entry and cache.is_fresh(entry):
+            SCRAPER_FETCHES.inc(source="cache")
+            return cls._cached_result(url, entry, from_cache=True)
+
+        with span("scraper.fetch", host=urlparse(url).netloc) as attributes:
+            async with cls._host_limit(url):
+                response = await cls.get_client().get(url, headers=HTTPCache.conditional_headers(entry or validators))
+            attributes["status_code"] = response.status_code
+
+        headers = {k.lower(): v for k, v in response.headers.items()}
+        if response.status_code == 304 and entry:
+            SCRAPER_FETCHES.inc(source="revalidated")
+            await asyncio.to_thread(cache.touch, url, entry, headers)
+            return cls._cached_result(url, entry, from_cache=True)
+        if response.status_code == 304 and validators:
+            SCRAPER_FETCHES.inc(source="revalidated")
+            return {
+                "url": url,
+                "status_code": 304,
+                "content_type": headers.get("content-type", ""),
+                "content": None,
+                "etag": headers.get("etag") or validators.get("etag"),
+                "last_modified": headers.get("last-modified") or validators.get("last_modified"),
+                "from_cache": False
+            }
+
+        SCRAPER_FETCHES.inc(source="network")
+        response.raise_for_status()
+        if cache:
+            await asyncio.to_thread(cache.put, url, response.status_code, headers, response.content)
+        return {
+            "url": url,
+            "status_code": response.status_code,
+            "content_type": headers.get("content-type", ""),
+            "content": response.content,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "from_cache": False
+        }
+
+    @classmethod
+    async def ascrape_webpage(cls, url: str) -> Dict[str, Any]:
+        """Scrape content from a webpage without blocking the event loop"""
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
+            fetched = await cls.fetch(url)
+            return await asyncio.to_thread(cls.parse_html, fetched)
+        except Exception as e:
             return {
-                "title": soup.title.string if soup.title else "",
-                "content": text,
-                "links": [link.get('href') for link in soup.find_all('a') if link.get('href')],
-                "metadata": {
-                    "url": url,
-                    "status_code": response.status_code
-                }
+                "error": str(e),
+                "url": url
             }
+
+    @classmethod
+    def scrape_webpage(cls, url: str) -> Dict[str, Any]:
+        """Scrape content from a webpage"""
+        try:
+            cache = cls.get_cache()
+            entry = cache.get(url) if cache else None
+            if entry and cache.is_fresh(entry):
+                return cls.parse_html(cls._cached_result(url, entry, from_cache=True))
+
+            response = cls.get_session().get(
+                url,
+                headers=HTTPCache.conditional_headers(entry),
+                timeout=(settings.SCRAPER_CONNECT_TIMEOUT, settings.SCRAPER_TIMEOUT)
+            )
+            headers = {k.lower(): v for k, v in response.headers.items()}
+            if response.status_code == 304 and entry:
+                cache.touch(url, entry, headers)
+                return cls.parse_html(cls._cached_result(url, entry, from_cache=True))
+
+            response.raise_for_status()
+            if cache:
+                cache.put(url, response.status_code, headers, response.content)
+            return cls.parse_html({
+                "url": url,
+                "status_code": response.status_code,
+                "content_type": headers.get("content-type", ""),
+                "content": response.content,
+                "from_cache": False
+            })
         except Exception as e:
             return {
                 "error": str(e),
                 "url": url
             }
+
+    @staticmethod
+    @traced("scraper.parse_html")
+    def parse_html(fetched: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract title, text and links from a fetched HTML document"""
+        soup = BeautifulSoup(fetched["content"], 'html.parser')
+        
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
+        
+        # Get text content
+        text = soup.get_text()
+        
+        # Clean up text
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        text = ' '.join(chunk for chunk in chunks if chunk)
+        
+        return {
+            "title": soup.title.string if soup.title else "",
+            "content": text,
+            "links": [link.get('href') for link in soup.find_all('a') if link.get('href')],
+            "metadata": {
+                "url": fetched["url"],
+                "status_code": fetched["status_code"],
+                "from_cache": fetched.get("from_cache", False)
+            }
+        }
     
+    @classmethod
+    def get_job_segmenter(cls) -> SectionSegmenter:
+        """Get the job description section segmenter for the configured header languages"""
+        if cls._job_segmenter is None:
+            cls._job_segmenter = SectionSegmenter.for_languages(
+                JOB_SECTION_HEADERS,
+                [language.strip() for language in settings.SECTION_HEADER_LANGUAGES.split(",")]
+            )
+        return cls._job_segmenter
+
+    @staticmethod
+    def segment_job_description(text: str) -> List[SectionSpan]:
+        """Find job description sections as offsets into the text"""
+        return WebScraper.get_job_segmenter().segment(text)
+
     @staticmethod
     def extract_job_description(text: str) -> Dict[str, Any]:
         """Extract structured information from job description text"""
-        # Common job description patterns
-        patterns = {
-            "requirements": r"(?i)(requirements|qualifications|what you'll need)",
-            "responsibilities": r"(?i)(responsibilities|what you'll do|key responsibilities)",
-            "benefits": r"(?i)(benefits|perks|what we offer)",
-            "about_company": r"(?i)(about us|company|who we are)"
-        }
-        
         sections = {}
-        for section, pattern in patterns.items():
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                start = match.end()
-                next_section = None
-                for other_section, other_pattern in patterns.items():
-                    if other_section != section:
-                        next_match = re.search(other_pattern, text[start:])
-                        if next_match:
-                            if next_section is None or next_match.start() < next_section[1]:
-                                next_section = (other_section, next_match.start())
-                
-                if next_section:
-                    section_text = text[start:start + next_section[1]]
-                else:
-                    section_text = text[start:]
-                
-                sections[section] = section_text.strip()
+        for section in WebScraper.segment_job_description(text):
+            sections[section.section] = text[section.start:section.end].strip()
         
-        return sections 
\ No newline at end of file
+        return sections
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""Benchmark HR prompt size before and after context building.
+
+Renders the HR agent's document input for synthetic CVs, job descriptions and
+scraped company pages (with links and boilerplate) raw and through the context
+builder, and reports prompt tokens and build time. Tokens are counted with
+tiktoken when its encoding is available, otherwise estimated. From the backend
+directory:
+
+    python -m benchmarks.bench_context_builder [budget tokens]
+"""
+import json
+import random
+import sys
+import time
+from app.services.context_builder import build_context_builder
+
+DEFAULT_BUDGET = 3000
+SIZES = (2, 10, 40)
+RUNS = 20
+
+FILLER = (
+    "Designed and implemented distributed systems for large scale data processing "
+    "using Python and Go, mentored junior engineers and published peer reviewed papers. "
+)
+BOILERPLATE = (
+    "Skip to content. Sign in. We use cookies to improve your experience. Follow us on LinkedIn. "
+    "Privacy Policy. Terms of Use. © 2024 Example Corp. All rights reserved. "
+)
+
+
+def cv(pages):
+    rng = random.Random(pages)
+    body = "".join(FILLER for _ in range(pages * 6))
+    return (
+        "Jane Doe\njane@example.com\n"
+        f"Skills\nPython, SQL, Docker, Kubernetes\nExperience\n{body}\n"
+        f"Projects\n{body[:rng.randrange(200, 2000)]}\nEducation\nMSc Computer Science\n"
+    )
+
+
+def page(pages, sections):
+    body = " ".join(f"{section.title()} {FILLER * pages * 3}" for section in sections)
+    return {
+        "title": "Senior Engineer",
+        "content": f"{BOILERPLATE * pages} {body} {BOILERPLATE * pages}",
+        "links": [f"https://example.com/page/{index}" for index in range(pages * 50)],
+        "metadata": {"url": "https://example.com/jobs/1", "status_code": 200, "from_cache": False}
+    }
+
+
+def main():
+    budget = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET
+    builder = build_context_builder("gpt-3.5-turbo", budget)
+    print(f"budget {budget} tokens, {'tiktoken' if builder.counter.encoding else 'estimated'} counts")
+    print(f"{'pages':>6} {'raw tokens':>11} {'built tokens':>13} {'ms/build':>9}")
+    for pages in SIZES:
+        cv_text = cv(pages)
+        job_page = page(pages, ["requirements", "responsibilities", "benefits"])
+        company_page = page(pages, ["about us"])
+        raw = {"cv_text": cv_text, "job_description": job_page, "company_website": company_page}
+        started = time.perf_counter()
+        for _ in range(RUNS):
+            documents = builder.compact_documents(cv_text, job_page, company_page)
+        elapsed = (time.perf_counter() - started) / RUNS
+        built = {
+            "cv_text": documents["cv"],
+            "job_description": documents["job_description"],
+            "company_website": documents["company_website"]
+        }
+        print(
+            f"{pages:>6} {builder.count(json.dumps(raw)):>11} "
+            f"{builder.count(json.dumps(built)):>13} {elapsed * 1000:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark the embedded vector store: IVF search latency and recall vs exact scan.
+
+Uses clustered synthetic vectors (unit-norm, like OpenAI embeddings) so the inverted
+lists behave roughly as they would on real data. Run from the backend directory:
+
+    python -m benchmarks.bench_embedded_vector_store [count]
+"""
+import sys
+import time
+import numpy as np
+from app.services.embedded_vector_store import EmbeddedVectorBackend
+
+DIMENSION = 1536
+QUERIES = 200
+K = 10
+
+
+def synthetic_vectors(centers, count, rng):
+    vectors = centers[rng.integers(0, len(centers), count)]
+    vectors += 0.6 * rng.standard_normal((count, DIMENSION), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = np.random.default_rng(42)
+    centers = rng.standard_normal((500, DIMENSION), dtype=np.float32)
+    vectors = synthetic_vectors(centers, count, rng)
+    queries = synthetic_vectors(centers, QUERIES, rng)
+
+    backend = EmbeddedVectorBackend(DIMENSION, min_train_size=count + 1)
+    for start in range(0, count, 10000):
+        backend.add_documents(
+            [
+                {"text": str(row), "embedding": vectors[row], "metadata": {"type": "benchmark", "shard": row % 10}}
+                for row in range(start, min(start + 10000, count))
+            ],
+            refresh=False
+        )
+
+    def run(metadata_filter=None):
+        started = time.perf_counter()
+        hits = [backend.search(query, k=K, metadata_filter=metadata_filter) for query in queries]
+        return hits, (time.perf_counter() - started) * 1000 / QUERIES
+
+    exact, exact_ms = run()
+    backend.min_train_size = 1
+    started = time.perf_counter()
+    backend.refresh()
+    build_s = time.perf_counter() - started
+
+    print(f"{count} vectors x {DIMENSION} dims, IVF build {build_s:.1f}s, {len(backend._offsets) - 1} lists")
+    print(f"{'mode':>16} {'nprobe':>7} {'ms/query':>9} {'recall@10':>10}")
+    print(f"{'exact':>16} {'-':>7} {exact_ms:>9.2f} {1.0:>10.3f}")
+    for nprobe in (1, 4, 8, 16, 32):
+        backend.nprobe = nprobe
+        approximate, ms = run()
+        recall = np.mean([
+            len({hit["text"] for hit in a} & {hit["text"] for hit in e}) / K
+            for a, e in zip(approximate, exact)
+        ])
+        print(f"{'ivf':>16} {nprobe:>7} {ms:>9.2f} {recall:>10.3f}")
+
+    backend.nprobe = 8
+    _, ms = run({"shard": 3})
+    print(f"{'ivf + filter':>16} {8:>7} {ms:>9.2f} {'-':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark interview listing: offset paging with lazy relationships vs keyset paging with eager loading.
+
+Bulk-inserts synthetic candidates, job descriptions and interviews into a fresh
+SQLite database (WAL mode, with the schema's indexes), then times fetching pages
+deep into the listing for one job description. Run from the backend directory:
+
+    python -m benchmarks.bench_interview_listing [interviews] [database path]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DEFAULT_COUNT = 1000000
+PAGE = 50
+JOB_DESCRIPTIONS = 200
+CANDIDATES = 50000
+
+
+def configure(path):
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+
+async def populate(count):
+    from app.db.init_db import init_db
+    from app.db.session import AsyncSessionLocal
+    from app.models.interview import Candidate, JobDescription
+    from app.services.interview_repository import InterviewRepository
+
+    init_db()
+    rng = random.Random(42)
+    started_at = datetime(2024, 1, 1)
+    async with AsyncSessionLocal() as db:
+        candidate_ids = await InterviewRepository.bulk_insert(db, Candidate, [
+            {"name": f"Candidate {i}", "email": f"candidate{i}@example.com"}
+            for i in range(CANDIDATES)
+        ])
+        job_description_ids = await InterviewRepository.bulk_insert(db, JobDescription, [
+            {"title": f"Job {i}", "company_name": "Example", "raw_description": "y" * 4000}
+            for i in range(JOB_DESCRIPTIONS)
+        ])
+        repository = InterviewRepository()
+        for start in range(0, count, 100000):
+            await repository.bulk_create_interviews(db, [
+                {
+                    "candidate_id": rng.choice(candidate_ids),
+                    "job_description_id": rng.choice(job_description_ids),
+                    "status": rng.choice(["planned", "in_progress", "completed", "failed"]),
+                    "responses": [{"agent": "HR Agent", "response": "z" * 500}],
+                    "created_at": started_at + timedelta(seconds=row)
+                }
+                for row in range(start, min(start + 100000, count))
+            ])
+    return job_description_ids
+
+
+def offset_listing(job_description_id, pages):
+    """Page with OFFSET and touch the relationships lazily, as naive ORM code would"""
+    from app.db.session import SessionLocal
+    from app.models.interview import Interview
+
+    with SessionLocal() as db:
+        for page in range(pages):
+            interviews = db.query(Interview).filter(Interview.job_description_id == job_description_id).order_by(
+                Interview.created_at.desc(), Interview.id.desc()
+            ).offset(page * PAGE).limit(PAGE).all()
+            rows = [(interview.id, interview.candidate.name, interview.job_description.title) for interview in interviews]
+    return rows
+
+
+async def keyset_listing(job_description_id, pages):
+    from app.db.session import AsyncSessionLocal
+    from app.services.interview_repository import InterviewRepository
+
+    repository = InterviewRepository()
+    cursor = None
+    async with AsyncSessionLocal() as db:
+        for _ in range(pages):
+            interviews, cursor = await repository.list_interviews(
+                db, job_description_id=job_description_id, before=cursor, limit=PAGE
+            )
+            rows = [repository.summary(interview) for interview in interviews]
+    return rows
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.mkdtemp(), "bench.db")
+    configure(path)
+
+    started = time.perf_counter()
+    job_description_ids = asyncio.run(populate(count))
+    print(f"{count} interviews bulk-inserted in {time.perf_counter() - started:.1f}s ({path})")
+
+    pages = count // JOB_DESCRIPTIONS // PAGE
+    job_description_id = job_description_ids[0]
+    print(f"{'listing':>24} {'pages':>6} {'ms/page':>8}")
+    started = time.perf_counter()
+    offset_listing(job_description_id, pages)
+    print(f"{'offset + lazy loads':>24} {pages:>6} {(time.perf_counter() - started) * 1000 / pages:>8.2f}")
+    started = time.perf_counter()
+    asyncio.run(keyset_listing(job_description_id, pages))
+    print(f"{'keyset + eager loads':>24} {pages:>6} {(time.perf_counter() - started) * 1000 / pages:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark the LLM gateway against a rate-limited fake OpenAI server.
+
+The fake server answers chat completions after a fixed latency and returns 429s
+(with retry-after) above a requests-per-second quota. A burst of requests, some of
+them identical, is sent once straight through the OpenAI client with its own
+retries and once through the gateway with a matching budget. Runs in-process, no
+API key or network needed. From the backend directory:
+
+    python -m benchmarks.bench_llm_gateway [requests] [quota per second] [duplicate share]
+"""
+import asyncio
+import collections
+import random
+import sys
+import time
+
+DEFAULT_REQUESTS = 300
+DEFAULT_QUOTA = 20
+DEFAULT_DUPLICATES = 0.3
+LATENCY = 0.05
+
+
+def fake_openai(quota):
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+
+    app = FastAPI()
+    window = collections.deque()
+    counters = {"served": 0, "rejected": 0}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        now = time.monotonic()
+        while window and now - window[0] > 1.0:
+            window.popleft()
+        if len(window) >= quota:
+            counters["rejected"] += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": "1"}
+            )
+        window.append(now)
+        counters["served"] += 1
+        await asyncio.sleep(LATENCY)
+        prompt = body["messages"][-1]["content"]
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": f"Echo: {prompt[:20]}"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 20, "completion_tokens": 10, "total_tokens": 30}
+        }
+
+    return app, counters
+
+
+def clients(app, max_retries):
+    import httpx
+    import openai
+
+    options = {"api_key": "sk-fake", "base_url": "http://fake-openai/v1", "max_retries": max_retries}
+    transport = httpx.ASGITransport(app=app)
+    return (
+        openai.OpenAI(**options),
+        openai.AsyncOpenAI(http_client=httpx.AsyncClient(transport=transport), **options)
+    )
+
+
+def prompts(count, duplicates):
+    rng = random.Random(7)
+    return [f"Question {rng.randrange(10) if rng.random() < duplicates else index}" for index in range(count)]
+
+
+async def burst(create, texts):
+    async def one(text):
+        try:
+            await create(model="gpt-3.5-turbo", messages=[{"role": "user", "content": text}])
+            return True
+        except Exception:
+            return False
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(text) for text in texts))
+    return sum(results), time.perf_counter() - started
+
+
+async def direct(texts, quota):
+    app, counters = fake_openai(quota)
+    _, async_client = clients(app, max_retries=2)
+    ok, elapsed = await burst(async_client.chat.completions.create, texts)
+    return ok, elapsed, counters, {}
+
+
+async def gateway(texts, quota):
+    from app.services.llm_gateway import LLMGateway, RateLimiter
+
+    app, counters = fake_openai(quota)
+    client, async_client = clients(app, max_retries=0)
+    # Start from an empty bucket so the burst is paced instead of front-loaded
+    limiter = RateLimiter(quota * 60, None)
+    limiter.requests.level = 0
+    llm_gateway = LLMGateway(client, async_client, limiter=limiter, max_retries=5)
+    completions = llm_gateway.async_completions("hr")
+    ok, elapsed = await burst(completions.create, texts)
+    return ok, elapsed, counters, llm_gateway.stats()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS
+    quota = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_QUOTA
+    duplicates = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_DUPLICATES
+    texts = prompts(count, duplicates)
+    print(f"{count} requests, {len(set(texts))} distinct, server quota {quota}/s")
+    print(f"{'client':>10} {'ok':>5} {'failed':>6} {'api calls':>9} {'429s':>5} {'seconds':>8} {'ok/min':>8}")
+    for name, run in (("direct", direct), ("gateway", gateway)):
+        ok, elapsed, counters, stats = asyncio.run(run(texts, quota))
+        calls = counters["served"] + counters["rejected"]
+        print(
+            f"{name:>10} {ok:>5} {count - ok:>6} {calls:>9} {counters['rejected']:>5} "
+            f"{elapsed:>8.2f} {ok / elapsed * 60:>8.0f}"
+        )
+        if stats:
+            print(f"{'':>10} coalesced={stats['coalesced']} retries={stats['retries']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark CV section segmentation on large synthetic CVs.
+
+Compares the single-pass SectionSegmenter with the previous per-header rescanning
+approach. Run from the backend directory:
+
+    python -m benchmarks.bench_section_segmenter
+"""
+import random
+import re
+import time
+from app.services.section_segmenter import SectionSegmenter, CV_SECTION_HEADERS
+
+LEGACY_PATTERNS = {
+    "education": r"(?i)(education|academic background|qualifications)",
+    "experience": r"(?i)(experience|work history|employment)",
+    "skills": r"(?i)(skills|technical skills|competencies)",
+    "projects": r"(?i)(projects|portfolio|work samples)"
+}
+
+FILLER = (
+    "Designed and implemented distributed systems for large scale data processing "
+    "using Python and Go, mentored junior engineers and published peer reviewed papers. "
+)
+
+
+def legacy_segment(text):
+    sections = {section: [] for section in LEGACY_PATTERNS}
+    for section, pattern in LEGACY_PATTERNS.items():
+        for match in re.finditer(pattern, text):
+            start = match.end()
+            next_section = None
+            for other_section, other_pattern in LEGACY_PATTERNS.items():
+                if other_section != section:
+                    next_match = re.search(other_pattern, text[start:])
+                    if next_match:
+                        if next_section is None or next_match.start() < next_section[1]:
+                            next_section = (other_section, next_match.start())
+            end = start + next_section[1] if next_section else len(text)
+            sections[section].append(text[start:end].strip())
+    return sections
+
+
+def synthetic_cv(pages, rng):
+    headers = [header for headers in CV_SECTION_HEADERS["en"].values() for header in headers]
+    parts = []
+    for _ in range(pages * 6):
+        parts.append(rng.choice(headers).title())
+        parts.append(FILLER * rng.randint(2, 6))
+    return "\n".join(parts)
+
+
+def timed(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    rng = random.Random(42)
+    segmenter = SectionSegmenter.for_languages(CV_SECTION_HEADERS, ["en"])
+    print(f"{'pages':>6} {'chars':>10} {'headers':>8} {'legacy ms':>12} {'single-pass ms':>15} {'speedup':>8}")
+    for pages in (1, 5, 10, 30):
+        text = synthetic_cv(pages, rng)
+        spans = segmenter.segment(text)
+        legacy_ms = timed(legacy_segment, text, repeat=1 if pages >= 10 else 3)
+        single_ms = timed(segmenter.extract, text)
+        print(f"{pages:>6} {len(text):>10} {len(spans):>8} {legacy_ms:>12.1f} {single_ms:>15.2f} {legacy_ms / single_ms:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
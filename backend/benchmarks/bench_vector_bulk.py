@@ -0,0 +1,105 @@
+"""Benchmark VectorStore indexing throughput: per-document vs _bulk batches.
+
+Runs against a local stand-in for OpenSearch that charges a fixed cost per request
+and per refresh, so the numbers show the effect of round trips and refreshes rather
+than of a real cluster. Run from the backend directory:
+
+    python -m benchmarks.bench_vector_bulk
+"""
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.core.config import settings
+
+REQUEST_COST = 0.001
+REFRESH_COST = 0.01
+DIMENSION = 1536
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Just enough of the OpenSearch REST API for VectorStore"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _body(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return body
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        body = self._body()
+        time.sleep(REQUEST_COST)
+        path, _, query = self.path.partition("?")
+        if "refresh=true" in query or path.endswith("/_refresh"):
+            time.sleep(REFRESH_COST)
+        if path.endswith("/_bulk"):
+            items = body.count(b"\n") // 2
+            self._reply(200, {"took": 1, "errors": False, "items": [{"index": {"status": 201}}] * items})
+        elif path.endswith("/_refresh"):
+            self._reply(200, {"_shards": {"total": 1, "successful": 1, "failed": 0}})
+        else:
+            self._reply(201, {"result": "created"})
+
+    do_PUT = do_POST
+
+
+def synthetic_documents(count, rng):
+    return [
+        {
+            "text": f"document {index}",
+            "embedding": [rng.random() for _ in range(DIMENSION)],
+            "metadata": {"type": "benchmark", "candidate_id": str(index % 50), "timestamp": index}
+        }
+        for index in range(count)
+    ]
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.OPENSEARCH_HOST = "127.0.0.1"
+    settings.OPENSEARCH_PORT = server.server_address[1]
+
+    from app.services.vector_store import VectorStore
+    store = VectorStore()
+    rng = random.Random(42)
+
+    print(f"{'docs':>6} {'single docs/s':>14} {'bulk docs/s':>12} {'speedup':>8}")
+    for count in (100, 500, 2000):
+        documents = synthetic_documents(count, rng)
+
+        started = time.perf_counter()
+        for document in documents:
+            store.add_document(document["text"], document["embedding"], document["metadata"])
+        single = count / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        result = store.add_documents(documents)
+        bulk = count / (time.perf_counter() - started)
+        assert result["indexed"] == count and not result["failed"]
+
+        print(f"{count:>6} {single:>14.0f} {bulk:>12.0f} {bulk / single:>7.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark recall@k against in-memory bytes per vector for the vector codecs.
+
+Vectors are synthetic with a power-law spectrum. Every configuration scans all
+inverted lists, so recall differences come from the codec alone. "approx" ranks by
+code distances only; "rescored" re-ranks the best ``4 * k`` candidates against the
+full-precision vectors. Run from the backend directory:
+
+    python -m benchmarks.bench_vector_quantization [count]
+"""
+import sys
+import time
+import numpy as np
+from app.services.embedded_vector_store import EmbeddedVectorBackend
+from app.services.vector_quantization import (
+    VectorCodec, PCAReducer, MatryoshkaReducer, Int8Quantizer, ProductQuantizer
+)
+
+DIMENSION = 1536
+QUERIES = 200
+K = 10
+
+CONFIGS = [
+    ("float32", lambda: None),
+    ("int8", lambda: VectorCodec(quantizer=Int8Quantizer())),
+    ("pca-256", lambda: VectorCodec(PCAReducer(256))),
+    ("pca-256 + int8", lambda: VectorCodec(PCAReducer(256), Int8Quantizer())),
+    ("matryoshka-256", lambda: VectorCodec(MatryoshkaReducer(256))),
+    ("pq-96", lambda: VectorCodec(quantizer=ProductQuantizer(96))),
+    ("pca-256 + pq-32", lambda: VectorCodec(PCAReducer(256), ProductQuantizer(32))),
+]
+
+
+def synthetic_vectors(basis, count, rng):
+    # Power-law variance over a random orthonormal basis, like the decaying spectrum
+    # of real text embeddings (isotropic noise would make any reduction look useless)
+    scales = np.arange(1, DIMENSION + 1, dtype=np.float32) ** -0.75
+    vectors = (rng.standard_normal((count, DIMENSION), dtype=np.float32) * scales) @ basis.T
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def recall(results, truth):
+    return np.mean([
+        len({hit["text"] for hit in found} & expected) / K
+        for found, expected in zip(results, truth)
+    ])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = np.random.default_rng(42)
+    basis = np.linalg.qr(rng.standard_normal((DIMENSION, DIMENSION)))[0].astype(np.float32)
+    vectors = synthetic_vectors(basis, count, rng)
+    queries = synthetic_vectors(basis, QUERIES, rng)
+    documents = [{"text": str(row), "embedding": vectors[row], "metadata": {}} for row in range(count)]
+
+    distances = (vectors ** 2).sum(axis=1)[None, :] - 2 * (queries @ vectors.T)
+    truth = [set(map(str, np.argsort(row)[:K])) for row in distances]
+
+    print(f"{count} vectors x {DIMENSION} dims, recall@{K} over {QUERIES} queries")
+    print(f"{'codec':>18} {'bytes/vec':>10} {'approx':>8} {'rescored':>9} {'ms/query':>9} {'train s':>8}")
+    for name, make_codec in CONFIGS:
+        codec = make_codec()
+        backend = EmbeddedVectorBackend(DIMENSION, min_train_size=1, codec=codec)
+        backend.add_documents(documents, refresh=False)
+        started = time.perf_counter()
+        backend.refresh()
+        train_s = time.perf_counter() - started
+        backend.nprobe = len(backend._offsets) - 1
+
+        results = {}
+        for oversample in (1, 4):
+            backend.rescore_oversample = oversample
+            started = time.perf_counter()
+            results[oversample] = [backend.search(query, k=K) for query in queries]
+            elapsed_ms = (time.perf_counter() - started) * 1000 / QUERIES
+
+        size = codec.bytes_per_vector(DIMENSION) if codec else DIMENSION * 4
+        print(
+            f"{name:>18} {size:>10} {recall(results[1], truth):>8.3f} "
+            f"{recall(results[4], truth):>9.3f} {elapsed_ms:>9.2f} {train_s:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import unittest
+from app.services.interview_agenda import job_skills
+
+
+class JobSkillsTest(unittest.TestCase):
+    def test_preferred_marker_only_applies_to_its_sentence(self):
+        # Scraped job descriptions arrive as a single line
+        text = (
+            "Requirements: 5+ years Python, Docker, Kubernetes and PostgreSQL. "
+            "Experience with Terraform is a plus."
+        )
+        required, preferred = job_skills({"requirements": text})
+        self.assertEqual(required, ["Python", "Docker", "Kubernetes", "PostgreSQL"])
+        self.assertEqual(preferred, ["Terraform"])
+
+    def test_bullets_and_semicolons_are_separate_clauses(self):
+        text = "Must know Python; Redis is nice to have • Docker • AWS preferred"
+        required, preferred = job_skills({}, text)
+        self.assertEqual(required, ["Python", "Docker"])
+        self.assertEqual(preferred, ["Redis", "AWS"])
+
+
+if __name__ == "__main__":
+    unittest.main()